@@ -0,0 +1,117 @@
+"""
+Run requestium's benchmarks, printing their results as json.
+
+Everything runs offline and without a browser, against an in-process fixture site and a fake
+WebDriver remote end, except for the benchmarks in BROWSER_BENCHMARKS, which need Chrome and
+only run when named with --only. Saving the results with --output and passing them to a later
+run with --compare reports how each metric changed, and fails if any got slower than allowed.
+Run with: python -m benchmarks [--quick] [--only NAME ...] [--output FILE] [--compare BASELINE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.metadata
+import json
+import os
+import platform
+import sys
+from pathlib import Path
+from typing import Any
+
+RESULTS_FORMAT_VERSION: int = 1
+
+BENCHMARKS: dict[str, str] = {
+    "parsing": "benchmarks.parsing",
+    "responses": "benchmarks.responses",
+    "extraction": "benchmarks.extraction",
+    "cookies": "benchmarks.cookies",
+    "waits": "benchmarks.waits",
+    "tabs": "benchmarks.tabs",
+    "imports": "benchmarks.imports",
+    "domains": "benchmarks.domains",
+}
+
+BROWSER_BENCHMARKS: dict[str, str] = {
+    "page_load": "benchmarks.page_load",
+    "browser_tabs": "benchmarks.browser_tabs",
+}
+
+# Metrics where a higher value is better, every other metric is a time or a count of round trips
+_HIGHER_IS_BETTER_SUFFIXES = ("_per_s", "speedup")
+
+
+def _version(package: str) -> str | None:
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "requestium": _version("requestium"),
+        "selenium": _version("selenium"),
+    }
+
+
+def run_benchmarks(names: list[str], *, quick: bool = False) -> dict[str, dict[str, float]]:
+    modules = {**BENCHMARKS, **BROWSER_BENCHMARKS}
+    return {name: importlib.import_module(modules[name]).run(quick=quick) for name in names}
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], max_regression: float) -> dict[str, dict[str, Any]]:
+    """
+    Compare each metric with the baseline's.
+
+    The 'slowdown' of a metric is how much worse it got, as a fraction of the baseline (negative
+    if it improved), and it's a 'regression' if that's more than 'max_regression'.
+    """
+    comparison = {}
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            baseline_value = baseline.get(name, {}).get(metric)
+            if not baseline_value or not value:
+                continue
+            ratio = baseline_value / value if metric.endswith(_HIGHER_IS_BETTER_SUFFIXES) else value / baseline_value
+            comparison[f"{name}.{metric}"] = {
+                "baseline": baseline_value,
+                "current": value,
+                "slowdown": ratio - 1,
+                "regression": ratio - 1 > max_regression,
+            }
+    return comparison
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=[*BENCHMARKS, *BROWSER_BENCHMARKS], help="The benchmarks to run, all the offline ones by default")
+    parser.add_argument("--quick", action="store_true", help="Take fewer samples, for a rough idea or a smoke test")
+    parser.add_argument("--output", type=Path, help="Also write the results to this file")
+    parser.add_argument("--compare", type=Path, help="Compare with the results of an earlier run, saved with --output")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="The slowdown a metric may have when comparing (default: 0.1, 10%%)")
+    args = parser.parse_args()
+
+    report: dict[str, Any] = {
+        "version": RESULTS_FORMAT_VERSION,
+        "environment": environment(),
+        "results": run_benchmarks(args.only or list(BENCHMARKS), quick=args.quick),
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        report["comparison"] = compare(report["results"], baseline["results"], args.max_regression)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    sys.stdout.write(output + "\n")
+    if any(change["regression"] for change in report.get("comparison", {}).values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Measure the pages per second a real browser loads one page at a time, and in a pool of tabs.
+
+Serves local pages that each take PAGE_DELAY to arrive, and loads them with 'driver.get' one
+after the other, then with a tab pool of each size in TAB_COUNTS, so the speedup includes the
+browser's own costs of running several tabs, which the fake remote end of the 'tabs' benchmark
+leaves out. Needs Chrome, so it only runs when named. Run with: python -m benchmarks --only browser_tabs
+"""
+
+from __future__ import annotations
+
+import time
+from http.server import BaseHTTPRequestHandler
+
+import requestium
+from tests.support import listing_page, serve
+
+PAGE_DELAY: float = 0.2
+
+# Chrome opens at most 6 connections to a host, more tabs than that would wait on each other
+TAB_COUNTS = (2, 4)
+
+
+class SlowPageHandler(BaseHTTPRequestHandler):
+    """Serves a listing_page of 20 items at every path, taking PAGE_DELAY to answer."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        time.sleep(PAGE_DELAY)
+        body = listing_page(20).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    pages = 8 if quick else 32
+    results = {}
+    with serve(SlowPageHandler) as url:
+        urls = [f"{url}/{i}" for i in range(pages)]
+        session = requestium.Session(headless=True, webdriver_options={"arguments": ["--no-sandbox"]})
+        try:
+            session.driver.get(f"{url}/warm-up")
+            start = time.perf_counter()
+            for page_url in urls:
+                session.driver.get(page_url)
+                session.driver.xpath("//li")
+            sequential = pages / (time.perf_counter() - start)
+            results["sequential_pages_per_s"] = sequential
+
+            for tabs in TAB_COUNTS:
+                start = time.perf_counter()
+                with session.driver.tabs(tabs) as pool:
+                    for tab in pool.as_loaded(urls):
+                        tab.xpath("//li")
+                results[f"tabs_{tabs}_pages_per_s"] = pages / (time.perf_counter() - start)
+                results[f"tabs_{tabs}_speedup"] = results[f"tabs_{tabs}_pages_per_s"] / sequential
+        finally:
+            session.driver.quit()
+    return results
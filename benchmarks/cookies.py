@@ -0,0 +1,63 @@
+"""
+Measure the cost of transferring cookies between a Session and its driver, in both directions.
+
+The driver is a fake WebDriver remote end, so the round trips to the browser are counted
+exactly. Each direction is measured with a plain webdriver and with a chromium-like one that
+takes requestium's devtools paths.
+Run with: python -m benchmarks --only cookies
+"""
+
+from __future__ import annotations
+
+import requestium
+from tests.support import FakeRemoteEnd
+
+from .timing import median_ms
+
+DOMAINS: int = 10
+COOKIES_PER_DOMAIN: int = 20
+
+
+def _fill_jar(session: requestium.Session) -> None:
+    for domain in range(DOMAINS):
+        for i in range(COOKIES_PER_DOMAIN):
+            session.cookies.set(f"cookie{i}", f"value{i}", domain=f"www.site{domain}.com")
+
+
+def _run_driver(remote: FakeRemoteEnd, *, cdp: bool, repeat: int) -> dict[str, float]:
+    prefix = "cdp" if cdp else "webdriver"
+    results = {}
+    driver = remote.driver(cdp=cdp)
+    session = requestium.Session(driver=driver)
+    try:
+        _fill_jar(session)
+
+        def to_driver() -> None:
+            remote.cookies = []
+            remote.current_url = "about:blank"
+            for domain in range(DOMAINS):
+                session.transfer_session_cookies_to_driver(f"site{domain}.com")
+
+        results[f"{prefix}_to_driver_ms"] = median_ms(to_driver, repeat)
+        commands = remote.commands
+        to_driver()
+        results[f"{prefix}_to_driver_round_trips"] = remote.commands - commands
+
+        results[f"{prefix}_to_session_full_ms"] = median_ms(lambda: session.transfer_driver_cookies_to_session(full=True), repeat)
+        # With nothing changed since the last transfer, only the lookups and the diff remain
+        results[f"{prefix}_to_session_unchanged_ms"] = median_ms(session.transfer_driver_cookies_to_session, repeat)
+        commands = remote.commands
+        session.transfer_driver_cookies_to_session()
+        results[f"{prefix}_to_session_round_trips"] = remote.commands - commands
+    finally:
+        driver.quit()
+    return results
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    repeat = 3 if quick else 10
+    results = {}
+    with FakeRemoteEnd() as remote:
+        for cdp in (False, True):
+            results.update(_run_driver(remote, cdp=cdp, repeat=repeat))
+    return results
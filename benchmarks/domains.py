@@ -0,0 +1,82 @@
+"""
+Compare the cost of resolving cookie domains with tldextract's defaults and with requestium's resolver.
+
+Each resolver runs in a fresh interpreter with an empty tldextract cache directory, so the first
+call pays for loading the Public Suffix List (and with tldextract's defaults, trying to fetch it)
+like it would in a new container.
+Run with: python -m benchmarks --only domains
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# The domains of a typical cookie jar: a few sites, each with cookies set on a handful of hosts
+COOKIE_DOMAINS: list[str] = [f"{host}.site{i}.{suffix}" for i in range(20) for host in ("www", "api", "auth", "static", "") for suffix in ("com", "co.uk")]
+
+
+def tldextract_resolver() -> Callable[[str], str]:
+    import tldextract  # noqa: PLC0415
+
+    return lambda domain: tldextract.extract(domain).top_domain_under_public_suffix
+
+
+def requestium_resolver() -> Callable[[str], str]:
+    from requestium.requestium_domains import registered_domain  # noqa: PLC0415
+
+    return registered_domain
+
+
+RESOLVERS: dict[str, Callable[[], Callable[[str], str]]] = {"tldextract": tldextract_resolver, "requestium": requestium_resolver}
+
+
+def run_resolver(name: str, lookups: int) -> dict[str, float]:
+    resolve = RESOLVERS[name]()
+
+    start = time.perf_counter()
+    resolve(COOKIE_DOMAINS[0])
+    first_call = time.perf_counter() - start
+
+    domains = [COOKIE_DOMAINS[i % len(COOKIE_DOMAINS)].strip(".") for i in range(lookups)]
+    start = time.perf_counter()
+    for domain in domains:
+        resolve(domain)
+    per_cookie = (time.perf_counter() - start) / lookups
+    return {"first_call_ms": first_call * 1000, "per_cookie_us": per_cookie * 1_000_000}
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    lookups = 10_000 if quick else 100_000
+    results = {}
+    for name in RESOLVERS:
+        command = [sys.executable, "-m", "benchmarks.domains", "--resolver", name, "--lookups", str(lookups)]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = {**os.environ, "TLDEXTRACT_CACHE": cache_dir}
+            output = subprocess.run(command, capture_output=True, check=True, text=True, env=env).stdout  # nosec B603
+        for metric, value in json.loads(output).items():
+            results[f"{name}_{metric}"] = value
+    results["per_cookie_speedup"] = results["tldextract_per_cookie_us"] / results["requestium_per_cookie_us"]
+    return results
+
+
+def main() -> None:
+    """Run a single resolver in this interpreter, as 'run' does in a fresh one for each of them."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--resolver", choices=RESOLVERS, required=True)
+    args = parser.parse_args()
+    json.dump(run_resolver(args.resolver, args.lookups), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
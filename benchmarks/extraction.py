@@ -0,0 +1,53 @@
+"""
+Compare the throughput of extracting records from many pages serially and with 'extract_many'.
+
+The pages are listings already in memory, as if they were just fetched, and each is parsed and
+queried with the same schema, in the calling thread, in a thread pool and in a process pool with
+a worker per cpu. The pool timings include starting the pool.
+Run with: python -m benchmarks --only extraction
+"""
+
+from __future__ import annotations
+
+import time
+
+import requests
+
+import requestium
+from requestium.requestium_response import RequestiumResponse
+from tests.support import listing_page
+
+from .parsing import LISTING_SCHEMA
+
+PAGES: int = 200
+ITEMS_PER_PAGE: int = 200
+
+EXECUTORS: dict[str, dict[str, object]] = {
+    "serial": {"workers": 0},
+    "thread": {"executor": "thread"},
+    "process": {"executor": "process"},
+}
+
+
+def make_response(body: bytes) -> RequestiumResponse:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body  # noqa: SLF001
+    response.encoding = "utf-8"
+    return RequestiumResponse(response)
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    pages = PAGES // 4 if quick else PAGES
+    body = listing_page(ITEMS_PER_PAGE).encode()
+    responses = [make_response(body) for _ in range(pages)]
+
+    results = {}
+    for name, kwargs in EXECUTORS.items():
+        start = time.perf_counter()
+        for _ in requestium.extract_many(responses, LISTING_SCHEMA, **kwargs):  # type: ignore[arg-type]
+            pass
+        results[f"{name}_pages_per_s"] = pages / (time.perf_counter() - start)
+    results["thread_speedup"] = results["thread_pages_per_s"] / results["serial_pages_per_s"]
+    results["process_speedup"] = results["process_pages_per_s"] / results["serial_pages_per_s"]
+    return results
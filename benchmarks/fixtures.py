@@ -0,0 +1,45 @@
+"""Offline fixtures for the benchmarks: an in-process fixture site, served with the tests' support helpers."""
+
+from __future__ import annotations
+
+import urllib.parse
+from http.server import BaseHTTPRequestHandler
+
+from tests.support import BLANK_PAGE, listing_page
+
+
+class FixtureSiteHandler(BaseHTTPRequestHandler):
+    """
+    Serves the pages the benchmarks request over http.
+
+    '/listing?items=N' is a listing_page of N items, and '/cookies?count=N&domain=D' sets N cookies
+    on the domain D.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        cookies = []
+        if url.path == "/listing":
+            body = listing_page(int(query.get("items", 100))).encode()
+        elif url.path == "/cookies":
+            domain = f"; Domain={query['domain']}" if "domain" in query else ""
+            cookies = [f"cookie{i}=value{i}; Path=/{domain}" for i in range(int(query.get("count", 10)))]
+            body = BLANK_PAGE.encode()
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for cookie in cookies:
+            self.send_header("Set-Cookie", cookie)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
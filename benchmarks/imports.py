@@ -0,0 +1,29 @@
+"""
+Measure how long importing requestium takes, on top of requests, in a fresh interpreter.
+
+'driver_import_ms' also imports the driver helpers, which pulls in selenium, as the first use
+of a driver does.
+Run with: python -m benchmarks --only imports
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+IMPORTS: dict[str, str] = {
+    "import_ms": "import requestium",
+    "driver_import_ms": "import requestium.requestium_mixin",
+}
+
+
+def _import_time(statement: str) -> float:
+    code = f"import time, requests; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True).stdout  # nosec B603
+    return float(output)
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    repeat = 3 if quick else 10
+    # The fastest run is the one least disturbed by the rest of the machine
+    return {name: min(_import_time(statement) for _ in range(repeat)) * 1000 for name, statement in IMPORTS.items()}
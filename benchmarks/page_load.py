@@ -0,0 +1,88 @@
+"""
+Compare page load times with and without a resource blocking profile.
+
+Serves a local page that pulls in slow images, fonts, stylesheets and media, and times
+'driver.get' on it with the default webdriver options and with the load profile.
+Needs Chrome, so it only runs when named. Run with: python -m benchmarks --only page_load
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+
+import requestium
+from tests.support import serve
+
+RESOURCE_DELAY: float = 0.05
+RESOURCES: int = 20
+
+PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    "blocking": {"block_resources": ["image", "font", "media", "stylesheet"], "page_load_strategy": "eager"},
+}
+
+
+class SlowResourcesHandler(BaseHTTPRequestHandler):
+    """Serves a page referencing RESOURCES images, fonts, stylesheets and videos, each taking RESOURCE_DELAY to arrive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _page(self) -> str:
+        # Unique urls per page load, so the browser's cache doesn't help either profile
+        token = time.monotonic_ns()
+        resources = "".join(
+            f"<link rel='stylesheet' href='/style{i}.css?{token}'>"
+            f"<link rel='preload' as='font' crossorigin href='/font{i}.woff2?{token}'>"
+            f"<img src='/image{i}.png?{token}'>"
+            f"<video src='/video{i}.mp4?{token}' preload='auto'></video>"
+            for i in range(RESOURCES)
+        )
+        return f"<html><head><title>Fixture</title></head><body><h1>Fixture</h1>{resources}</body></html>"
+
+    def do_GET(self) -> None:
+        path = self.path.partition("?")[0]
+        if path == "/":
+            body = self._page().encode()
+            content_type = "text/html; charset=utf-8"
+        else:
+            time.sleep(RESOURCE_DELAY)
+            body = b"\0" * 1024
+            content_type = "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def time_page_loads(url: str, webdriver_options: dict[str, Any], repeat: int) -> list[float]:
+    session = requestium.Session(headless=True, webdriver_options={"arguments": ["--no-sandbox"], **webdriver_options})
+    try:
+        session.driver.get(url)  # Warm up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            session.driver.get(url)
+            timings.append(time.perf_counter() - start)
+        return timings
+    finally:
+        session.driver.quit()
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    repeat = 3 if quick else 10
+    results = {}
+    with serve(SlowResourcesHandler) as url:
+        for name, webdriver_options in PROFILES.items():
+            timings = time_page_loads(f"{url}/", webdriver_options, repeat)
+            results[f"{name}_median_ms"] = statistics.median(timings) * 1000
+            results[f"{name}_min_ms"] = min(timings) * 1000
+    results["speedup"] = results["default_median_ms"] / results["blocking_median_ms"]
+    return results
@@ -0,0 +1,88 @@
+"""
+Measure how fast responses and driver pages are parsed and queried.
+
+Parses a listing page served by the in-process fixture site, whole and streamed, and the same
+page read from a fake WebDriver remote end, with and without a snapshot. The items of the
+listing are also extracted into records with an ExtractionSchema, and with the equivalent
+'xpath' calls.
+Run with: python -m benchmarks --only parsing
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import requests
+
+import requestium
+from requestium.requestium_response import RequestiumResponse
+from requestium.requestium_schema import ExtractionSchema, Field, Nested
+from tests.support import FakeRemoteEnd, listing_page, serve
+
+from .fixtures import FixtureSiteHandler
+from .timing import calls_per_second, median_ms
+
+ITEMS: int = 2000
+
+ITEM_XPATH = "//li[@class='item']/a/text()"
+
+LISTING_SCHEMA = ExtractionSchema(
+    {
+        "title": "//h1/text()",
+        "items": Nested(
+            "//li[@class='item']",
+            fields={"id": "@data-id", "name": "a/text()", "url": "a/@href", "price": Field("span[@class='price']/text()", re=r"[\d.]+")},
+        ),
+    }
+)
+
+
+def extract_with_selectors(response: RequestiumResponse) -> dict[str, Any]:
+    """Extract the same records as LISTING_SCHEMA, with a call per field."""
+    return {
+        "title": response.xpath("//h1/text()").get(),
+        "items": [
+            {
+                "id": item.xpath("@data-id").get(),
+                "name": item.xpath("a/text()").get(),
+                "url": item.xpath("a/@href").get(),
+                "price": item.xpath("span[@class='price']/text()").re_first(r"[\d.]+"),
+            }
+            for item in response.xpath("//li[@class='item']")
+        ],
+    }
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    repeat = 3 if quick else 15
+    duration = 0.2 if quick else 1.0
+    results = {}
+
+    with serve(FixtureSiteHandler) as url, requestium.Session() as session:
+        raw_response = requests.get(f"{url}/listing?items={ITEMS}", timeout=10)
+        # A fresh wrapper on each call, so the parsed tree isn't reused from the previous one
+        results["response_parse_ms"] = median_ms(lambda: RequestiumResponse(raw_response).selector, repeat)
+
+        response = session.get(f"{url}/listing?items={ITEMS}")
+        results["cached_selector_queries_per_s"] = calls_per_second(lambda: response.xpath(ITEM_XPATH).get(), duration)
+        results["selector_extraction_ms"] = median_ms(lambda: extract_with_selectors(response), repeat)
+        results["schema_extraction_ms"] = median_ms(lambda: LISTING_SCHEMA.extract(response), repeat)
+
+        def stream() -> None:
+            for _ in session.get(f"{url}/listing?items={ITEMS}", stream=True).iter_xpath("//li[@class='item']"):
+                pass
+
+        results["iter_xpath_ms"] = median_ms(stream, repeat)
+
+    with FakeRemoteEnd() as remote:
+        remote.pages["http://site.com/"] = listing_page(ITEMS)
+        driver = remote.driver()
+        try:
+            driver.get("http://site.com/")
+            results["driver_query_ms"] = median_ms(lambda: driver.xpath(ITEM_XPATH).get(), repeat)
+            with driver.snapshot():
+                results["driver_snapshot_queries_per_s"] = calls_per_second(lambda: driver.xpath(ITEM_XPATH).get(), duration)
+        finally:
+            driver.quit()
+
+    return results
@@ -0,0 +1,57 @@
+"""
+Measure the cost of wrapping requests' responses in RequestiumResponse, in time and in classes.
+
+Wraps a million responses (a hundred thousand with --quick), half of them of a Response
+subclass, and counts the classes that exist afterwards beyond those that existed before. The
+count must stay flat however many responses are wrapped: the wrapper builds no class per
+response, only one per Response subclass it meets.
+Run with: python -m benchmarks --only responses
+"""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+
+import requests
+
+from requestium.requestium_response import RequestiumResponse
+
+
+class _CustomResponse(requests.Response):
+    pass
+
+
+def _count_classes() -> int:
+    gc.collect()
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, type))
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    responses = 100_000 if quick else 1_000_000
+    response = requests.Response()
+    custom_response = _CustomResponse()
+
+    classes_before = _count_classes()
+    start = time.perf_counter()
+    for _ in range(responses // 2):
+        RequestiumResponse(response)
+        RequestiumResponse(custom_response)
+    elapsed = time.perf_counter() - start
+    classes_created = _count_classes() - classes_before
+
+    # The memory a batch of wrapped responses holds on to, per response
+    batch = 1000
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    wrapped = [RequestiumResponse(response) for _ in range(batch)]
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, "lineno"))
+    tracemalloc.stop()
+    del wrapped
+
+    return {
+        "wrap_us": elapsed / responses * 1_000_000,
+        "classes_created": classes_created,
+        "bytes_per_response": allocated / batch,
+    }
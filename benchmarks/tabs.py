@@ -0,0 +1,45 @@
+"""
+Measure the pages per second a single driver loads one page at a time, and in a pool of tabs.
+
+A fake WebDriver remote end takes a fixed time to load each page, loading the pages of each
+tab at the same time like a browser does, so the tab pool's speedup is the overlap of the loads
+minus the cost of its window switches and readiness checks.
+Run with: python -m benchmarks --only tabs
+"""
+
+from __future__ import annotations
+
+import time
+
+from tests.support import FakeRemoteEnd, listing_page
+
+LOAD_TIME: float = 0.05
+
+TAB_COUNTS = (4, 8)
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    pages = 16 if quick else 64
+    results = {}
+    with FakeRemoteEnd(load_time=LOAD_TIME) as remote:
+        urls = [f"http://site.com/{i}" for i in range(pages)]
+        remote.pages.update(dict.fromkeys(urls, listing_page(20)))
+        driver = remote.driver()
+        try:
+            start = time.perf_counter()
+            for url in urls:
+                driver.get(url)
+                driver.xpath("//li")
+            sequential = pages / (time.perf_counter() - start)
+            results["sequential_pages_per_s"] = sequential
+
+            for tabs in TAB_COUNTS:
+                start = time.perf_counter()
+                with driver.tabs(tabs) as pool:
+                    for tab in pool.as_loaded(urls):
+                        tab.xpath("//li")
+                results[f"tabs_{tabs}_pages_per_s"] = pages / (time.perf_counter() - start)
+                results[f"tabs_{tabs}_speedup"] = results[f"tabs_{tabs}_pages_per_s"] / sequential
+        finally:
+            driver.quit()
+    return results
@@ -0,0 +1,35 @@
+"""Timing helpers shared by the benchmarks."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def time_calls(func: Callable[[], Any], repeat: int) -> list[float]:
+    """Call 'func' 'repeat' times, returning how long each call took, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def median_ms(func: Callable[[], Any], repeat: int) -> float:
+    """Return the median time of a call to 'func', in milliseconds."""
+    return statistics.median(time_calls(func, repeat)) * 1000
+
+
+def calls_per_second(func: Callable[[], Any], duration: float) -> float:
+    """Return how many times per second 'func' can be called, measured over at least 'duration' seconds."""
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        func()
+        calls += 1
+    return calls / elapsed
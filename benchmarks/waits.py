@@ -0,0 +1,38 @@
+"""
+Measure how late 'ensure_element' notices an element appearing, with each wait engine.
+
+A fake WebDriver remote end reveals the element a fixed delay after the wait starts, and the
+latency is the time the wait took beyond that delay.
+Run with: python -m benchmarks --only waits
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+
+from tests.support import FakeRemoteEnd
+
+ELEMENT_DELAY: float = 0.1
+
+ENGINES = ("poll", "mutation")
+
+
+def run(*, quick: bool = False) -> dict[str, float]:
+    repeat = 2 if quick else 5
+    results = {}
+    with FakeRemoteEnd() as remote:
+        driver = remote.driver()
+        try:
+            for engine in ENGINES:
+                latencies = []
+                for _ in range(repeat):
+                    remote.hide("css selector", "#late")
+                    remote.reveal("css selector", "#late", after=ELEMENT_DELAY)
+                    start = time.perf_counter()
+                    driver.ensure_element("css selector", "#late", timeout=5, engine=engine)
+                    latencies.append(time.perf_counter() - start - ELEMENT_DELAY)
+                results[f"{engine}_latency_ms"] = statistics.median(latencies) * 1000
+        finally:
+            driver.quit()
+    return results
@@ -1,6 +1,52 @@
-from selenium.common import exceptions  # noqa: F401
-from selenium.webdriver.common.by import By  # noqa: F401
-from selenium.webdriver.common.keys import Keys  # noqa: F401
-from selenium.webdriver.support.ui import Select  # noqa: F401
+from __future__ import annotations
 
-from .requestium import Session  # noqa: F401
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .requestium import (  # noqa: F401
+    HTTPCache,
+    Instrumentation,
+    LoggingSink,
+    MemoryCache,
+    NetworkRecording,
+    OpenTelemetrySink,
+    ReplayError,
+    Session,
+    SQLiteCache,
+)
+
+if TYPE_CHECKING:
+    from selenium.common import exceptions  # noqa: F401
+    from selenium.webdriver.common.by import By  # noqa: F401
+    from selenium.webdriver.common.keys import Keys  # noqa: F401
+    from selenium.webdriver.support.ui import Select  # noqa: F401
+
+    from .requestium import AsyncSession, ClickStrategy, Crawler, DriverPool, ExtractionSchema, Field, Nested, TabPool, extract_many  # noqa: F401
+
+# Importing selenium takes a good part of a second, so its names, and ours that need it (or
+# asyncio, or lxml), are only imported on first access. Workers that just make requests never import it.
+_LAZY_NAMES: dict[str, str] = {
+    "exceptions": "selenium.common",
+    "By": "selenium.webdriver.common.by",
+    "Keys": "selenium.webdriver.common.keys",
+    "Select": "selenium.webdriver.support.ui",
+    "AsyncSession": "requestium.requestium",
+    "ClickStrategy": "requestium.requestium",
+    "Crawler": "requestium.requestium",
+    "DriverPool": "requestium.requestium",
+    "ExtractionSchema": "requestium.requestium",
+    "Field": "requestium.requestium",
+    "Nested": "requestium.requestium",
+    "extract_many": "requestium.requestium",
+    "TabPool": "requestium.requestium",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import selenium's names, and the requestium names that need selenium, on first access."""
+    if name not in _LAZY_NAMES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+    globals()[name] = value
+    return value
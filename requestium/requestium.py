@@ -1,6 +1,54 @@
-from .requestium_mixin import (  # noqa: F401
-    DriverMixin,
-    _ensure_click,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .requestium_cache import CacheBackend, CacheStats, HTTPCache, MemoryCache, SQLiteCache  # noqa: F401
+from .requestium_instrumentation import Instrumentation, InstrumentationStats, LoggingSink, OpenTelemetrySink, Span, SpanStats  # noqa: F401
+from .requestium_replay import NetworkRecording, RecordedRequest, ReplayError  # noqa: F401
 from .requestium_response import RequestiumResponse  # noqa: F401
-from .requestium_session import Session  # noqa: F401
+from .requestium_session import CookieSyncReport, Session  # noqa: F401
+
+if TYPE_CHECKING:
+    from .requestium_async import AsyncSession  # noqa: F401
+    from .requestium_crawler import Crawler, CrawlerWorkerError  # noqa: F401
+    from .requestium_extract import extract_many  # noqa: F401
+    from .requestium_mixin import (  # noqa: F401
+        ClickStats,
+        ClickStrategy,
+        DriverMixin,
+        EnsureElementsTimeoutException,
+        _ensure_click,
+    )
+    from .requestium_pool import DriverPool  # noqa: F401
+    from .requestium_schema import ExtractionSchema, Field, Nested  # noqa: F401
+    from .requestium_tabs import Tab, TabPool  # noqa: F401
+
+# The names that need selenium, asyncio or lxml, imported from their modules on first access
+_LAZY_NAMES: dict[str, str] = {
+    "AsyncSession": ".requestium_async",
+    "ClickStats": ".requestium_mixin",
+    "ClickStrategy": ".requestium_mixin",
+    "DriverMixin": ".requestium_mixin",
+    "EnsureElementsTimeoutException": ".requestium_mixin",
+    "_ensure_click": ".requestium_mixin",
+    "DriverPool": ".requestium_pool",
+    "Crawler": ".requestium_crawler",
+    "CrawlerWorkerError": ".requestium_crawler",
+    "ExtractionSchema": ".requestium_schema",
+    "Field": ".requestium_schema",
+    "Nested": ".requestium_schema",
+    "extract_many": ".requestium_extract",
+    "Tab": ".requestium_tabs",
+    "TabPool": ".requestium_tabs",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the names that need selenium, asyncio or lxml on first access."""
+    if name not in _LAZY_NAMES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(_LAZY_NAMES[name], __package__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from requests.adapters import HTTPAdapter
+
+from .requestium_session import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
+
+    from requests.cookies import RequestsCookieJar
+    from requests.structures import CaseInsensitiveDict
+
+    from .requestium_mixin import DriverMixin
+    from .requestium_response import RequestiumResponse
+    from .requestium_session import CookieSyncReport
+
+DEFAULT_CONCURRENCY: int = 10
+
+
+class AsyncSession:
+    """
+    Asyncio counterpart of requestium's Session.
+
+    Requests is a blocking library, so every request runs on a thread of a pool owned by this
+    session while the coroutine awaits it. All the threads share a single requestium Session, so
+    they use the same cookie jar, headers and webdriver, and the cookie 'transfer' methods work
+    just as they do on the synchronous session.
+
+    'max_concurrency' caps the requests in flight at any time. The remaining keyword arguments
+    are used to build the underlying Session, or an existing one can be wrapped with 'session'.
+    """
+
+    def __init__(self, *, session: Session | None = None, max_concurrency: int = DEFAULT_CONCURRENCY, **session_kwargs) -> None:
+        if session is None:
+            session = Session(**session_kwargs)
+            # Keep a pooled connection per request in flight, instead of opening and discarding them.
+            # We don't touch the adapters of a Session we were given, they may be custom ones.
+            adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        elif session_kwargs:
+            msg = f"Can't pass Session arguments when wrapping an existing session, got: {', '.join(session_kwargs)}"
+            raise TypeError(msg)
+
+        self.session = session
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="requestium")
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:  # noqa: ANN401
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def close(self) -> None:
+        await self._run(self.session.close)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def cookies(self) -> RequestsCookieJar:
+        return self.session.cookies
+
+    @property
+    def headers(self) -> CaseInsensitiveDict[str]:
+        return self.session.headers
+
+    @property
+    def driver(self) -> DriverMixin:
+        return self.session.driver
+
+    async def request(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.request, *args, **kwargs)
+
+    async def get(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.get, *args, **kwargs)
+
+    async def options(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.options, *args, **kwargs)
+
+    async def head(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.head, *args, **kwargs)
+
+    async def post(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.post, *args, **kwargs)
+
+    async def put(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.put, *args, **kwargs)
+
+    async def patch(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.patch, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs) -> RequestiumResponse:
+        return await self._run(self.session.delete, *args, **kwargs)
+
+    async def gather(
+        self,
+        requests: Iterable[str | dict[str, Any]],
+        *,
+        method: str = "get",
+        limit: int | None = None,
+        return_exceptions: bool = False,
+        **kwargs,
+    ) -> list[Any]:
+        """
+        Run many requests concurrently and return their responses in the same order.
+
+        Each item of 'requests' is either a url, or a dict of keyword arguments for the request
+        which may include its own 'method'. The 'method' and remaining keyword arguments of this
+        call are the defaults for every request.
+
+        At most 'limit' requests are in flight at once, defaulting to the session's
+        'max_concurrency'. As with 'asyncio.gather', the first failure is raised unless
+        'return_exceptions' is set, in which case the exceptions take the place of the responses.
+        """
+        semaphore = asyncio.Semaphore(limit or self.max_concurrency)
+
+        async def fetch(request: str | dict[str, Any]) -> RequestiumResponse:
+            if isinstance(request, str):
+                request = {"url": request}
+            async with semaphore:
+                return await self.request(**{"method": method, **kwargs, **request})
+
+        return await asyncio.gather(*(fetch(request) for request in requests), return_exceptions=return_exceptions)
+
+    async def transfer_session_cookies_to_driver(self, domain: str | None = None) -> None:
+        await self._run(self.session.transfer_session_cookies_to_driver, domain)
+
+    async def transfer_driver_cookies_to_session(self, *, copy_user_agent: bool | None = True, full: bool = False) -> CookieSyncReport:
+        return await self._run(self.session.transfer_driver_cookies_to_session, copy_user_agent=copy_user_agent, full=full)
+
+    async def copy_user_agent_from_driver(self) -> None:
+        await self._run(self.session.copy_user_agent_from_driver)
+
+    async def __aenter__(self) -> AsyncSession:
+        """Use the session as an async context manager, closing it on exit."""
+        return self
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        """Close the session and its thread pool."""
+        await self.close()
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import calendar
+import collections
+import datetime
+import email.utils
+import json
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from requests import PreparedRequest
+
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+
+# Statuses which are cacheable by default (RFC 9111), minus the redirects, as requests follows
+# those outside of the hop being cached
+_CACHEABLE_STATUSES = frozenset({200, 203, 204, 404, 405, 410, 414, 501})
+
+# Header fields a 304 doesn't update in the stored response, they describe its own empty body or connection (RFC 9111 3.2, 4.3.4)
+_NOT_UPDATED_HEADERS = frozenset({"content-length", "content-encoding", "transfer-encoding", "connection", "keep-alive", "te", "upgrade"})
+
+# Without explicit freshness, a response with a Last-Modified date stays fresh for this fraction of its age (RFC 9111 4.2.2)
+_HEURISTIC_FRESHNESS_FRACTION: float = 0.1
+
+
+class CacheBackend:
+    """
+    Where an HTTPCache keeps its entries.
+
+    Entries are dicts of json serializable values, plus the response body under 'content'.
+    Subclasses implement 'get', 'set', 'delete' and 'clear', and must be safe to use from many
+    threads, as AsyncSession sends requests from a thread pool.
+    """
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+def _entry_size(entry: dict[str, Any]) -> int:
+    return len(entry["content"]) + sum(len(name) + len(value) for name, value in entry["headers"].items())
+
+
+class MemoryCache(CacheBackend):
+    """Keeps the entries in memory, evicting the least recently used ones when they take more than 'max_bytes'."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: collections.OrderedDict[str, dict[str, Any]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= _entry_size(entry)
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        entry_size = _entry_size(entry)
+        with self._lock:
+            self._pop(key)
+            if entry_size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += entry_size
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        """Return the amount of entries."""
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """Keeps the entries in a SQLite database file, so they are shared between processes and runs."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS requestium_cache (key TEXT PRIMARY KEY, entry TEXT NOT NULL, content BLOB NOT NULL)")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._connection.execute("SELECT entry, content FROM requestium_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {**json.loads(row[0]), "content": row[1]}
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        metadata = json.dumps({name: value for name, value in entry.items() if name != "content"})
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO requestium_cache VALUES (?, ?, ?)", (key, metadata, entry["content"]))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM requestium_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM requestium_cache")
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CacheStats:
+    """Counters of an HTTPCache's lookups."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self.bytes_from_cache = 0
+
+    def __repr__(self) -> str:
+        """Show all of the counters."""
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, revalidations={self.revalidations}, "
+            f"stores={self.stores}, bytes_from_cache={self.bytes_from_cache})"
+        )
+
+
+def _cache_key(method: str | None, url: str | None) -> str:
+    return f"{method} {url}"
+
+
+def _lowercase_headers(response: Response) -> dict[str, str]:
+    return {name.lower(): value for name, value in response.headers.items()}
+
+
+def _parse_cache_control(value: str | bytes | None) -> dict[str, str | None]:
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    directives: dict[str, str | None] = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    parsed = email.utils.parsedate_tz(value)
+    return calendar.timegm(parsed[:9]) - (parsed[9] or 0) if parsed else None
+
+
+def _freshness_lifetime(headers: dict[str, str]) -> float:
+    cache_control = _parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in cache_control:
+        return 0
+    if cache_control.get("max-age"):
+        try:
+            return float(cache_control["max-age"])  # type: ignore[arg-type]
+        except ValueError:
+            return 0
+    date = _parse_http_date(headers.get("date"))
+    expires = _parse_http_date(headers.get("expires"))
+    if "expires" in headers:
+        return max((expires or 0) - (date or time.time()), 0)
+    last_modified = _parse_http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return max((date or time.time()) - last_modified, 0) * _HEURISTIC_FRESHNESS_FRACTION
+    return 0
+
+
+def _is_fresh(entry: dict[str, Any]) -> bool:
+    headers = entry["headers"]
+    try:
+        initial_age = float(headers.get("age", 0))
+    except ValueError:
+        initial_age = 0
+    age = initial_age + time.time() - entry["stored_at"]
+    return age < _freshness_lifetime(headers)
+
+
+def _is_storable(response: Response) -> bool:
+    cache_control = _parse_cache_control(response.headers.get("Cache-Control"))
+    if response.status_code not in _CACHEABLE_STATUSES or "no-store" in cache_control or response.headers.get("Vary", "").strip() == "*":
+        return False
+    has_validators = "ETag" in response.headers or "Last-Modified" in response.headers
+    return has_validators or _freshness_lifetime(_lowercase_headers(response)) > 0
+
+
+def _vary_matches(entry: dict[str, Any], request: PreparedRequest) -> bool:
+    return all(request.headers.get(name) == value for name, value in entry["vary"].items())
+
+
+def _build_entry(response: Response, request: PreparedRequest) -> dict[str, Any]:
+    vary = [name.strip() for name in response.headers.get("Vary", "").split(",") if name.strip()]
+    return {
+        "url": response.url,
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "headers": _lowercase_headers(response),
+        "encoding": response.encoding,
+        "vary": {name: request.headers.get(name) for name in vary},
+        "stored_at": time.time(),
+        "content": response.content,
+    }
+
+
+def _build_response(entry: dict[str, Any], request: PreparedRequest) -> Response:
+    response = Response()
+    response.status_code = entry["status_code"]
+    response.reason = entry["reason"]
+    response.url = entry["url"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"] or get_encoding_from_headers(response.headers)
+    response._content = entry["content"]  # noqa: SLF001
+    # There's no raw stream to read, 'iter_content' must go over the stored body, even on streamed requests
+    response._content_consumed = True  # noqa: SLF001
+    response.request = request
+    response.elapsed = datetime.timedelta(0)
+    response.from_cache = True  # type: ignore[attr-defined]
+    return response
+
+
+class HTTPCache:
+    """
+    A private HTTP cache for Session, following the Cache-Control, Expires, ETag and Last-Modified headers.
+
+    GET and HEAD responses are stored in the 'backend' (a MemoryCache by default) and served
+    from it while they are fresh, without touching the network. Once stale, they are revalidated
+    with a conditional request, and a '304 Not Modified' answer is served from the cache too.
+    Other methods are sent as usual, and invalidate the cached responses of their url.
+
+    Responses served from the cache have their 'from_cache' attribute set, and the 'stats'
+    count hits (served without a request), revalidations, misses and stores.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None) -> None:
+        self.backend = backend if backend is not None else MemoryCache()
+        self.stats = CacheStats()
+
+    def send(self, request: PreparedRequest, send: Callable[[PreparedRequest], Response], *, stream: bool = False) -> Response:
+        """Answer the request from the cache if we can, otherwise send it with 'send' and cache the response."""
+        request_cache_control = _parse_cache_control(request.headers.get("Cache-Control"))
+        if request.method not in {"GET", "HEAD"}:
+            self.backend.delete(_cache_key("GET", request.url))
+            self.backend.delete(_cache_key("HEAD", request.url))
+            return send(request)
+        if "no-store" in request_cache_control:
+            return send(request)
+
+        key = _cache_key(request.method, request.url)
+        entry = self.backend.get(key)
+        if entry is not None and not _vary_matches(entry, request):
+            entry = None
+
+        if entry is not None:
+            if "no-cache" not in request_cache_control and _is_fresh(entry):
+                self.stats.hits += 1
+                self.stats.bytes_from_cache += len(entry["content"])
+                return _build_response(entry, request)
+            request = request.copy()
+            if entry["headers"].get("etag"):
+                request.headers["If-None-Match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                request.headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+
+        response = send(request)
+
+        if entry is not None and response.status_code == 304:  # noqa: PLR2004
+            self.stats.revalidations += 1
+            self.stats.bytes_from_cache += len(entry["content"])
+            updated_headers = {name: value for name, value in _lowercase_headers(response).items() if name not in _NOT_UPDATED_HEADERS}
+            entry = {**entry, "headers": {**entry["headers"], **updated_headers}, "stored_at": time.time()}
+            self.backend.set(key, entry)
+            return _build_response(entry, request)
+
+        self.stats.misses += 1
+        # Streamed bodies would have to be read whole to store them, and redirect chains store each of their hops instead
+        if not stream and not response.history and _is_storable(response):
+            self.backend.set(key, _build_entry(response, request))
+            self.stats.stores += 1
+        return response
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import itertools
+import os
+import pickle  # nosec B403
+import queue
+import signal
+from typing import TYPE_CHECKING, Any
+
+from .requestium_pool import _DRIVER_ERRORS
+from .requestium_processes import DEFAULT_MP_CONTEXT, _get_mp_context
+from .requestium_session import Session
+
+if TYPE_CHECKING:
+    import multiprocessing
+    from collections.abc import Callable, Iterable, Iterator
+    from multiprocessing.context import BaseContext
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.sharedctypes import SynchronizedArray
+    from types import FrameType, TracebackType
+
+# How often the crawler checks on its workers while it waits for results
+_POLL_INTERVAL: float = 0.2
+
+# Jobs each worker holds at once: the one it runs and the next, so it never waits on us
+_WORKER_PREFETCH: int = 2
+
+# How long a worker gets to quit its driver and exit when the crawler shuts down
+_SHUTDOWN_TIMEOUT: float = 10
+
+
+class CrawlerWorkerError(RuntimeError):
+    """A worker process died while running a job."""
+
+
+def _exit_on_sigterm(signum: int, _frame: FrameType | None) -> None:
+    raise SystemExit(128 + signum)
+
+
+def _quit_driver(session: Session) -> None:
+    driver, session._driver = session._driver, None  # noqa: SLF001
+    if driver is not None:
+        with contextlib.suppress(*_DRIVER_ERRORS):
+            driver.quit()
+
+
+def _driver_crashed(session: Session) -> bool:
+    if session._driver is None:  # noqa: SLF001
+        return False
+    try:
+        _ = session._driver.window_handles  # noqa: SLF001
+    except _DRIVER_ERRORS:
+        return True
+    return False
+
+
+def _dump_result(value: Any) -> bytes:  # noqa: ANN401
+    try:
+        return pickle.dumps((True, value))
+    except Exception as e:  # noqa: BLE001
+        msg = f"The job's result can't be sent back from the worker: {e!r}"
+        return pickle.dumps((False, TypeError(msg)))
+
+
+def _dump_exception(exception: Exception) -> bytes:
+    try:
+        payload = pickle.dumps((False, exception))
+        pickle.loads(payload)  # nosec B301
+    except Exception:  # noqa: BLE001
+        # Some exceptions can't be rebuilt from their args, send what we can of them
+        return pickle.dumps((False, RuntimeError(f"{type(exception).__name__}: {exception}")))
+    return payload
+
+
+def _worker_main(  # noqa: PLR0913
+    job: Callable[[Session, Any], Any],
+    session_kwargs: dict[str, Any],
+    tasks: multiprocessing.Queue[tuple[int, int, Any] | None],
+    results: multiprocessing.Queue[tuple[int, int, int, bytes]],
+    worker_id: int,
+    started: SynchronizedArray[int],
+) -> None:
+    # Make 'terminate' run the cleanup below instead of leaving the browser behind
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    session = Session(**session_kwargs)
+    try:
+        while (task := tasks.get()) is not None:
+            run, index, item = task
+            # Written to shared memory at once, unlike queued results, which are lost if the job kills the process
+            started[:] = [run, index]
+            try:
+                payload = _dump_result(job(session, item))
+            except Exception as e:  # noqa: BLE001
+                payload = _dump_exception(e)
+                # Start a fresh browser for the next job if this one took the current one down
+                if _driver_crashed(session):
+                    _quit_driver(session)
+            results.put((worker_id, run, index, payload))
+    finally:
+        _quit_driver(session)
+        session.close()
+
+
+class _Worker:
+    __slots__ = ("assigned", "id", "process", "started", "tasks")
+
+    def __init__(
+        self, worker_id: int, process: BaseProcess, tasks: multiprocessing.Queue[tuple[int, int, Any] | None], started: SynchronizedArray[int]
+    ) -> None:
+        self.id = worker_id
+        self.process = process
+        self.tasks = tasks
+        self.started = started  # The (run, index) of the last job the worker started
+        self.assigned: dict[int, Any] = {}
+
+
+class _CrawlRun:
+    """The bookkeeping of a 'Crawler.map' call: the inputs taken, the retries due and the results not yielded yet."""
+
+    def __init__(self, run: int, inputs: Iterable[Any], max_pending: int, max_retries: int) -> None:
+        self.run = run
+        self.inputs = enumerate(inputs)
+        self.inputs_exhausted = False
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retries: collections.deque[tuple[int, Any]] = collections.deque()
+        self.attempts: collections.Counter[int] = collections.Counter()
+        self.finished: dict[int, tuple[bool, Any]] = {}
+        self.pending = 0  # Inputs taken whose results weren't yielded yet
+        self.next_index = 0
+
+    def next_task(self) -> tuple[int, Any] | None:
+        if self.retries:
+            return self.retries.popleft()
+        if self.inputs_exhausted or self.pending >= self.max_pending:
+            return None
+        task = next(self.inputs, None)
+        if task is None:
+            self.inputs_exhausted = True
+        else:
+            self.pending += 1
+        return task
+
+    def failed(self, index: int, item: Any, exception: Exception) -> None:  # noqa: ANN401
+        self.attempts[index] += 1
+        if self.attempts[index] <= self.max_retries:
+            self.retries.append((index, item))
+        else:
+            self.finished[index] = (False, exception)
+
+    def ready(self, *, ordered: bool) -> list[tuple[bool, Any]]:
+        """Pop the results that can be yielded now."""
+        if ordered:
+            indexes: list[int] = []
+            while self.next_index + len(indexes) in self.finished:
+                indexes.append(self.next_index + len(indexes))
+        else:
+            indexes = list(self.finished)
+        self.next_index += len(indexes)
+        self.pending -= len(indexes)
+        return [self.finished.pop(index) for index in indexes]
+
+    def done(self) -> bool:
+        return self.inputs_exhausted and self.pending == 0
+
+
+class Crawler:
+    """
+    Runs a job over many inputs on a pool of worker processes, each with its own Session and browser.
+
+    'job' is called as 'job(session, item)' for each item, and must be picklable (a module level
+    function) as it is sent to the workers. Each of the 'workers' processes (one per cpu by
+    default) builds a Session from 'session_kwargs' and keeps it, and its browser, for all of its
+    jobs. The browser is only started when a job first uses 'session.driver'.
+
+    'map' streams the results back. Only 'max_pending' items (twice the workers by default) are
+    taken from the inputs ahead of the results consumed, so a slow consumer or a huge input doesn't
+    pile up work in memory. A job that raises is retried up to 'max_retries' times, on a fresh
+    browser if the failure crashed it. A worker process that dies is replaced, and its jobs retried.
+
+    Use the crawler as a context manager, or call 'close', to stop the workers, which quit their
+    drivers on the way out.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        job: Callable[[Session, Any], Any],
+        *,
+        workers: int | None = None,
+        session_kwargs: dict[str, Any] | None = None,
+        max_retries: int = 2,
+        max_pending: int | None = None,
+        mp_context: str | BaseContext | None = DEFAULT_MP_CONTEXT,
+    ) -> None:
+        self.job = job
+        self.workers = workers or os.cpu_count() or 1
+        self.session_kwargs = session_kwargs or {}
+        self.max_retries = max_retries
+        self.max_pending = max_pending or 2 * self.workers
+        self._context = _get_mp_context(mp_context)
+        self._results: multiprocessing.Queue[tuple[int, int, int, bytes]] = self._context.Queue()
+        self._workers: dict[int, _Worker] = {}
+        self._worker_ids = itertools.count()
+        self._runs = itertools.count()
+        self._closed = False
+
+    def _start_worker(self) -> None:
+        worker_id = next(self._worker_ids)
+        tasks: multiprocessing.Queue[tuple[int, int, Any] | None] = self._context.Queue()
+        started: SynchronizedArray[int] = self._context.Array("q", [-1, -1])
+        # Typeshed only gives 'Process' to the concrete subclasses of BaseContext
+        process: BaseProcess = self._context.Process(  # type: ignore[attr-defined]
+            target=_worker_main,
+            args=(self.job, self.session_kwargs, tasks, self._results, worker_id, started),
+            name=f"requestium-crawler-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = _Worker(worker_id, process, tasks, started)
+
+    def start(self) -> None:
+        """Start the worker processes, 'map' does it if needed."""
+        if self._closed:
+            msg = "Can't use a closed crawler"
+            raise RuntimeError(msg)
+        while len(self._workers) < self.workers:
+            self._start_worker()
+
+    def _replace_dead_worker(self, worker: _Worker, crawl: _CrawlRun) -> None:
+        del self._workers[worker.id]
+        worker.process.join()
+        # Only the job the worker started last can have killed it, its other jobs go back untried. Those
+        # include the ones it finished, but whose results didn't get out before it died.
+        run, started_index = worker.started[:]
+        if run == crawl.run and started_index in worker.assigned:
+            msg = f"Worker process {worker.process.pid} exited with code {worker.process.exitcode} while running the job"
+            crawl.failed(started_index, worker.assigned.pop(started_index), CrawlerWorkerError(msg))
+        crawl.retries.extendleft(reversed(worker.assigned.items()))
+        self._start_worker()
+
+    def _assign_tasks(self, crawl: _CrawlRun) -> None:
+        for worker in list(self._workers.values()):
+            if not worker.process.is_alive():
+                self._replace_dead_worker(worker, crawl)
+                continue
+            while len(worker.assigned) < _WORKER_PREFETCH and (task := crawl.next_task()) is not None:
+                worker.assigned[task[0]] = task[1]
+                worker.tasks.put((crawl.run, *task))
+
+    def _receive_result(self, crawl: _CrawlRun) -> None:
+        try:
+            worker_id, run, index, payload = self._results.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            return
+        worker = self._workers.get(worker_id)
+        # Ignore the results of earlier runs, and of the jobs of a dead worker that were already retried
+        if run != crawl.run or worker is None or index not in worker.assigned:
+            return
+        item = worker.assigned.pop(index)
+        succeeded, value = pickle.loads(payload)  # nosec B301
+        if succeeded:
+            crawl.finished[index] = (True, value)
+        else:
+            crawl.failed(index, item, value)
+
+    def map(self, inputs: Iterable[Any], *, ordered: bool = True, return_exceptions: bool = False) -> Iterator[Any]:
+        """
+        Run the job on every input, yielding the results in the order of the inputs or, unless 'ordered', as they complete.
+
+        The exception of a job that failed all of its attempts is raised, or yielded in place of
+        its result if 'return_exceptions' is set.
+        """
+        self.start()
+        crawl = _CrawlRun(next(self._runs), inputs, self.max_pending, self.max_retries)
+        try:
+            while not crawl.done():
+                self._assign_tasks(crawl)
+                ready = crawl.ready(ordered=ordered)
+                for succeeded, value in ready:
+                    if not succeeded and not return_exceptions:
+                        raise value
+                    yield value
+                if not ready:
+                    self._receive_result(crawl)
+        finally:
+            for worker in self._workers.values():
+                worker.assigned.clear()
+
+    def close(self) -> None:
+        """Stop the workers, letting them quit their drivers, and terminate those that don't exit in time."""
+        self._closed = True
+        workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            with contextlib.suppress(ValueError, OSError):
+                worker.tasks.put(None)
+        for worker in workers:
+            worker.process.join(_SHUTDOWN_TIMEOUT)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.tasks.close()
+        self._results.close()
+
+    def __enter__(self) -> Crawler:
+        """Use the crawler as a context manager, closing it on exit."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        """Stop the workers."""
+        self.close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from requests.cookies import RequestsCookieJar
+
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie, CookieJar
+
+    import tldextract
+
+# Cookie domains repeat a lot, and so do the urls of the pages we are on
+DOMAIN_CACHE_SIZE: int = 4096
+
+
+@functools.cache
+def _extractor() -> tldextract.TLDExtract:
+    import tldextract  # noqa: PLC0415
+
+    # Only the Public Suffix List snapshot bundled with tldextract: no fetching it over the network, nor caching it on disk
+    return tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, fallback_to_snapshot=True)
+
+
+@functools.lru_cache(maxsize=DOMAIN_CACHE_SIZE)
+def _extract(url_or_host: str) -> tldextract.tldextract.ExtractResult:
+    return _extractor()(url_or_host)
+
+
+def registered_domain(url_or_host: str) -> str:
+    """
+    Return the domain registered under a public suffix of a url or host, Eg.: 'example.co.uk' for 'https://www.example.co.uk/page'.
+
+    Returns an empty string for hosts without one, like IPs and 'localhost'.
+    """
+    return _extract(url_or_host).top_domain_under_public_suffix
+
+
+def fqdn(url_or_host: str) -> str:
+    """Return the fully qualified domain name of a url or host, or an empty string if it doesn't have a public suffix."""
+    return _extract(url_or_host).fqdn
+
+
+def domain_match(host: str, domain: str) -> bool:
+    """Return whether 'host' domain-matches 'domain' as in RFC 6265 (section 5.1.3): it is the same domain, or a subdomain of it."""
+    host = host.lower().lstrip(".")
+    domain = domain.lower().lstrip(".")
+    return host == domain or host.endswith("." + domain)
+
+
+def _index_key(domain: str) -> str:
+    # Hosts without a registered domain (IPs, 'localhost') are indexed by themselves
+    return registered_domain(domain) or domain
+
+
+class DomainTrackingCookieJar(RequestsCookieJar):
+    """A RequestsCookieJar that counts the changes to its set of domains in 'domain_changes', so a CookieDomainIndex can tell when to rebuild."""
+
+    domain_changes = 0
+
+    def set_cookie(self, cookie: Cookie, *args, **kwargs) -> None:
+        new_domain = cookie.domain not in self._cookies  # type: ignore[attr-defined]
+        super().set_cookie(cookie, *args, **kwargs)
+        if new_domain:
+            self.domain_changes += 1
+
+    def clear(self, domain: str | None = None, path: str | None = None, name: str | None = None) -> None:
+        super().clear(domain, path, name)
+        self.domain_changes += 1
+
+
+class CookieDomainIndex:
+    """
+    Finds the cookies of a cookie jar that apply to a domain, without scanning the whole jar.
+
+    The jar's domains are indexed by their registered domain, and the index is rebuilt when the
+    jar gets cookies for new domains or loses some of its cookies, which a DomainTrackingCookieJar
+    counts. Other jars don't, so their domains are compared with the index's on every lookup.
+    Cookies are read from the jar on every lookup, so changes to existing domains' cookies don't
+    need a rebuild.
+    """
+
+    def __init__(self, jar: CookieJar) -> None:
+        self.jar = jar
+        self._domains: set[str] = set()
+        self._domain_changes: int | None = None  # The jar's 'domain_changes' when the index was built
+        self._index: dict[str, list[str]] = {}
+
+    def _is_stale(self) -> bool:
+        domain_changes = getattr(self.jar, "domain_changes", None)
+        if domain_changes is None:
+            return self.jar._cookies.keys() != self._domains  # type: ignore[attr-defined] # noqa: SLF001
+        return domain_changes != self._domain_changes
+
+    def _rebuild(self) -> None:
+        self._domains = set(self.jar._cookies)  # type: ignore[attr-defined] # noqa: SLF001
+        self._domain_changes = getattr(self.jar, "domain_changes", None)
+        self._index = {}
+        for cookie_domain in self._domains:
+            key = _index_key(cookie_domain.lower().lstrip("."))
+            self._index.setdefault(key, []).append(cookie_domain)
+
+    def cookies_for(self, domain: str) -> list[Cookie]:
+        """
+        Return the cookies related to 'domain'.
+
+        Those are the cookies set for the domain or for a parent domain (which the browser sends
+        to it), and those set for its subdomains, so a transfer to the site's main domain includes
+        the cookies of its 'www' or 'auth' subdomains. Unrelated domains that merely end with the
+        same letters, like 'ample.com' and 'example.com', don't match.
+        """
+        if self._is_stale():
+            self._rebuild()
+        jar_cookies = self.jar._cookies  # type: ignore[attr-defined] # noqa: SLF001
+
+        domain = domain.lower().lstrip(".")
+        cookies = []
+        for cookie_domain in self._index.get(_index_key(domain), ()):
+            if domain_match(domain, cookie_domain) or domain_match(cookie_domain, domain):
+                for path_cookies in jar_cookies[cookie_domain].values():
+                    cookies.extend(path_cookies.values())
+        return cookies
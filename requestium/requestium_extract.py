@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import functools
+import os
+from typing import TYPE_CHECKING, Any
+
+from requests.compat import chardet
+
+from .requestium_processes import DEFAULT_MP_CONTEXT, _get_mp_context
+from .requestium_schema import ExtractionSchema
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from multiprocessing.context import BaseContext
+
+    from requests import Response
+
+# Pages each worker holds at once, so it never waits on us, without reading the whole input ahead
+_PAGES_PER_WORKER: int = 4
+
+# The schema of the worker process, set once when it starts instead of being sent with every page
+_worker_schema: ExtractionSchema | None = None
+
+
+def _page_payload(page: Response | bytes | str) -> tuple[bytes | str, str | None]:
+    # Only the body and its encoding are sent to the workers, not the response with its request and connection
+    if isinstance(page, (bytes, str)):
+        return page, None
+    return page.content, page.encoding
+
+
+def _decode(content: bytes | str, encoding: str | None) -> str:
+    """Decode a body the way requests' 'Response.text' does, guessing the encoding if it's unknown."""
+    if isinstance(content, str):
+        return content
+    if encoding is None and chardet is not None:
+        encoding = chardet.detect(content)["encoding"]
+    try:
+        return str(content, encoding, errors="replace")  # type: ignore[arg-type]
+    except (LookupError, TypeError):
+        return str(content, errors="replace")
+
+
+def _extract_page(schema: ExtractionSchema, content: bytes | str, encoding: str | None) -> dict[str, Any]:
+    return schema.extract(_decode(content, encoding))
+
+
+def _init_worker(schema: ExtractionSchema) -> None:
+    global _worker_schema  # noqa: PLW0603
+    _worker_schema = schema
+
+
+def _extract_page_in_worker(content: bytes | str, encoding: str | None) -> dict[str, Any]:
+    return _extract_page(_worker_schema, content, encoding)  # type: ignore[arg-type]
+
+
+def _result(future: concurrent.futures.Future[dict[str, Any]], *, return_exceptions: bool) -> dict[str, Any] | Exception:
+    exception = future.exception()
+    if exception is None:
+        return future.result()
+    if return_exceptions and isinstance(exception, Exception):
+        return exception
+    raise exception
+
+
+def _results_in_order(
+    submit: Callable[[Any], concurrent.futures.Future[dict[str, Any]]], pages: Iterator[Any], max_pending: int, *, return_exceptions: bool
+) -> Iterator[dict[str, Any] | Exception]:
+    pending: collections.deque[concurrent.futures.Future[dict[str, Any]]] = collections.deque()
+    for page in pages:
+        pending.append(submit(page))
+        if len(pending) >= max_pending:
+            yield _result(pending.popleft(), return_exceptions=return_exceptions)
+    while pending:
+        yield _result(pending.popleft(), return_exceptions=return_exceptions)
+
+
+def _results_as_completed(
+    submit: Callable[[Any], concurrent.futures.Future[dict[str, Any]]], pages: Iterator[Any], max_pending: int, *, return_exceptions: bool
+) -> Iterator[dict[str, Any] | Exception]:
+    pending: set[concurrent.futures.Future[dict[str, Any]]] = set()
+    pages_exhausted = False
+    while True:
+        while not pages_exhausted and len(pending) < max_pending:
+            page = next(pages, None)
+            if page is None:
+                pages_exhausted = True
+            else:
+                pending.add(submit(page))
+        if not pending:
+            return
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            yield _result(future, return_exceptions=return_exceptions)
+
+
+def _extract_in_pool(  # noqa: PLR0913
+    pages: Iterable[Response | bytes | str],
+    schema: ExtractionSchema,
+    workers: int,
+    executor: str,
+    mp_context: BaseContext,
+    *,
+    ordered: bool,
+    return_exceptions: bool,
+) -> Iterator[dict[str, Any] | Exception]:
+    pool: concurrent.futures.Executor
+    task: Callable[[bytes | str, str | None], dict[str, Any]]
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=mp_context, initializer=_init_worker, initargs=(schema,))
+        task = _extract_page_in_worker
+    else:
+        pool = concurrent.futures.ThreadPoolExecutor(workers, thread_name_prefix="requestium-extract")
+        task = functools.partial(_extract_page, schema)
+
+    def submit(page: Response | bytes | str) -> concurrent.futures.Future[dict[str, Any]]:
+        content, encoding = _page_payload(page)
+        return pool.submit(task, content, encoding)
+
+    results = _results_in_order if ordered else _results_as_completed
+    try:
+        yield from results(submit, iter(pages), workers * _PAGES_PER_WORKER, return_exceptions=return_exceptions)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _extract_serially(pages: Iterable[Response | bytes | str], schema: ExtractionSchema, *, return_exceptions: bool) -> Iterator[dict[str, Any] | Exception]:
+    for page in pages:
+        try:
+            yield _extract_page(schema, *_page_payload(page))
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            yield e
+
+
+def extract_many(  # noqa: PLR0913
+    pages: Iterable[Response | bytes | str],
+    schema: ExtractionSchema | dict[str, Any],
+    *,
+    workers: int | None = None,
+    executor: str = "process",
+    ordered: bool = True,
+    return_exceptions: bool = False,
+    mp_context: str | BaseContext | None = DEFAULT_MP_CONTEXT,
+) -> Iterator[dict[str, Any] | Exception]:
+    """
+    Extract a record out of each page with a schema, parsing the pages in parallel.
+
+    The 'pages' are responses, or their bodies as bytes or str, and 'schema' an ExtractionSchema
+    or a dict of its fields. The pages are parsed and queried by 'workers' (one per cpu by
+    default) processes, or threads with 'executor="thread"', which only run in parallel while lxml
+    releases the GIL but skip sending the pages to other processes. Only the body and the encoding
+    of each response are sent to the workers, and 'workers=0' extracts in the calling thread.
+
+    The records are yielded in the order of the pages or, unless 'ordered', as they are ready.
+    Only a few pages per worker are taken from 'pages' ahead of the records consumed, so a
+    generator of responses can be passed in while it's still being fetched. The exception of a
+    page that failed is raised, or yielded in place of its record if 'return_exceptions' is set.
+    """
+    if not isinstance(schema, ExtractionSchema):
+        schema = ExtractionSchema(schema)
+    if executor not in {"process", "thread"}:
+        msg = f"The 'executor' argument must be 'process' or 'thread', not '{executor}'"
+        raise ValueError(msg)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 0:
+        return _extract_serially(pages, schema, return_exceptions=return_exceptions)
+
+    return _extract_in_pool(pages, schema, workers, executor, _get_mp_context(mp_context), ordered=ordered, return_exceptions=return_exceptions)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+# The attribute types OpenTelemetry accepts as they are, anything else is exported as its str()
+_OTEL_ATTRIBUTE_TYPES = (bool, str, int, float)
+
+
+class Span(NamedTuple):
+    """A timed phase of a job, as the sinks get it once the phase ends."""
+
+    name: str
+    start: float  # Wall clock time, in seconds since the epoch
+    duration: float
+    attributes: dict[str, Any]
+    error: str | None = None  # The name of the exception that ended the phase, if any
+
+
+class SpanStats(NamedTuple):
+    """How many times a span ran, and how long it took all together and at its slowest."""
+
+    calls: int
+    total: float
+    slowest: float
+    errors: int
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+
+class InstrumentationStats(NamedTuple):
+    """The summary returned by 'session.stats()': the stats of each span name and the counters."""
+
+    spans: dict[str, SpanStats]
+    counters: dict[str, int]
+
+
+class Instrumentation:
+    """
+    Times the phases of a job in named spans and counts its events, to tell where the time goes.
+
+    Requestium opens a span for each request ("http.request"), browser start ("driver.start"),
+    navigation ("driver.get"), page source transfer ("driver.page_source"), html parse ("parse"),
+    element wait ("ensure_element", "ensure_elements") and click ("click"). The spans are summed
+    up by name in 'stats', and each finished span is handed to the 'sinks', callables taking a
+    Span, such as a LoggingSink, an OpenTelemetrySink or a function of our own.
+
+    An instance is thread safe, so it can be shared by many sessions to profile them together.
+    """
+
+    enabled: bool = True
+
+    def __init__(self, *sinks: Callable[[Span], Any]) -> None:
+        self.sinks = list(sinks)
+        self._lock = threading.Lock()
+        self._spans: dict[str, SpanStats] = {}
+        self._counters: collections.Counter[str] = collections.Counter()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            calls, total, slowest, errors = self._spans.get(span.name, (0, 0.0, 0.0, 0))
+            self._spans[span.name] = SpanStats(calls + 1, total + span.duration, max(slowest, span.duration), errors + (span.error is not None))
+        for sink in self.sinks:
+            sink(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401
+        """Time the 'with' block as a span, yielding its attributes so the block can add the ones it learns."""
+        start = time.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self._record(Span(name, start, time.perf_counter() - started, attributes, error))
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add 'value' to the counter 'name'."""
+        with self._lock:
+            self._counters[name] += value
+
+    def stats(self) -> InstrumentationStats:
+        with self._lock:
+            return InstrumentationStats(dict(self._spans), dict(self._counters))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+
+class NullInstrumentation(Instrumentation):
+    """The instrumentation of sessions and drivers that aren't profiled, which records nothing."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes: Any) -> contextlib.nullcontext[dict[str, Any]]:  # type: ignore[override]  # noqa: ANN401, ARG002
+        # A fresh dict, so what the block adds to it doesn't pile up anywhere
+        return contextlib.nullcontext({})
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class LoggingSink:
+    """
+    Logs each span as a structured record.
+
+    The message reads like "parse took 12.3 ms", and the span's fields are in the record's 'span'
+    attribute, as a dict, for json formatters and log shippers to pick up.
+    """
+
+    def __init__(self, logger: logging.Logger | str = "requestium", level: int = logging.DEBUG) -> None:
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def __call__(self, span: Span) -> None:
+        """Log the span."""
+        self.logger.log(self.level, "%s took %.1f ms", span.name, span.duration * 1000, extra={"span": span._asdict()})
+
+
+class OpenTelemetrySink:
+    """
+    Exports each span to OpenTelemetry, through the global tracer provider unless a 'tracer' is given.
+
+    Needs the 'opentelemetry-api' package. The spans are exported as they end, as children of
+    whichever span is current at that time, such as the one of the crawl job running them.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:  # noqa: ANN401
+        try:
+            from opentelemetry import trace  # noqa: PLC0415
+        except ImportError as e:
+            msg = "The OpenTelemetry sink needs the 'opentelemetry-api' package, install it with: pip install opentelemetry-api"
+            raise ImportError(msg) from e
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("requestium")
+
+    def __call__(self, span: Span) -> None:
+        """Export the span."""
+        attributes = {name: value if isinstance(value, _OTEL_ATTRIBUTE_TYPES) else str(value) for name, value in span.attributes.items() if value is not None}
+        otel_span = self.tracer.start_span(span.name, start_time=int(span.start * 1e9), attributes=attributes)
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.start + span.duration) * 1e9))
@@ -1,26 +1,182 @@
 from __future__ import annotations
 
+import collections
+import contextlib
 import functools
+import random
 import time
+import types
 import warnings
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-import tldextract
 from parsel.selector import Selector, SelectorList
-from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+from selenium.common.exceptions import NoSuchWindowException, TimeoutException, UnknownMethodException, WebDriverException
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
 from selenium.webdriver.common.by import By, ByType
+from selenium.webdriver.remote.command import Command
 from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
 from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import WebDriverWait
 
+from .requestium_domains import fqdn, registered_domain
+from .requestium_instrumentation import NULL_INSTRUMENTATION
+from .requestium_replay import RECORDED_RESOURCE_TYPES, NetworkRecording
+from .requestium_schema import ExtractionSchema
+from .requestium_tabs import TabPool
+
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
     from selenium.webdriver.remote.webelement import WebElement
 
 
 DEFAULT_TIMEOUT: float = 0.5
 
+# Installs a MutationObserver that counts DOM changes, and returns a key identifying the current
+# state of the page. The random page id covers reloads of the same url, where the counter restarts.
+_DOM_STATE_SCRIPT = """
+if (window.__requestiumMutations === undefined) {
+    window.__requestiumMutations = 0;
+    window.__requestiumPageId = Math.random();
+    new MutationObserver(function () { window.__requestiumMutations += 1; }).observe(
+        document, {subtree: true, childList: true, attributes: true, characterData: true}
+    );
+}
+return [window.location.href, window.__requestiumPageId, window.__requestiumMutations];
+"""
+
+# Marks a snapshot that may no longer match the page, its page source is kept to skip parsing it again if it didn't change
+_STALE = object()
+
+_ELEMENT_STATES = ("present", "visible", "clickable", "invisible")
+
+# Javascript versions of the By strategies and the expected conditions used by 'ensure_element'.
+# 'checkCondition' takes a [locator, selector, state] condition and returns [reached_state, element].
+_ELEMENT_STATE_FUNCTIONS = """
+function locate(by, selector) {
+    switch (by) {
+        case "id": return document.getElementById(selector);
+        case "name": return document.getElementsByName(selector)[0] || null;
+        case "css selector": return document.querySelector(selector);
+        case "class name": return document.getElementsByClassName(selector)[0] || null;
+        case "tag name": return document.getElementsByTagName(selector)[0] || null;
+        case "xpath": return document.evaluate(
+            selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        case "link text":
+        case "partial link text":
+            return Array.from(document.getElementsByTagName("a")).find(function (link) {
+                var text = link.innerText.trim();
+                return by === "link text" ? text === selector : text.indexOf(selector) !== -1;
+            }) || null;
+    }
+    throw new Error("Unsupported locator strategy: " + by);
+}
+function isVisible(element) {
+    if (element.checkVisibility) {
+        return element.checkVisibility({visibilityProperty: true, opacityProperty: true});
+    }
+    var style = window.getComputedStyle(element);
+    return element.getClientRects().length > 0 && style.visibility !== "hidden" && style.opacity !== "0";
+}
+function checkCondition(condition) {
+    var element = locate(condition[0], condition[1]);
+    switch (condition[2]) {
+        case "present": return [element !== null, element];
+        case "visible": return [element !== null && isVisible(element), element];
+        case "clickable": return [element !== null && isVisible(element) && !element.disabled, element];
+        case "invisible": return [element === null || !isVisible(element), null];
+    }
+}
+"""
+
+# Checks a list of conditions at once, for 'ensure_elements'
+_ELEMENTS_STATE_SCRIPT = _ELEMENT_STATE_FUNCTIONS + "return arguments[0].map(checkCondition);"
+
+# Resolves as soon as a DOM mutation makes the condition true, or with [false, null] after the timeout.
+# Visibility may also change without DOM mutations (Eg.: CSS animations), so we check now and then too.
+_ELEMENT_MUTATION_WAIT_SCRIPT = (
+    _ELEMENT_STATE_FUNCTIONS
+    + """
+var condition = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+var result = checkCondition(condition);
+if (result[0]) {
+    return done(result);
+}
+var finished = false, observer, interval, timer;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(value);
+}
+function recheck() {
+    var result = checkCondition(condition);
+    if (result[0]) { finish(result); }
+}
+observer = new MutationObserver(recheck);
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () { finish([false, null]); }, timeout);
+"""
+)
+
+# The longest we wait inside a single async script, to stay well under the driver's script timeout (30s by default)
+_MUTATION_WAIT_CHUNK: float = 20
+
+
+class ClickStrategy(NamedTuple):
+    """
+    How 'ensure_click' retries clicks that fail.
+
+    Failed clicks are retried up to 'max_attempts' times, or until 'deadline' seconds have passed
+    since the first one. The wait between retries starts at 'initial_delay' and is multiplied by
+    'backoff' after each retry, up to 'max_delay', and randomly varied by up to +/- 'jitter'
+    (a fraction of the wait). If every retry fails, 'js_fallback' makes a last attempt clicking
+    the element from javascript, which skips the checks that make Selenium's click fail (and so
+    may click elements a user couldn't).
+    """
+
+    max_attempts: int = 10
+    initial_delay: float = 0.05
+    backoff: float = 2
+    max_delay: float = 0.4
+    jitter: float = 0.1
+    deadline: float = 2
+    js_fallback: bool = False
+    scroll: bool = True
+
+
+DEFAULT_CLICK_STRATEGY = ClickStrategy()
+
 
-def _ensure_click(self: WebElement) -> None:
+class ClickStats:
+    """Counters of the clicks made with 'ensure_click', to tune the 'ClickStrategy' with."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        self.clicks = 0
+        self.failures = 0
+        self.attempts = 0
+        self.retries = 0
+        self.js_fallbacks = 0
+        self.time_spent = 0.0
+        self.errors: collections.Counter[str] = collections.Counter()
+
+    def __repr__(self) -> str:
+        """Show all of the counters."""
+        return (
+            f"ClickStats(clicks={self.clicks}, failures={self.failures}, attempts={self.attempts}, retries={self.retries}, "
+            f"js_fallbacks={self.js_fallbacks}, time_spent={self.time_spent:.3f}, errors={dict(self.errors)})"
+        )
+
+
+def _ensure_click(self: WebElement, strategy: ClickStrategy | None = None) -> None:
     """
     Ensure a click gets made, because Selenium can be a bit buggy about clicks.
 
@@ -33,50 +189,237 @@ def _ensure_click(self: WebElement) -> None:
     time to scroll to the item. This method ensures chromes gets enough time to scroll to the item
     before clicking it. I tried SEVERAL more 'correct' methods to get around this, but none of them
     worked 100% of the time (waiting for the element to be 'clickable' does not work).
+
+    How we retry is set by the 'strategy', defaulting to the driver's 'click_strategy'. Every
+    click is counted in the driver's 'click_stats'.
     """
-    # We ensure the element is scrolled into the middle of the viewport to ensure that
-    # it is clickable. There are two main ways an element may not be clickable:
-    #   - It is outside of the viewport
-    #   - It is under a banner or toolbar
-    # This script solves both cases
-    script = (
-        "var viewPortHeight = Math.max("
-        "document.documentElement.clientHeight, window.innerHeight || 0);"
-        "var elementTop = arguments[0].getBoundingClientRect().top;"
-        "window.scrollBy(0, elementTop-(viewPortHeight/2));"
-    )
-    self.parent.execute_script(script, self)  # parent = the webdriver
+    driver = self.parent  # parent = the webdriver
+    strategy = strategy or getattr(driver, "click_strategy", None) or DEFAULT_CLICK_STRATEGY
+    stats = getattr(driver, "click_stats", None) or ClickStats()
+    instrumentation = getattr(driver, "instrumentation", NULL_INSTRUMENTATION)
+    with instrumentation.span("click") as attributes:
+        try:
+            _click_with_retries(self, driver, strategy, stats, attributes)
+        finally:
+            instrumentation.count("click.retries", attributes.get("attempts", 1) - 1)
+
+
+def _click_with_retries(element: WebElement, driver: DriverMixin, strategy: ClickStrategy, stats: ClickStats, attributes: dict[str, Any]) -> None:
+    """Click the element following the strategy, noting the attempts made in the click span's attributes."""
+    start = time.monotonic()
+
+    if strategy.scroll:
+        # We ensure the element is scrolled into the middle of the viewport to ensure that
+        # it is clickable. There are two main ways an element may not be clickable:
+        #   - It is outside of the viewport
+        #   - It is under a banner or toolbar
+        # This script solves both cases
+        script = (
+            "var viewPortHeight = Math.max("
+            "document.documentElement.clientHeight, window.innerHeight || 0);"
+            "var elementTop = arguments[0].getBoundingClientRect().top;"
+            "window.scrollBy(0, elementTop-(viewPortHeight/2));"
+        )
+        driver.execute_script(script, element)
 
     exception_message = ""
-    for _ in range(10):
-        try:
-            self.click()
-            return
-        except WebDriverException as e:
-            exception_message = str(e)
-            time.sleep(0.2)
-    msg = f"Couldn't click item after trying 10 times, got error message: \n{exception_message}"
-    raise WebDriverException(msg)
+    attempts = 0
+    delay = strategy.initial_delay
+    clicked = False
+    try:
+        while not clicked:
+            attempts += 1
+            try:
+                element.click()
+                clicked = True
+            except WebDriverException as e:
+                exception_message = str(e)
+                stats.errors[type(e).__name__] += 1
+
+                remaining = strategy.deadline - (time.monotonic() - start)
+                if attempts >= strategy.max_attempts or remaining <= 0:
+                    break
+                time.sleep(min(delay * random.uniform(1 - strategy.jitter, 1 + strategy.jitter), strategy.max_delay, remaining))  # nosec B311
+                delay *= strategy.backoff
+
+        if not clicked and strategy.js_fallback:
+            try:
+                driver.execute_script("arguments[0].click();", element)
+                clicked = True
+                stats.js_fallbacks += 1
+                attributes["js_fallback"] = True
+            except WebDriverException as e:
+                exception_message = str(e)
+                stats.errors[type(e).__name__] += 1
+    finally:
+        attributes["attempts"] = attempts
+        stats.attempts += attempts
+        stats.retries += attempts - 1
+        stats.time_spent += time.monotonic() - start
+        if clicked:
+            stats.clicks += 1
+        else:
+            stats.failures += 1
+
+    if not clicked:
+        msg = f"Couldn't click item after trying {attempts} times, got error message: \n{exception_message}"
+        raise WebDriverException(msg)
+
+    # Clicks usually change the page, so a selector snapshot of it is no longer valid
+    invalidate_selector = getattr(driver, "invalidate_selector", None)
+    if invalidate_selector:
+        invalidate_selector()
+
+
+def _compatible_locator(locator: ByType | str) -> ByType | str:
+    """Translate the deprecated locator strategy names with underscores into the By class ones."""
+    locators_compatibility = {
+        "link_text": By.LINK_TEXT,
+        "partial_link_text": By.PARTIAL_LINK_TEXT,
+        "tag_name": By.TAG_NAME,
+        "class_name": By.CLASS_NAME,
+        "css_selector": By.CSS_SELECTOR,
+    }
+    if locator in locators_compatibility:
+        warnings.warn(
+            """
+            Support for locator strategy names with underscores is deprecated.
+            Use strategies from Selenium's By class (importable from selenium.webdriver.common.by).
+            """,
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        return locators_compatibility[locator]
+    return locator
+
+
+def _element_condition(locator: ByType | str, selector: str, state: str = "present") -> list[str]:
+    """Validate an 'ensure_elements' condition, returning it in the format of '_ELEMENTS_STATE_SCRIPT'."""
+    if state not in _ELEMENT_STATES:
+        msg = f"The 'state' argument must be 'visible', 'clickable', 'present' or 'invisible', not '{state}'"
+        raise ValueError(msg)
+    return [_compatible_locator(locator), selector, state]
+
+
+def _add_ensure_click(element: WebElement) -> None:
+    # We add this method to our element to provide a more robust click. Chromedriver
+    # sometimes needs some time before it can click an item, specially if it needs to
+    # scroll into it first. This method ensures clicks don't fail because of this.
+    element.ensure_click = functools.partial(_ensure_click, element)  # type: ignore[attr-defined]
+
+
+class EnsureElementsTimeoutException(TimeoutException):
+    """Raised by 'ensure_elements' when some of the elements didn't reach their state in time."""
+
+    def __init__(self, found: dict[str, WebElement | None], pending: list[str]) -> None:
+        self.found = found
+        self.pending = pending
+        super().__init__(f"Timed out waiting for the elements: {', '.join(pending)}")
+
+
+def _to_cdp_cookie(cookie: dict[str, Any]) -> dict[str, Any]:
+    """Convert a webdriver cookie into the format of devtools' 'Network.setCookies' command."""
+    cdp_cookie = {"name": cookie["name"], "value": cookie["value"], "domain": cookie["domain"], "path": cookie.get("path", "/")}
+    if cookie.get("expiry") is not None:
+        cdp_cookie["expires"] = cookie["expiry"]
+    for name in ("secure", "httpOnly", "sameSite"):
+        if cookie.get(name) is not None:
+            cdp_cookie[name] = cookie[name]
+    return cdp_cookie
+
+
+def _supports_cdp(driver: RemoteWebDriver) -> bool:
+    """
+    Tell whether the driver can run devtools commands.
+
+    Newer selenium versions give every remote driver an 'execute_cdp_cmd' method, but only the
+    connections of chromium based drivers know the command, the rest fail with an AssertionError.
+    """
+    return hasattr(driver, "execute_cdp_cmd") and isinstance(getattr(driver, "command_executor", None), ChromiumRemoteConnection)
+
+
+# The driver methods that may change the page, after which a selector snapshot of it is no longer valid
+_PAGE_CHANGING_METHODS = ("get", "back", "forward", "refresh", "execute_script", "execute_async_script")
+
+
+def _invalidating_selector(driver: RemoteWebDriver, method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap one of the page changing methods of a driver that isn't a DriverMixin, to discard its snapshot like ours do."""
+
+    @functools.wraps(method)
+    def call_and_invalidate(*args, **kwargs) -> Any:  # noqa: ANN401
+        driver.invalidate_selector()  # type: ignore[attr-defined]
+        return method(*args, **kwargs)
+
+    return call_and_invalidate
+
+
+def _instrumented_get(driver: RemoteWebDriver, get: Callable[[str], None]) -> Callable[[str], None]:
+    """Wrap the 'get' of a driver that isn't a DriverMixin, to time it in a "driver.get" span like ours does."""
+
+    @functools.wraps(get)
+    def timed_get(url: str) -> None:
+        with driver.instrumentation.span("driver.get", url=url):  # type: ignore[attr-defined]
+            get(url)
+
+    return timed_get
 
 
 class DriverMixin(RemoteWebDriver):
     """Provides helper methods to our driver classes."""
 
+    # Set by 'snapshot', and read with getattr, as drivers given to a Session only get our methods
+    _snapshot_mode: str | None
+    _selector_snapshot: tuple[Any, str, Selector] | None
+    # Set by the Session that starts the driver with the 'block_resources' or 'blocked_urls' options
+    _blocked_url_patterns: list[str]
+
     def __init__(self, *args, **kwargs) -> None:
         self.default_timeout = kwargs.pop("default_timeout", DEFAULT_TIMEOUT)
+        self.wait_engine = kwargs.pop("wait_engine", "poll")
+        self.click_strategy = kwargs.pop("click_strategy", DEFAULT_CLICK_STRATEGY)
+        self.click_stats = ClickStats()
+        self.instrumentation = kwargs.pop("instrumentation", NULL_INSTRUMENTATION)
         super().__init__(*args, **kwargs)
 
-    def try_add_cookie(self, cookie: dict[str, Any]) -> bool:
-        """
-        Attempt to add the cookie.
+    def get(self, url: str) -> None:
+        self.invalidate_selector()
+        with self.instrumentation.span("driver.get", url=url):
+            super().get(url)
 
-        Suppress any errors, and simply detect success or failure.
-        """
+    def back(self) -> None:
+        self.invalidate_selector()
+        super().back()
+
+    def forward(self) -> None:
+        self.invalidate_selector()
+        super().forward()
+
+    def refresh(self) -> None:
+        self.invalidate_selector()
+        super().refresh()
+
+    def execute_script(self, script: str, *args) -> Any:  # noqa: ANN401
+        self.invalidate_selector()
+        return super().execute_script(script, *args)
+
+    def execute_async_script(self, script: str, *args) -> Any:  # noqa: ANN401
+        self.invalidate_selector()
+        return super().execute_async_script(script, *args)
+
+    def _add_cookie(self, cookie: dict[str, Any]) -> None:
         try:
             self.add_cookie(cookie)
         except WebDriverException as e:
             if e.msg and not e.msg.__contains__("Couldn't add the following cookie to the webdriver"):
                 raise WebDriverException from e
+
+    def try_add_cookie(self, cookie: dict[str, Any]) -> bool:
+        """
+        Attempt to add the cookie.
+
+        Suppress any errors, and simply detect success or failure.
+        """
+        self._add_cookie(cookie)
         return self.is_cookie_in_driver(cookie)
 
     def ensure_add_cookie(self, cookie: dict[str, Any], override_domain: str | None = None) -> None:
@@ -109,7 +452,7 @@ class DriverMixin(RemoteWebDriver):
 
         cookie_domain = cookie["domain"] if cookie["domain"][0] != "." else cookie["domain"][1:]
         try:
-            browser_domain = tldextract.extract(self.current_url).fqdn
+            browser_domain = fqdn(self.current_url)
         except (AttributeError, NoSuchWindowException):
             browser_domain = ""
         if cookie_domain not in browser_domain:
@@ -124,20 +467,82 @@ class DriverMixin(RemoteWebDriver):
 
         # If we fail adding the cookie, retry with a more permissive domain
         if not cookie_added:
-            cookie["domain"] = tldextract.extract(cookie["domain"]).top_domain_under_public_suffix
+            cookie["domain"] = registered_domain(cookie["domain"])
             cookie_added = self.try_add_cookie(cookie)
             if not cookie_added:
                 msg = f"Couldn't add the following cookie to the webdriver: {cookie}"
                 raise WebDriverException(msg)
 
-    def is_cookie_in_driver(self, cookie: dict[str, Any]) -> bool:
+    def _add_cookies_in_bulk(self, cookies: list[dict[str, Any]]) -> None:
+        # Devtools needs a domain or url for each cookie, cookies with an empty domain go through webdriver
+        if _supports_cdp(self) and all(cookie["domain"] for cookie in cookies):
+            try:
+                self.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp_cookie(cookie) for cookie in cookies]})
+            except WebDriverException:
+                pass
+            else:
+                return
+
+        for cookie in cookies:
+            self._add_cookie(cookie)
+
+    def ensure_add_cookies(self, cookies: Iterable[dict[str, Any]], override_domain: str | None = None) -> None:
+        """
+        Add many cookies to the driver and check to ensure they have been added.
+
+        Works like calling 'ensure_add_cookie' for each cookie, but with far fewer round trips to
+        the browser. The cookies are grouped by domain, and for each domain we GET it at most once,
+        add all of its cookies in bulk and verify them with a single 'get_cookies' call.
+
+        Chromium based drivers add the cookies with a single 'Network.setCookies' devtools command,
+        the rest add them one by one without verifying each of them.
+
+        Cookies that fail are retried one by one with a more permissive domain, as in
+        'ensure_add_cookie', and we raise an exception if that fails too.
+        """
+        cookies_by_domain: dict[str, list[dict[str, Any]]] = {}
+        for original_cookie in cookies:
+            cookie = dict(original_cookie)
+            if override_domain:
+                cookie["domain"] = override_domain
+            cookie_domain = cookie["domain"] if cookie["domain"][:1] != "." else cookie["domain"][1:]
+            cookies_by_domain.setdefault(cookie_domain, []).append(cookie)
+
+        try:
+            browser_domain = fqdn(self.current_url)
+        except (AttributeError, NoSuchWindowException):
+            browser_domain = ""
+
+        for cookie_domain, domain_cookies in cookies_by_domain.items():
+            if cookie_domain not in browser_domain:
+                # See 'ensure_add_cookie' about hardcoding 'http'
+                self.get("http://" + cookie_domain)
+                browser_domain = cookie_domain
+
+            self._add_cookies_in_bulk(domain_cookies)
+
+            driver_cookies = self.get_cookies()
+            for cookie in domain_cookies:
+                if self.is_cookie_in_driver(cookie, driver_cookies):
+                    continue
+                cookie["domain"] = registered_domain(cookie["domain"])
+                if not self.try_add_cookie(cookie):
+                    msg = f"Couldn't add the following cookie to the webdriver: {cookie}"
+                    raise WebDriverException(msg)
+
+    def is_cookie_in_driver(self, cookie: dict[str, Any], driver_cookies: list[dict[str, Any]] | None = None) -> bool:
         """
         We check that the cookie is correctly added to the driver.
 
         We only compare name, value and domain, as the rest can produce false negatives.
         We are a bit lenient when comparing domains.
+
+        The driver's cookies can be passed in 'driver_cookies', to check many cookies against
+        a single 'get_cookies' call.
         """
-        for driver_cookie in self.get_cookies():
+        if driver_cookies is None:
+            driver_cookies = self.get_cookies()
+        for driver_cookie in driver_cookies:
             name_matches = cookie["name"] == driver_cookie["name"]
             value_matches = cookie["value"] == driver_cookie["value"]
             domain_matches = driver_cookie["domain"] in (cookie["domain"], "." + cookie["domain"])
@@ -169,7 +574,49 @@ class DriverMixin(RemoteWebDriver):
     def ensure_element_by_css_selector(self, selector: str, state: str | None = "present", timeout: float | None = None) -> WebElement | None:
         return self.ensure_element(By.CSS_SELECTOR, selector, state, timeout)
 
-    def ensure_element(self, locator: ByType | str, selector: str, state: str | None = "present", timeout: float | None = None) -> WebElement | None:
+    def _wait_for_element_polling(self, locator: ByType | str, selector: str, state: str | None, timeout: float) -> WebElement | None:
+        if state == "visible":
+            element = WebDriverWait(self, timeout).until(expected_conditions.visibility_of_element_located((locator, selector)))
+        elif state == "clickable":
+            element = WebDriverWait(self, timeout).until(expected_conditions.element_to_be_clickable((locator, selector)))
+        elif state == "present":
+            element = WebDriverWait(self, timeout).until(expected_conditions.presence_of_element_located((locator, selector)))
+        elif state == "invisible":
+            WebDriverWait(self, timeout).until(expected_conditions.invisibility_of_element_located((locator, selector)))
+            element = None
+        else:
+            msg = f"The 'state' argument must be 'visible', 'clickable', 'present' or 'invisible', not '{state}'"
+            raise ValueError(msg)
+        return element
+
+    def _wait_for_element_mutations(self, locator: ByType | str, selector: str, state: str, timeout: float) -> WebElement | None:
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                # Don't go through our own 'execute_async_script', waiting doesn't change the page
+                reached_state, element = RemoteWebDriver.execute_async_script(
+                    self, _ELEMENT_MUTATION_WAIT_SCRIPT, [locator, selector, state], min(remaining, _MUTATION_WAIT_CHUNK) * 1000
+                )
+            except UnknownMethodException:
+                self._async_scripts_unsupported = True
+                return self._wait_for_element_polling(locator, selector, state, remaining)
+            except WebDriverException:
+                # Eg.: the page navigated away while we were waiting, polling copes with that
+                return self._wait_for_element_polling(locator, selector, state, max(deadline - time.monotonic(), 0.1))
+            if reached_state:
+                return element
+
+        msg = f"Timed out waiting for the element ({locator}, {selector}) to be {state}"
+        raise TimeoutException(msg)
+
+    def ensure_element(
+        self,
+        locator: ByType | str,
+        selector: str,
+        state: str | None = "present",
+        timeout: float | None = None,
+        engine: str | None = None,
+    ) -> WebElement | None:
         """
         Wait until an element appears or disappears in the browser.
 
@@ -189,67 +636,238 @@ class DriverMixin(RemoteWebDriver):
         is a bit buggy in selenium, an element can be 'clickable' according to selenium and
         still fail when we try to click it.
 
+        The 'engine' argument chooses how we wait, defaulting to the driver's 'wait_engine'.
+        With 'poll' we check for the element every half a second, so we may notice it up to half
+        a second late. With 'mutation' we inject a script with a MutationObserver that returns as
+        soon as the page changes into the expected state. Drivers that can't run async scripts
+        fall back to polling.
+
         More info at: http://selenium-python.readthedocs.io/waits.html
         """
-        locators_compatibility = {
-            "link_text": By.LINK_TEXT,
-            "partial_link_text": By.PARTIAL_LINK_TEXT,
-            "tag_name": By.TAG_NAME,
-            "class_name": By.CLASS_NAME,
-            "css_selector": By.CSS_SELECTOR,
-        }
-        if locator in locators_compatibility:
-            warnings.warn(
-                """
-                Support for locator strategy names with underscores is deprecated.
-                Use strategies from Selenium's By class (importable from selenium.webdriver.common.by).
-                """,
-                DeprecationWarning,
-                stacklevel=2,
-            )
-            locator = locators_compatibility[locator]
+        locator = _compatible_locator(locator)
 
         if not timeout:
             timeout = self.default_timeout or DEFAULT_TIMEOUT
 
-        if state == "visible":
-            element = WebDriverWait(self, timeout).until(expected_conditions.visibility_of_element_located((locator, selector)))
-        elif state == "clickable":
-            element = WebDriverWait(self, timeout).until(expected_conditions.element_to_be_clickable((locator, selector)))
-        elif state == "present":
-            element = WebDriverWait(self, timeout).until(expected_conditions.presence_of_element_located((locator, selector)))
-        elif state == "invisible":
-            WebDriverWait(self, timeout).until(expected_conditions.invisibility_of_element_located((locator, selector)))
-            element = None
-        else:
-            msg = f"The 'state' argument must be 'visible', 'clickable', 'present' or 'invisible', not '{state}'"
+        engine = engine or getattr(self, "wait_engine", "poll")
+        if engine not in {"poll", "mutation"}:
+            msg = f"The 'engine' argument must be 'poll' or 'mutation', not '{engine}'"
             raise ValueError(msg)
 
-        # We add this method to our element to provide a more robust click. Chromedriver
-        # sometimes needs some time before it can click an item, specially if it needs to
-        # scroll into it first. This method ensures clicks don't fail because of this.
+        with self.instrumentation.span("ensure_element", locator=locator, selector=selector, state=state, engine=engine) as attributes:
+            if engine == "mutation" and state in _ELEMENT_STATES and not getattr(self, "_async_scripts_unsupported", False):
+                element = self._wait_for_element_mutations(locator, selector, state, timeout)
+            else:
+                element = self._wait_for_element_polling(locator, selector, state, timeout)
+            attributes["found"] = element is not None
+
         if element:
-            element.ensure_click = functools.partial(_ensure_click, element)  # type: ignore[attr-defined]
+            _add_ensure_click(element)
         return element
 
+    def ensure_elements(
+        self,
+        conditions: dict[str, tuple[ByType | str, str] | tuple[ByType | str, str, str]],
+        timeout: float | None = None,
+        *,
+        raise_on_timeout: bool = True,
+    ) -> dict[str, WebElement | None]:
+        """
+        Wait until many elements appear or disappear in the browser, all at once.
+
+        The 'conditions' map a name of our choosing to a (locator, selector, state) tuple, where
+        the arguments mean the same as in 'ensure_element' and the state may be left out to
+        default to 'present'. The elements are returned in a dict with the same names, the ones
+        waited to be 'invisible' map to None.
+
+        Waiting for each element with 'ensure_element' would poll the browser separately for each
+        of them, one after the other. Here a single script checks every pending element on each
+        poll, so a form with 15 fields costs one round trip to the browser per poll instead of 15.
+        The checks are done in javascript, which approximates Selenium's idea of a visible element.
+
+        If some of the elements don't reach their state before the timeout we raise an
+        'EnsureElementsTimeoutException', whose 'found' and 'pending' attributes tell which ones
+        made it. With 'raise_on_timeout' set to False we return the elements that were found instead.
+        """
+        pending = {name: _element_condition(*condition) for name, condition in conditions.items()}
+
+        if not timeout:
+            timeout = self.default_timeout or DEFAULT_TIMEOUT
+
+        found: dict[str, WebElement | None] = {}
+
+        def check_pending_elements(_: DriverMixin) -> bool:
+            names = list(pending)
+            # Don't go through our own 'execute_script', checking the page doesn't change it
+            results = RemoteWebDriver.execute_script(self, _ELEMENTS_STATE_SCRIPT, [pending[name] for name in names])
+            for name, (reached_state, element) in zip(names, results, strict=True):
+                if reached_state:
+                    found[name] = element
+                    del pending[name]
+            return not pending
+
+        with self.instrumentation.span("ensure_elements", elements=len(pending)) as attributes:
+            try:
+                WebDriverWait(self, timeout).until(check_pending_elements)
+            except TimeoutException:
+                if raise_on_timeout:
+                    raise EnsureElementsTimeoutException(found, list(pending)) from None
+            attributes["pending"] = len(pending)
+
+        for element in found.values():
+            if element:
+                _add_ensure_click(element)
+        return found
+
+    @contextlib.contextmanager
+    def record_network(self, resource_types: Iterable[str] = RECORDED_RESOURCE_TYPES) -> Iterator[NetworkRecording]:
+        """
+        Record the requests the browser makes inside the 'with' block into a NetworkRecording.
+
+        The recording is filled in when the block exits. It keeps the requests pages make on
+        purpose (documents, XHR and fetch calls) by default, and can be saved and replayed over
+        requests. The driver must be started with the 'record_network' webdriver option, which
+        turns on chrome's performance log the requests are read from.
+        """
+        try:
+            self.execute(Command.GET_LOG, {"type": "performance"})  # Drain what the log collected before the block
+        except WebDriverException as e:
+            msg = "Network recording needs a chrome driver started with webdriver_options={'record_network': True}"
+            raise ValueError(msg) from e
+        recording = NetworkRecording()
+        yield recording
+        recording.requests = NetworkRecording.from_performance_log(self.execute(Command.GET_LOG, {"type": "performance"})["value"], resource_types).requests
+
+    def _block_urls_in_current_tab(self) -> None:
+        """Block the driver's '_blocked_url_patterns' in the current tab, devtools only applies them to one tab at a time."""
+        self.execute_cdp_cmd("Network.enable", {})
+        self.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self._blocked_url_patterns})
+
+    def tabs(self, size: int, *, timeout: float = 30, ready_state: str | None = None) -> TabPool:
+        """
+        Open 'size' tabs in the browser, to load pages in all of them at the same time.
+
+        Returns a TabPool, whose 'as_loaded' loads a list of urls and hands out each tab as its
+        page is ready, and whose tabs take 'ensure_element', 'xpath', 'css' and the like calls
+        against their own page. Closing the pool, or leaving its 'with' block, closes the tabs.
+        """
+        return TabPool(self, size, timeout=timeout, ready_state=ready_state)
+
+    @contextlib.contextmanager
+    def snapshot(self, *, watch_dom: bool = False) -> Iterator[DriverMixin]:
+        """
+        Reuse the parsed page between xpath, css, re calls made inside the 'with' block.
+
+        Outside of a snapshot we transfer and re-parse the page source on every call, as the site
+        may change between calls. Inside of it the page is only transferred again after it may have
+        changed, which we know because 'get', 'back', 'forward', 'refresh', 'execute_script',
+        'execute_async_script' or an element's 'ensure_click' got called, or because the driver's
+        'current_url' changed (Eg.: after a plain 'click' on a link). A page source transferred
+        again is only parsed again if it's different.
+
+        That doesn't catch changes made by the site's own javascript, such as content loaded by
+        AJAX requests. Setting 'watch_dom' injects a MutationObserver into the page and checks its
+        mutation counter and url (a tiny script call) instead of the url, which catches every change.
+        """
+        previous_mode = getattr(self, "_snapshot_mode", None)
+        self._snapshot_mode = "dom" if watch_dom else "calls"
+        self.invalidate_selector()
+        try:
+            yield self
+        finally:
+            self._snapshot_mode = previous_mode
+            self._selector_snapshot = None
+
+    def _read_page_source(self) -> str:
+        with self.instrumentation.span("driver.page_source") as attributes:
+            page_source = self.page_source
+            attributes["size"] = len(page_source)
+        return page_source
+
+    def _parse_page_source(self, page_source: str) -> Selector:
+        with self.instrumentation.span("parse", source="driver", size=len(page_source)):
+            return Selector(text=page_source)
+
+    def invalidate_selector(self) -> None:
+        """Mark the page snapshot as stale, so the next xpath, css, re call transfers the page source again."""
+        snapshot = getattr(self, "_selector_snapshot", None)
+        if snapshot is not None:
+            self._selector_snapshot = (_STALE, snapshot[1], snapshot[2])
+
+    def _current_selector(self) -> Selector:
+        # A method rather than the 'selector' property, as drivers given to a Session only get our methods
+        snapshot_mode = getattr(self, "_snapshot_mode", None)
+        if not snapshot_mode:
+            return self._parse_page_source(self._read_page_source())
+
+        # Don't go through our own 'execute_script', reading the page state doesn't change the page
+        page_state = RemoteWebDriver.execute_script(self, _DOM_STATE_SCRIPT) if snapshot_mode == "dom" else self.current_url
+        snapshot = getattr(self, "_selector_snapshot", None)
+        if snapshot is not None and snapshot[0] == page_state:
+            self.instrumentation.count("selector.snapshot_hits")
+            return snapshot[2]
+
+        page_source = self._read_page_source()
+        if snapshot is not None and snapshot[1] == page_source:
+            self.instrumentation.count("selector.snapshot_hits")
+            selector = snapshot[2]
+        else:
+            selector = self._parse_page_source(page_source)
+        self._selector_snapshot = (page_state, page_source, selector)
+        return selector
+
     @property
     def selector(self) -> Selector:
         """
         Returns the current state of the browser in a Selector.
 
         We re-parse the site on each xpath, css, re call because we are running a web browser
-        and the site may change between calls
+        and the site may change between calls, unless we are inside a 'snapshot' block.
+        """
+        return self._current_selector()
+
+    def extract(self, schema: ExtractionSchema | dict[str, Any]) -> dict[str, Any]:
+        """
+        Extract a record out of the current page with an ExtractionSchema, or a dict of its fields.
+
+        The page source is transferred and parsed once for the whole record, and not at all
+        inside a 'snapshot' block if it was already.
         """
-        return Selector(text=self.page_source)
+        if not isinstance(schema, ExtractionSchema):
+            schema = ExtractionSchema(schema)
+        return schema.extract(self._current_selector())
 
     def xpath(self, *args, **kwargs) -> SelectorList[Selector]:
-        return self.selector.xpath(*args, **kwargs)
+        return self._current_selector().xpath(*args, **kwargs)
 
     def css(self, *args, **kwargs) -> SelectorList[Selector]:
-        return self.selector.css(*args, **kwargs)
+        return self._current_selector().css(*args, **kwargs)
 
     def re(self, *args, **kwargs) -> list[str]:
-        return self.selector.re(*args, **kwargs)
+        return self._current_selector().re(*args, **kwargs)
 
     def re_first(self, *args, **kwargs) -> str | None:
-        return self.selector.re_first(*args, **kwargs)
+        return self._current_selector().re_first(*args, **kwargs)
+
+
+def _add_mixin_methods(driver: RemoteWebDriver) -> None:
+    """Give a driver created outside of requestium the DriverMixin methods it doesn't have."""
+    if isinstance(driver, DriverMixin):
+        return
+    # Our overrides of the driver's own methods can't be added, so its page changing methods are wrapped instead
+    for name in _PAGE_CHANGING_METHODS:
+        driver.__dict__[name] = _invalidating_selector(driver, getattr(driver, name))
+    driver.__dict__["get"] = _instrumented_get(driver, driver.get)
+    for name, value in DriverMixin.__dict__.items():
+        name_private = name.startswith("__") and name.endswith("__")
+        if name_private or not isinstance(value, types.FunctionType) or name in dir(driver):
+            continue
+        driver.__dict__[name] = value.__get__(driver)
+
+
+def _from_cdp_cookie(cdp_cookie: dict[str, Any]) -> dict[str, Any]:
+    """Convert a cookie from devtools' 'Network.getAllCookies' command into the webdriver format."""
+    cookie: dict[str, Any] = {name: cdp_cookie[name] for name in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if name in cdp_cookie}
+    if not cdp_cookie.get("session") and cdp_cookie.get("expires", -1) >= 0:
+        cookie["expiry"] = int(cdp_cookie["expires"])
+    return cookie
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+import urllib3.exceptions
+from selenium.common.exceptions import WebDriverException
+
+from .requestium_mixin import _supports_cdp
+from .requestium_session import Session
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import TracebackType
+
+    from .requestium_mixin import DriverMixin
+
+# The ways a webdriver shows it has crashed, either the browser (WebDriverException) or the
+# driver process itself, when we can't even connect to it (OSError, urllib3's errors)
+_DRIVER_ERRORS = (WebDriverException, OSError, urllib3.exceptions.HTTPError)
+
+
+class _PooledDriver:
+    __slots__ = ("created_at", "driver", "uses")
+
+    def __init__(self, driver: DriverMixin) -> None:
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Keeps warm webdrivers which Sessions lease instead of starting a browser of their own.
+
+    Starting a browser takes a few seconds, which for short jobs may be longer than the job itself.
+    The pool starts 'size' drivers upfront (in parallel, unless 'prelaunch' is False), and a
+    Session created with 'driver_pool=pool' leases one on its first '.driver' access and returns
+    it when the session is closed. Drivers can also be leased directly with 'acquire' and
+    'release', or the 'lease' context manager.
+
+    Returned drivers are reset: extra windows are closed, cookies and the current site's storage
+    are cleared, and the browser is sent to 'about:blank'. A driver is replaced by a fresh one if
+    it crashed, if it was used 'max_uses' times or if it is older than 'max_age' seconds.
+
+    The drivers are created like a Session would, with the same 'webdriver_path', 'headless',
+    'default_timeout' and 'webdriver_options' arguments, or by calling 'factory' if provided.
+    """
+
+    @staticmethod
+    def _quit(driver: DriverMixin) -> None:
+        with contextlib.suppress(*_DRIVER_ERRORS):
+            driver.quit()
+
+    def __init__(  # noqa: PLR0913
+        self,
+        size: int = 1,
+        *,
+        webdriver_path: str | None = None,
+        headless: bool | None = None,
+        default_timeout: float = 5,
+        webdriver_options: dict[str, Any] | None = None,
+        factory: Callable[[], DriverMixin] | None = None,
+        max_uses: int | None = None,
+        max_age: float | None = None,
+        prelaunch: bool = True,
+    ) -> None:
+        if size < 1:
+            msg = f"The pool 'size' must be at least 1, not {size}"
+            raise ValueError(msg)
+
+        if factory is None:
+            template = Session(webdriver_path=webdriver_path, default_timeout=default_timeout, webdriver_options=webdriver_options)
+            factory = functools.partial(template._start_chrome_browser, headless=headless)  # noqa: SLF001
+
+        self.size = size
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self._factory = factory
+        self._idle: collections.deque[_PooledDriver] = collections.deque()
+        self._leased: dict[int, _PooledDriver] = {}
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        if prelaunch:
+            with ThreadPoolExecutor(max_workers=size) as executor:
+                launches = [executor.submit(self._factory) for _ in range(size)]
+            drivers = [launch.result() for launch in launches if launch.exception() is None]
+            if len(drivers) < size:
+                for driver in drivers:
+                    self._quit(driver)
+                raise next(launch.exception() for launch in launches if launch.exception() is not None)  # type: ignore[misc]
+            self._idle.extend(_PooledDriver(driver) for driver in drivers)
+
+    def _expired(self, record: _PooledDriver) -> bool:
+        too_used = self.max_uses is not None and record.uses >= self.max_uses
+        too_old = self.max_age is not None and time.monotonic() - record.created_at >= self.max_age
+        return too_used or too_old
+
+    @staticmethod
+    def _healthy(driver: DriverMixin) -> bool:
+        try:
+            _ = driver.window_handles
+        except _DRIVER_ERRORS:
+            return False
+        return True
+
+    def acquire(self, timeout: float | None = None) -> DriverMixin:
+        """
+        Lease a driver, waiting up to 'timeout' seconds for one to be returned if all are in use.
+
+        Idle drivers are health checked before being handed out, and replaced if they crashed or
+        are past their 'max_uses' or 'max_age'.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    msg = "Can't acquire a driver from a closed pool"
+                    raise RuntimeError(msg)
+                if self._idle or len(self._leased) + self._starting < self.size:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    msg = f"All of the pool's {self.size} drivers are in use"
+                    raise TimeoutError(msg)
+                self._condition.wait(remaining)
+            # Hand out the most recently returned driver, the one most likely to still be healthy
+            record = self._idle.pop() if self._idle else None
+            self._starting += 1  # Hold its slot while we check it or start it
+
+        try:
+            if record is not None and (self._expired(record) or not self._healthy(record.driver)):
+                self._quit(record.driver)
+                record = None
+            if record is None:
+                record = _PooledDriver(self._factory())
+            record.uses += 1
+        finally:
+            with self._condition:
+                self._starting -= 1
+                if record is not None:
+                    self._leased[id(record.driver)] = record
+                self._condition.notify()
+        return record.driver
+
+    def release(self, driver: DriverMixin) -> None:
+        """
+        Return a leased driver to the pool.
+
+        The driver is reset, or replaced by a fresh one if it crashed or is past its
+        'max_uses' or 'max_age', so it is ready for the next lease.
+        """
+        with self._condition:
+            record = self._leased.pop(id(driver), None)
+            if record is None:
+                msg = "The driver wasn't leased from this pool"
+                raise ValueError(msg)
+            self._starting += 1  # Hold its slot while we reset it
+
+        try:
+            if self._closed:
+                self._quit(driver)
+                return
+            if not self._expired(record):
+                try:
+                    self.reset(driver)
+                except _DRIVER_ERRORS:
+                    pass
+                else:
+                    with self._condition:
+                        self._idle.append(record)
+                    return
+
+            # Replace it now, the time it takes to start a browser is what we are trying to keep out of the next lease
+            self._quit(driver)
+            with contextlib.suppress(*_DRIVER_ERRORS):
+                new_driver = self._factory()
+                with self._condition:
+                    self._idle.append(_PooledDriver(new_driver))
+        finally:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify()
+
+    @contextlib.contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[DriverMixin]:
+        """Lease a driver for the duration of a 'with' block."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def reset(self, driver: DriverMixin) -> None:
+        """Close extra windows, clear cookies and storage, and go to 'about:blank'."""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Storage can only be cleared from the site that owns it, before leaving it
+        driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        # 'delete_all_cookies' only deletes the current site's cookies, chromium can delete them all
+        if _supports_cdp(driver):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def close(self) -> None:
+        """Quit the idle drivers, leased ones are quit when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+            self._condition.notify_all()
+        for record in idle:
+            self._quit(record.driver)
+
+    def __len__(self) -> int:
+        """Return the amount of drivers in the pool, either idle, leased or starting."""
+        with self._condition:
+            return len(self._idle) + len(self._leased) + self._starting
+
+    def __enter__(self) -> DriverPool:
+        """Use the pool as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        """Quit all of the pool's drivers."""
+        self.close()
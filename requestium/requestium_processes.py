@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.context
+
+# Forking a process with running threads (Eg.: selenium's) can deadlock, so the worker processes
+# of the crawler and of 'extract_many' are spawned unless we ask for another start method
+DEFAULT_MP_CONTEXT: str = "spawn"
+
+
+def _get_mp_context(mp_context: str | multiprocessing.context.BaseContext | None) -> multiprocessing.context.BaseContext:
+    """Return the multiprocessing context given, or the one of the start method named (the platform's default for None)."""
+    if isinstance(mp_context, multiprocessing.context.BaseContext):
+        return mp_context
+    return multiprocessing.get_context(mp_context)
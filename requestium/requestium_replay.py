@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import requests
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .requestium_response import RequestiumResponse
+    from .requestium_session import Session
+
+RECORDING_FORMAT_VERSION: int = 1
+
+# The requests a page makes on purpose, as opposed to the images, scripts, etc. it loads
+RECORDED_RESOURCE_TYPES: tuple[str, ...] = ("Document", "XHR", "Fetch")
+
+# Headers requests sets on its own, or that would be stale on replay: the cookies come from the session's jar instead
+_UNREPLAYABLE_HEADERS = frozenset({"content-length", "cookie", "host", "connection"})
+
+
+class ReplayError(Exception):
+    """A replayed request failed, or the replayed flow didn't pass its check."""
+
+    def __init__(self, msg: str, response: RequestiumResponse | None = None) -> None:
+        super().__init__(msg)
+        self.response = response
+
+
+class RecordedRequest(NamedTuple):
+    """A request the browser made, as captured from its network events."""
+
+    method: str
+    url: str
+    headers: dict[str, str]
+    body: str | None = None
+
+
+def _request_body(request: dict[str, Any]) -> str | None:
+    if "postData" in request:
+        return request["postData"]
+    # Newer chromes send the body split in base64 encoded entries instead
+    entries = request.get("postDataEntries")
+    if entries:
+        return b"".join(base64.b64decode(entry.get("bytes", "")) for entry in entries).decode("utf-8", errors="replace")
+    return None
+
+
+class NetworkRecording:
+    """
+    The requests a page made while a driver was recording, which can be replayed over requests.
+
+    Recordings are made with 'driver.record_network()' on a driver started with the 'record_network'
+    webdriver option, and can be saved and loaded as JSON. Replaying one with 'replay' sends the
+    same requests through a Session, usually a login flow, so its cookies get set without
+    starting a browser.
+    """
+
+    def __init__(self, requests: Iterable[RecordedRequest] = ()) -> None:
+        self.requests = list(requests)
+
+    @classmethod
+    def from_performance_log(cls, entries: Iterable[dict[str, Any]], resource_types: Iterable[str] = RECORDED_RESOURCE_TYPES) -> NetworkRecording:
+        """Build a recording from chrome's performance log entries, keeping the requests of the given resource types."""
+        resource_types = set(resource_types)
+        recorded = []
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            if message["method"] != "Network.requestWillBeSent":
+                continue
+            params = message["params"]
+            request = params["request"]
+            # Redirects are followed by requests on replay, only the request that started them is needed
+            if params.get("redirectResponse") or params.get("type") not in resource_types or not request["url"].startswith("http"):
+                continue
+            recorded.append(RecordedRequest(request["method"], request["url"], request.get("headers", {}), _request_body(request)))
+        return cls(recorded)
+
+    @classmethod
+    def load(cls, path: str | Path) -> NetworkRecording:
+        """Load a recording saved with 'save'."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != RECORDING_FORMAT_VERSION:
+            msg = f"Unsupported network recording version: {data.get('version')}"
+            raise ValueError(msg)
+        return cls(RecordedRequest(**request) for request in data["requests"])
+
+    def save(self, path: str | Path) -> None:
+        data = {"version": RECORDING_FORMAT_VERSION, "requests": [request._asdict() for request in self.requests]}
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    def replay(self, session: Session, *, check: Callable[[Session], bool] | None = None, **kwargs) -> list[RequestiumResponse]:
+        """
+        Send the recorded requests through 'session', in order, returning their responses.
+
+        Each request goes out with its recorded method, url, headers and body, except for the
+        cookies, which come from the session's jar as the earlier responses set them. Extra
+        keyword arguments (Eg.: 'timeout') are passed to every request.
+
+        Raises ReplayError if a request fails or gets an error status, or if 'check' is given and
+        returns False once all the requests were sent, signaling the recording no longer works
+        and a fresh one should be made with the browser.
+        """
+        responses = []
+        for recorded in self.requests:
+            headers = {name: value for name, value in recorded.headers.items() if name.lower() not in _UNREPLAYABLE_HEADERS and not name.startswith(":")}
+            data = recorded.body.encode() if recorded.body is not None else None
+            try:
+                response = session.request(recorded.method, recorded.url, headers=headers, data=data, **kwargs)
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                msg = f"Replaying {recorded.method} {recorded.url} failed: {e}"
+                raise ReplayError(msg, e.response) from e  # type: ignore[arg-type]
+            except requests.RequestException as e:
+                msg = f"Replaying {recorded.method} {recorded.url} failed: {e}"
+                raise ReplayError(msg) from e
+            responses.append(response)
+
+        if check is not None and not check(session):
+            msg = "The replayed requests didn't pass the check, the recording may be outdated"
+            raise ReplayError(msg, responses[-1] if responses else None)
+        return responses
+
+    def __len__(self) -> int:
+        """Return the amount of recorded requests."""
+        return len(self.requests)
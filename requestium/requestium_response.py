@@ -1,25 +1,152 @@
 from __future__ import annotations
 
+import copy
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
 import requests
-from parsel.selector import Selector, SelectorList
 from requests import Response
 
+from .requestium_instrumentation import NULL_INSTRUMENTATION
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from lxml import etree
+    from parsel.selector import Selector, SelectorList
+
+    from .requestium_instrumentation import Instrumentation
+    from .requestium_schema import ExtractionSchema
+
+# The paths 'iter_xpath' can match while streaming: a tag name (with an optional namespace),
+# optionally preceded by '//' and followed by a predicate, such as "//div[@class='item']"
+_STREAMABLE_PATH = re.compile(r"^(?://)?(?P<tag>(?:\{[^}]*\})?[^\s/\[\]{}]+)(?P<predicate>\[.*\])?$", re.DOTALL)
+
+
+class SelectorCacheInfo(NamedTuple):
+    """Parse statistics of a response's cached selector, in the spirit of 'functools' cache_info."""
+
+    hits: int
+    misses: int
+
+
+# The classes of wrapped responses that subclass requests' Response, by (wrapper class, response class)
+_COMBINED_RESPONSE_CLASSES: dict[tuple[type[RequestiumResponse], type[Response]], type[RequestiumResponse]] = {}
+
+
+def _combined_response_class(wrapper_class: type[RequestiumResponse], response_class: type[Response]) -> type[RequestiumResponse]:
+    """Build the class of a wrapped response that subclasses requests' Response, once per pair of classes."""
+    combined_class = _COMBINED_RESPONSE_CLASSES.get((wrapper_class, response_class))
+    if combined_class is None:
+        combined_class = type(response_class.__name__, (wrapper_class, response_class), {})
+        _COMBINED_RESPONSE_CLASSES[wrapper_class, response_class] = combined_class
+    return combined_class
+
+
+def _completed_elements(parser: etree._FeedParser, predicate: Callable[[Any], Any] | None, selector_type: str) -> Iterator[Selector]:
+    """Yield the elements the parser completed since the last call, freeing them afterwards."""
+    from parsel.selector import Selector  # noqa: PLC0415
+
+    for _, element in parser.read_events():
+        if predicate is None or predicate(element):
+            # A detached copy, so the Selector stays valid after we free the element
+            yield Selector(root=copy.deepcopy(element), type=selector_type)
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
 
 class RequestiumResponse(requests.Response):
     """Adds xpath, css, and regex methods to a normal requests response object."""
 
+    # Class level defaults, so they also exist on unpickled responses (pickling only keeps requests' own attributes)
+    _selector_cache: tuple[Any, Any, Selector] | None = None
+    _selector_cache_hits = 0
+    _selector_cache_misses = 0
+    _instrumentation: Instrumentation = NULL_INSTRUMENTATION
+    from_cache = False  # Set on the responses a Session's cache answers
+
     def __init__(self, response: Response) -> None:
-        super().__init__()
-        self.__class__ = type(response.__class__.__name__, (self.__class__, response.__class__), response.__dict__)
+        # We take the wrapped response's attributes as they are, rather than initializing our own
+        # and replacing them, which makes wrapping a response about as cheap as a dict copy
+        self.__dict__.update(response.__dict__)
+        # Responses of a Response subclass must still be instances of it. We build their class once
+        # and reuse it, creating a class for each response would flood the memory with them.
+        if not isinstance(self, response.__class__):
+            self.__class__ = _combined_response_class(self.__class__, response.__class__)
 
     @property
     def selector(self) -> Selector:
         """
         Returns the response text in a Selector.
 
-        We re-parse the text on each xpath, css, re call in case the encoding has changed.
+        The parsed tree is cached, so running many xpath, css, re calls against the same
+        response only parses it once. The cache is keyed on the response's encoding and content,
+        so changing either of them makes the next call re-parse the text.
+        """
+        # Compare the content by identity, hashing a multi-MB body on each call would defeat the point
+        cache = self._selector_cache
+        if cache is not None and cache[0] == self.encoding and cache[1] is self._content:
+            self._selector_cache_hits += 1
+            return cache[2]
+
+        # Parsel is imported on the first parse, not with the package
+        from parsel.selector import Selector  # noqa: PLC0415
+
+        text = self.text
+        with self._instrumentation.span("parse", source="response", size=len(text)):
+            selector = Selector(text=text)
+        # Reading 'text' may have consumed the body and set '_content', so we key on the final value
+        self._selector_cache = (self.encoding, self._content, selector)
+        self._selector_cache_misses += 1
+        return selector
+
+    def extract(self, schema: ExtractionSchema | dict[str, Any]) -> dict[str, Any]:
+        """Extract a record out of the response with an ExtractionSchema, or a dict of its fields."""
+        from .requestium_schema import ExtractionSchema  # noqa: PLC0415
+
+        if not isinstance(schema, ExtractionSchema):
+            schema = ExtractionSchema(schema)
+        return schema.extract(self)
+
+    def selector_cache_info(self) -> SelectorCacheInfo:
+        """Report how many selector calls were served from the parsed tree and how many had to parse the text."""
+        return SelectorCacheInfo(self._selector_cache_hits, self._selector_cache_misses)
+
+    def iter_xpath(self, path: str, *, chunk_size: int = 64 * 1024, type: str | None = None) -> Iterator[Selector]:  # noqa: A002
         """
-        return Selector(text=self.text)
+        Yield the elements matching 'path' while the response downloads, without parsing it whole.
+
+        Meant for huge pages, such as listings of tens of MB, requested with 'stream=True': the
+        body is fed to an incremental parser as it arrives, each matching element is yielded in a
+        Selector of its own as soon as it is complete, and the elements already yielded are freed.
+        So the memory use stays bounded and the first results arrive before the download finishes.
+
+        Only paths that can be matched with a single element in hand are supported: a tag name,
+        optionally preceded by '//' and followed by a predicate, such as "item", "//item" or
+        "//div[@class='product'][price]". Matches nested inside other matches lose their content.
+
+        The body is parsed as html unless 'type' is "xml" or the response's content type is xml.
+        Streaming consumes the body, so afterwards the response can't be read in full anymore.
+        """
+        from lxml import etree  # noqa: PLC0415
+
+        match = _STREAMABLE_PATH.match(path.strip())
+        if not match:
+            msg = f"Can't stream the path '{path}', it must be a tag name with an optional predicate, Eg.: \"//div[@class='item']\""
+            raise ValueError(msg)
+
+        content_type = self.headers.get("Content-Type", "")
+        selector_type = type or ("xml" if "xml" in content_type and "html" not in content_type else "html")
+        parser_class = etree.XMLPullParser if selector_type == "xml" else etree.HTMLPullParser
+        parser = parser_class(events=("end",), tag=match["tag"])
+        predicate = etree.XPath("self::*" + match["predicate"]) if match["predicate"] else None
+
+        for chunk in self.iter_content(chunk_size):
+            parser.feed(chunk)
+            yield from _completed_elements(parser, predicate, selector_type)
+        parser.close()
+        yield from _completed_elements(parser, predicate, selector_type)
 
     def xpath(self, *args, **kwargs) -> SelectorList[Selector]:
         return self.selector.xpath(*args, **kwargs)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import re
+from typing import Any, cast
+
+from lxml import etree, html
+from parsel import css2xpath
+from parsel.selector import Selector
+from parsel.utils import extract_regex
+
+# The extension namespaces parsel's xpath calls know about, so expressions written for
+# 'response.xpath' (Eg.: "re:test(@id, '^item')") compile the same way here
+_XPATH_NAMESPACES: dict[str, str] = {"re": "http://exslt.org/regular-expressions", "set": "http://exslt.org/sets"}
+
+
+def _compile_query(xpath: str | None, css: str | None) -> etree.XPath | None:
+    if xpath is not None and css is not None:
+        msg = "Pass either 'xpath' or 'css', not both"
+        raise ValueError(msg)
+    if css is not None:
+        xpath = css2xpath(css)
+    return etree.XPath(xpath, namespaces=_XPATH_NAMESPACES, smart_strings=False) if xpath is not None else None
+
+
+def _serialize(value: Any) -> Any:  # noqa: ANN401
+    """Turn an xpath result into what parsel's 'get' returns for it: elements as markup, strings as they are."""
+    if isinstance(value, etree._Element):  # noqa: SLF001
+        return etree.tostring(value, method="html" if isinstance(value, html.HtmlElement) else "xml", encoding="unicode", with_tail=False)
+    return value
+
+
+def _root(source: Any) -> etree._Element:  # noqa: ANN401
+    """Get the parsed tree of a response, a driver, a Selector, an lxml element or some html."""
+    if isinstance(source, str):
+        return Selector(text=source).root
+    if isinstance(source, bytes):
+        return Selector(body=source).root
+    # Responses and drivers hand out their (cached) Selector, which wraps the lxml tree. Drivers
+    # given to a Session only get our methods, not the 'selector' property
+    current_selector = getattr(source, "_current_selector", None)
+    selector = current_selector() if current_selector is not None else getattr(source, "selector", source)
+    return getattr(selector, "root", selector)
+
+
+class Field:
+    """
+    A value of the records an ExtractionSchema extracts.
+
+    The value is found with an 'xpath' or a 'css' query, evaluated relative to the record, and
+    optionally narrowed down with a regex 're', applied to each match as 'response.re' would. A
+    regex without a query is applied to the markup of the whole record. Elements are returned
+    as their markup, like parsel's 'get' does, and with 'many' we get the list of every match
+    instead of the first one, or 'default' if there are none.
+    """
+
+    def _compile(self) -> None:
+        self._query = _compile_query(self.xpath, self.css)
+        self._regex = re.compile(self.re) if isinstance(self.re, str) else self.re
+
+    def __init__(
+        self,
+        xpath: str | None = None,
+        *,
+        css: str | None = None,
+        re: str | re.Pattern[str] | None = None,
+        many: bool = False,
+        default: Any = None,  # noqa: ANN401
+    ) -> None:
+        if xpath is None and css is None and re is None:
+            msg = "A field needs an 'xpath', a 'css' or a 're'"
+            raise ValueError(msg)
+        self.xpath = xpath
+        self.css = css
+        self.re = re
+        self.many = many
+        self.default = default
+        self._compile()
+
+    def extract(self, element: etree._Element) -> Any:  # noqa: ANN401
+        results = self._query(element) if self._query is not None else [element]
+        # Scalar xpaths, Eg.: "count(//li)" or "string(//h1)", return a single value
+        values = [_serialize(result) for result in results] if isinstance(results, list) else [results]
+        if self._regex is not None:
+            values = [match for value in values for match in extract_regex(self._regex, str(value))]
+        if self.many:
+            return values
+        return values[0] if values else self.default
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the field's definition, compiled xpaths can't be pickled."""
+        return {"xpath": self.xpath, "css": self.css, "re": self.re, "many": self.many, "default": self.default}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Compile the field again on unpickling."""
+        self.__dict__.update(state)
+        self._compile()
+
+
+class Nested:
+    """
+    Nested records of an ExtractionSchema, one for each element an 'xpath' or 'css' query finds.
+
+    The 'fields' (a dict like those of an ExtractionSchema, or a schema) are extracted relative
+    to each element, so their queries must be relative too, Eg.: ".//a/@href" or "a::attr(href)".
+    With 'many' (the default) we get a list of records, otherwise the first one or None.
+    """
+
+    def _compile(self) -> None:
+        # Unlike a field's, the query is never None, the constructor requires an 'xpath' or a 'css'
+        self._query = cast("etree.XPath", _compile_query(self.xpath, self.css))
+
+    def __init__(self, xpath: str | None = None, *, css: str | None = None, fields: dict[str, Any] | ExtractionSchema, many: bool = True) -> None:
+        if xpath is None and css is None:
+            msg = "Nested records need an 'xpath' or a 'css' to find them"
+            raise ValueError(msg)
+        self.xpath = xpath
+        self.css = css
+        self.schema = fields if isinstance(fields, ExtractionSchema) else ExtractionSchema(fields)
+        self.many = many
+        self._compile()
+
+    def extract(self, element: etree._Element) -> Any:  # noqa: ANN401
+        elements = [result for result in self._query(element) if isinstance(result, etree._Element)]  # noqa: SLF001
+        if self.many:
+            return [self.schema.extract_from_element(nested) for nested in elements]
+        return self.schema.extract_from_element(elements[0]) if elements else None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle the definition, compiled xpaths can't be pickled."""
+        return {"xpath": self.xpath, "css": self.css, "schema": self.schema, "many": self.many}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Compile the query again on unpickling."""
+        self.__dict__.update(state)
+        self._compile()
+
+
+class ExtractionSchema:
+    r"""
+    Extracts a record, a plain dict, out of a page with queries compiled once and reused on every page.
+
+    Calling 'xpath' and 'css' on a response or a driver compiles the query on each call and wraps
+    each match in a Selector. A schema compiles its queries when it's created and runs them
+    straight against the parsed tree, which is parsed once per page (and not at all again for
+    responses and driver snapshots already parsed), so applying the same schema to many pages
+    only costs the queries themselves.
+
+    The 'fields' map each key of the record to a Field, a Nested list of records, a dict of
+    fields for a nested record of the same element, or a string, which is short for an xpath
+    Field. Eg.:
+
+        schema = ExtractionSchema({
+            "title": "//h1/text()",
+            "price": Field(css=".price::text", re=r"[\d.]+"),
+            "items": Nested(css="li.item", fields={"name": Field(css="a::text"), "url": "a/@href"}),
+        })
+        record = schema.extract(response)  # Or: response.extract(schema), driver.extract(schema)
+
+    Schemas can be pickled, to send them to other processes.
+    """
+
+    @staticmethod
+    def _field(value: Any) -> Field | Nested | ExtractionSchema:  # noqa: ANN401
+        if isinstance(value, str):
+            return Field(value)
+        if isinstance(value, dict):
+            return ExtractionSchema(value)
+        if isinstance(value, (Field, Nested, ExtractionSchema)):
+            return value
+        msg = f"Schema fields must be a Field, a Nested, a dict or an xpath string, not {type(value).__name__}"
+        raise TypeError(msg)
+
+    def __init__(self, fields: dict[str, Any]) -> None:
+        self.fields: dict[str, Field | Nested | ExtractionSchema] = {name: self._field(value) for name, value in fields.items()}
+
+    def extract_from_element(self, element: etree._Element) -> dict[str, Any]:
+        """Extract the record out of an lxml element, the page's root or the element of a nested record."""
+        return {
+            name: field.extract_from_element(element) if isinstance(field, ExtractionSchema) else field.extract(element) for name, field in self.fields.items()
+        }
+
+    def extract(self, source: Any) -> dict[str, Any]:  # noqa: ANN401
+        """Extract the record out of a response, a driver, a Selector, an lxml element or a string of html."""
+        return self.extract_from_element(_root(source))
@@ -1,19 +1,154 @@
 from __future__ import annotations
 
+import contextlib
 import functools
-import types
-from typing import Any
+import gzip
+import json
+import urllib.parse
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import requests
-import tldextract
-from selenium import webdriver
-from selenium.common import InvalidCookieDomainException
-from selenium.webdriver import ChromeService
 
-from .requestium_mixin import DriverMixin
+from .requestium_cache import CacheBackend, HTTPCache
+from .requestium_domains import CookieDomainIndex, DomainTrackingCookieJar, domain_match, registered_domain
+from .requestium_instrumentation import NULL_INSTRUMENTATION, Instrumentation, InstrumentationStats
 from .requestium_response import RequestiumResponse
 
-RequestiumChrome = type("RequestiumChrome", (DriverMixin, webdriver.Chrome), {})
+if TYPE_CHECKING:
+    from http.cookiejar import Cookie
+    from pathlib import Path
+
+    from requests import PreparedRequest, Response
+
+    from .requestium_mixin import ClickStats, DriverMixin
+    from .requestium_pool import DriverPool
+
+STATE_FORMAT_VERSION: int = 1
+
+_READ_STORAGE_SCRIPT = """
+const dump = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+try {
+    return [window.location.origin, dump(window.localStorage), dump(window.sessionStorage)];
+} catch (e) {
+    return null;
+}
+"""
+
+_WRITE_STORAGE_SCRIPT = """
+for (const [key, value] of Object.entries(arguments[0])) window.localStorage.setItem(key, value);
+for (const [key, value] of Object.entries(arguments[1])) window.sessionStorage.setItem(key, value);
+"""
+
+# The url patterns blocked for each of the 'block_resources' types, matched with or without a query string
+_RESOURCE_EXTENSIONS: dict[str, tuple[str, ...]] = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "flac", "mov", "avi"),
+    "stylesheet": ("css",),
+}
+
+
+def _blocked_url_patterns(webdriver_options: dict[str, Any]) -> list[str]:
+    """Return the url patterns to block for the 'block_resources' and 'blocked_urls' webdriver options."""
+    block_resources = webdriver_options.get("block_resources", [])
+    blocked_urls = webdriver_options.get("blocked_urls", [])
+    for option, value in (("block_resources", block_resources), ("blocked_urls", blocked_urls)):
+        if not isinstance(value, list):
+            msg = f"'{option}' option must be a list, but got {type(value).__name__}"
+            raise TypeError(msg)
+
+    unknown_resources = set(block_resources) - _RESOURCE_EXTENSIONS.keys()
+    if unknown_resources:
+        msg = f"Unknown 'block_resources' types: {', '.join(sorted(unknown_resources))}. Choose from: {', '.join(_RESOURCE_EXTENSIONS)}"
+        raise ValueError(msg)
+
+    patterns = [pattern for resource in block_resources for extension in _RESOURCE_EXTENSIONS[resource] for pattern in (f"*.{extension}", f"*.{extension}?*")]
+    return patterns + blocked_urls
+
+
+class CookieSyncReport(NamedTuple):
+    """The (domain, path, name) keys of the cookies a 'transfer_driver_cookies_to_session' call added, changed and removed."""
+
+    added: list[tuple[str, str, str]]
+    changed: list[tuple[str, str, str]]
+    removed: list[tuple[str, str, str]]
+
+
+# Selenium takes a good part of a second to import, so it is only imported once a driver is
+# needed, and sessions that only make requests never pay for it.
+@functools.cache
+def _requestium_chrome_class() -> type[DriverMixin]:
+    from selenium import webdriver  # noqa: PLC0415
+
+    from .requestium_mixin import DriverMixin  # noqa: PLC0415
+
+    return type("RequestiumChrome", (DriverMixin, webdriver.Chrome), {})
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Build 'RequestiumChrome' on first access, as it needs selenium."""
+    if name == "RequestiumChrome":
+        return _requestium_chrome_class()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def _dump_session_cookie(cookie: Cookie) -> dict[str, Any]:
+    """Convert a requests cookie into the keyword arguments of 'requests.cookies.create_cookie', keeping all of its attributes."""
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "port": cookie.port,
+        "secure": cookie.secure,
+        "expires": cookie.expires,
+        "discard": cookie.discard,
+        "version": cookie.version,
+        "comment": cookie.comment,
+        "comment_url": cookie.comment_url,
+        "rest": cookie._rest,  # type: ignore[attr-defined] # noqa: SLF001
+        "rfc2109": cookie.rfc2109,
+    }
+
+
+def _to_session_cookie(cookie: dict[str, Any]) -> Cookie:
+    """Convert a webdriver cookie into a requests cookie, keeping all of its attributes."""
+    rest: dict[str, Any] = {}
+    if cookie.get("httpOnly"):
+        rest["HttpOnly"] = None
+    if cookie.get("sameSite"):
+        rest["SameSite"] = cookie["sameSite"]
+    return requests.cookies.create_cookie(
+        cookie["name"],
+        cookie["value"],
+        domain=cookie["domain"],
+        path=cookie.get("path", "/"),
+        secure=cookie.get("secure", False),
+        expires=cookie.get("expiry"),
+        rest=rest,
+    )
+
+
+def _cookie_visible_on(cookie: dict[str, Any], url: str) -> bool:
+    """Tell whether the webdriver lists a cookie on the page at 'url', which only has the cookies the page would be sent."""
+    parts = urllib.parse.urlsplit(url)
+    host, path = parts.hostname or "", parts.path or "/"
+    domain = cookie["domain"]
+    # Domain cookies are listed with a leading dot, host only cookies aren't sent to subdomains
+    if not (domain_match(host, domain) if domain.startswith(".") else host == domain.lower()):
+        return False
+    cookie_path = cookie.get("path", "/")
+    if path != cookie_path and not (path.startswith(cookie_path) and (cookie_path.endswith("/") or path[len(cookie_path)] == "/")):
+        return False
+    return not cookie.get("secure") or parts.scheme == "https"
 
 
 class Session(requests.Session):
@@ -27,6 +162,16 @@ class Session(requests.Session):
 
     Header and proxy transfer is done only one time when the driver process starts.
 
+    Instead of starting its own browser, the session can lease one from a 'driver_pool', which
+    gets it back when the session is closed.
+
+    Passing a 'cache' (an HTTPCache, a cache backend such as MemoryCache or SQLiteCache, or True
+    for an in-memory one) serves repeated GET and HEAD requests from it, following the responses'
+    caching headers.
+
+    Passing an 'instrumentation' (an Instrumentation, or True for one without sinks) times the
+    requests and the driver's work in named spans, summed up by 'stats()'.
+
     Some useful helper methods and object wrappings have been added.
     """
 
@@ -36,7 +181,9 @@ class Session(requests.Session):
         # Not currently supported by chromedriver. Choosing not to use plug-ins
         # for this as I don't want to worry about the extra dependencies and
         # plug-ins don't work in headless mode. :-(
-        chrome_options = webdriver.ChromeOptions()
+        from selenium.webdriver import ChromeOptions, ChromeService  # noqa: PLC0415
+
+        chrome_options = ChromeOptions()
 
         if headless:
             chrome_options.add_argument("headless=new")
@@ -56,10 +203,22 @@ class Session(requests.Session):
             for arg in self.webdriver_options["extensions"]:
                 chrome_options.add_extension(arg)
 
-        if "prefs" in self.webdriver_options:
-            prefs = self.webdriver_options["prefs"]
+        blocked_url_patterns = _blocked_url_patterns(self.webdriver_options)
+        prefs = {}
+        if "image" in self.webdriver_options.get("block_resources", []):
+            # Also blocks the images the url patterns miss, like those served without an extension
+            prefs["profile.managed_default_content_settings.images"] = 2
+        prefs.update(self.webdriver_options.get("prefs", {}))
+        if prefs:
             chrome_options.add_experimental_option("prefs", prefs)
 
+        if self.webdriver_options.get("record_network"):
+            # The performance log carries the devtools network events 'driver.record_network' reads
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+        if "page_load_strategy" in self.webdriver_options:
+            chrome_options.page_load_strategy = self.webdriver_options["page_load_strategy"]
+
         experimental_options = self.webdriver_options.get("experimental_options")
         if isinstance(experimental_options, dict):
             for name, value in experimental_options.items():
@@ -70,9 +229,21 @@ class Session(requests.Session):
         # initialized and passed in as a kwarg to RequestiumChrome so it can be passed in as a kwarg
         # when passed into webdriver.Chrome in super(DriverMixin, self).__init__(*args, **kwargs)
         service = ChromeService(executable_path=self.webdriver_path)
-        return RequestiumChrome(service=service, options=chrome_options, default_timeout=self.default_timeout)
+        driver = _requestium_chrome_class()(service=service, options=chrome_options, default_timeout=self.default_timeout)
 
-    def __init__(
+        # Chrome has no pref for blocking fonts, media or stylesheets, so we block them by url. That only
+        # covers the tab it's sent to, the first one here, and the tabs of the driver's TabPools.
+        if blocked_url_patterns:
+            driver._blocked_url_patterns = blocked_url_patterns  # noqa: SLF001
+            driver._block_urls_in_current_tab()  # noqa: SLF001
+        return driver
+
+    def _acquire_pooled_driver(self) -> DriverMixin:
+        driver = self._driver_pool.acquire()  # type: ignore[union-attr]
+        driver.default_timeout = self.default_timeout
+        return driver
+
+    def __init__(  # noqa: PLR0913
         self,
         *,
         webdriver_path: str | None = None,
@@ -80,6 +251,9 @@ class Session(requests.Session):
         default_timeout: float = 5,
         webdriver_options: dict[str, Any] | None = None,
         driver: DriverMixin | None = None,
+        driver_pool: DriverPool | None = None,
+        cache: HTTPCache | CacheBackend | bool | None = None,
+        instrumentation: Instrumentation | bool | None = None,
     ) -> None:
         super().__init__()
 
@@ -90,68 +264,271 @@ class Session(requests.Session):
         self.default_timeout = default_timeout
         self.webdriver_options = webdriver_options
         self._driver = driver
+        self._driver_pool = driver_pool
         self._last_requests_url: str | None = None
-
-        if not self._driver:
+        self._driver_cookies_seen: dict[tuple[str, str, str], dict[str, Any]] = {}
+        self._pending_driver_state: dict[str, Any] | None = None
+        # A jar that tells the index when to rebuild, instead of it comparing the jar's domains on every lookup
+        self.cookies = DomainTrackingCookieJar()
+        self._cookie_index = CookieDomainIndex(self.cookies)
+
+        if cache is True:
+            cache = HTTPCache()
+        elif isinstance(cache, CacheBackend):
+            cache = HTTPCache(cache)
+        self.cache: HTTPCache | None = cache or None
+
+        if instrumentation is True:
+            instrumentation = Instrumentation()
+        self.instrumentation: Instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+        if driver and driver_pool:
+            msg = "Can't use both a 'driver' and a 'driver_pool'"
+            raise ValueError(msg)
+
+        if driver_pool:
+            self._driver_initializer = self._acquire_pooled_driver
+        elif not self._driver:
             self._driver_initializer = functools.partial(self._start_chrome_browser, headless=headless)
         else:
-            for name in DriverMixin.__dict__:
-                name_private = name.startswith("__") and name.endswith("__")
-                name_function = isinstance(DriverMixin.__dict__[name], types.FunctionType)
-                name_in_driver = name in dir(self._driver)
-                if name_private or not name_function or name_in_driver:
-                    continue
-                self._driver.__dict__[name] = DriverMixin.__dict__[name].__get__(self._driver)
+            from .requestium_mixin import _add_mixin_methods  # noqa: PLC0415
+
+            _add_mixin_methods(self._driver)
             self._driver.default_timeout = self.default_timeout
+            self._driver.click_stats = self.click_stats
+            self._driver.instrumentation = self.instrumentation
+
+    def _restore_driver_state(self, state: dict[str, Any]) -> None:
+        from .requestium_mixin import _supports_cdp, _to_cdp_cookie  # noqa: PLC0415
+
+        driver = self.driver
+        if state["cookies"]:
+            # Devtools sets the cookies of every domain at once, without visiting them
+            if _supports_cdp(driver):
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_to_cdp_cookie(cookie) for cookie in state["cookies"]]})
+            else:
+                driver.ensure_add_cookies(state["cookies"])
+
+        # Storage can only be written from a page of its own site
+        for origin, storage in state["storage"].items():
+            driver.get(origin)
+            driver.execute_script(_WRITE_STORAGE_SCRIPT, storage["local"], storage["session"])
+
+    @functools.cached_property
+    def click_stats(self) -> ClickStats:
+        """The clicks of the session's driver, created on first use so sessions without a driver don't import selenium."""
+        from .requestium_mixin import ClickStats  # noqa: PLC0415
+
+        return ClickStats()
 
     @property
     def driver(self) -> DriverMixin:
         if self._driver is None:
-            self._driver = self._driver_initializer()
+            with self.instrumentation.span("driver.start", pooled=self._driver_pool is not None):
+                self._driver = self._driver_initializer()
+            # Count the driver's clicks and time its work in this session's stats, even if the driver outlives it in a pool
+            self._driver.click_stats = self.click_stats
+            self._driver.instrumentation = self.instrumentation
+            if self._pending_driver_state is not None:
+                state, self._pending_driver_state = self._pending_driver_state, None
+                self._restore_driver_state(state)
         return self._driver
 
+    def _read_driver_state(self) -> dict[str, Any]:
+        from .requestium_mixin import _from_cdp_cookie, _supports_cdp  # noqa: PLC0415
+
+        driver = self.driver
+        if _supports_cdp(driver):
+            cookies = [_from_cdp_cookie(cookie) for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]]
+        else:
+            cookies = driver.get_cookies()
+
+        storage = {}
+        page_storage = driver.execute_script(_READ_STORAGE_SCRIPT)
+        if page_storage and page_storage[0].startswith("http"):
+            origin, local_storage, session_storage = page_storage
+            storage[origin] = {"local": local_storage, "session": session_storage}
+        return {"cookies": cookies, "storage": storage}
+
+    def save_state(self, path: str | Path) -> None:
+        """
+        Save the session's cookies and headers, and its driver's cookies and storage, to a gzipped JSON file.
+
+        The driver's state is only saved if it is running, we don't start a browser for it. A state
+        loaded with 'load_state' and not yet restored into a driver is saved as it was.
+
+        Chromium based drivers save the cookies of every site, others only those of the current
+        site. The local and session storage are saved for the current site only.
+        """
+        driver_state = self._pending_driver_state
+        if self._driver is not None:
+            driver_state = self._read_driver_state()
+
+        state = {
+            "version": STATE_FORMAT_VERSION,
+            "cookies": [_dump_session_cookie(cookie) for cookie in self.cookies],
+            "headers": dict(self.headers),
+            "driver": driver_state,
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(state, file, separators=(",", ":"))
+
+    def load_state(self, path: str | Path) -> None:
+        """
+        Load a state saved with 'save_state' into the session.
+
+        The cookies and headers are loaded right away. The driver's cookies and storage are
+        restored into the running driver, or if there is none, when the driver is first used, so
+        loading a state doesn't start a browser.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            state = json.load(file)
+        if state.get("version") != STATE_FORMAT_VERSION:
+            msg = f"Unsupported session state version: {state.get('version')}"
+            raise ValueError(msg)
+
+        for cookie in state["cookies"]:
+            self.cookies.set_cookie(requests.cookies.create_cookie(**cookie))
+        self.headers.update(state["headers"])
+
+        if state["driver"] is not None:
+            if self._driver is None:
+                self._pending_driver_state = state["driver"]
+            else:
+                self._restore_driver_state(state["driver"])
+
+    def close(self) -> None:
+        """Close the session's connections, and return its driver if it was leased from a pool."""
+        super().close()
+        if self._driver_pool and self._driver is not None:
+            driver, self._driver = self._driver, None
+            self._driver_pool.release(driver)
+
     def transfer_session_cookies_to_driver(self, domain: str | None = None) -> None:
         """
         Copy the Session's cookies into the webdriver.
 
         Using the 'domain' parameter we choose the cookies we wish to transfer, we only
-        transfer the cookies which belong to that domain. The domain defaults to our last visited
-        site if not provided.
+        transfer the cookies which belong to that domain, its subdomains or its parent domains.
+        The domain defaults to our last visited site if not provided. Expired cookies are skipped.
         """
         if not domain and self._last_requests_url:
-            domain = tldextract.extract(self._last_requests_url).top_domain_under_public_suffix
+            domain = registered_domain(self._last_requests_url)
 
         if not domain:
+            from selenium.common import InvalidCookieDomainException  # noqa: PLC0415
+
             msg = "Trying to transfer cookies to selenium without specifying a domain and without having visited any page in the current session"
             raise InvalidCookieDomainException(msg)
 
+        # The jar can be replaced, Eg.: 'session.cookies = jar'
+        if self._cookie_index.jar is not self.cookies:
+            self._cookie_index = CookieDomainIndex(self.cookies)
+
         # Transfer cookies
-        for c in [c for c in self.cookies if domain in c.domain]:
+        cookies = []
+        for c in self._cookie_index.cookies_for(domain):
+            if c.is_expired():
+                continue
             cookie = {"name": c.name, "value": c.value, "path": c.path, "expiry": c.expires, "domain": c.domain}
+            cookies.append({k: v for k, v in cookie.items() if v is not None})
+
+        self.driver.ensure_add_cookies(cookies)
 
-            self.driver.ensure_add_cookie({k: v for k, v in cookie.items() if v is not None})
+    def transfer_driver_cookies_to_session(self, *, copy_user_agent: bool | None = True, full: bool = False) -> CookieSyncReport:
+        """
+        Copy the webdriver's cookies into the Session.
+
+        We remember the driver's cookies from the last transfer, and only apply what changed since
+        then: new cookies and cookies with new values or attributes are set, and cookies the driver
+        no longer has are removed from the Session. The driver only lists the cookies of the page
+        it's on, so cookies of other sites (or paths) it visited before are left alone. Cookies the
+        Session lost in the meantime (Eg.: because its jar was cleared) are set again. Passing 'full'
+        copies every cookie regardless.
 
-    def transfer_driver_cookies_to_session(self, *, copy_user_agent: bool | None = True) -> None:
+        Cookies keep their path, expiry, secure and httpOnly attributes. Returns a report of the
+        (domain, path, name) keys that were added, changed and removed.
+        """
         if copy_user_agent:
             self.copy_user_agent_from_driver()
 
-        for cookie in self.driver.get_cookies():
-            self.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"])
+        previous_cookies = {} if full else self._driver_cookies_seen
+        driver_cookies = {(c["domain"], c.get("path", "/"), c["name"]): c for c in self.driver.get_cookies()}
+        current_url = self.driver.current_url
+        # The cookies we saw on other pages, which the driver doesn't list here, but may still have
+        hidden_cookies = {
+            key: cookie for key, cookie in self._driver_cookies_seen.items() if key not in driver_cookies and not _cookie_visible_on(cookie, current_url)
+        }
+        session_values = {(c.domain, c.path, c.name): c.value for c in self.cookies}
+
+        report = CookieSyncReport([], [], [])
+        for key, cookie in driver_cookies.items():
+            previous_cookie = previous_cookies.get(key)
+            if previous_cookie == cookie and session_values.get(key) == cookie["value"]:
+                continue
+            self.cookies.set_cookie(_to_session_cookie(cookie))
+            (report.added if previous_cookie is None else report.changed).append(key)
+
+        for key in previous_cookies.keys() - driver_cookies.keys() - hidden_cookies.keys():
+            with contextlib.suppress(KeyError):
+                self.cookies.clear(*key)
+            report.removed.append(key)
+
+        self._driver_cookies_seen = {**hidden_cookies, **driver_cookies}
+        return report
+
+    def request(self, method: str, url: str | bytes, *args, **kwargs) -> RequestiumResponse:  # type: ignore[override]
+        """
+        Send a request, wrapping its response in a RequestiumResponse.
 
-    def get(self, *args, **kwargs) -> RequestiumResponse:
-        resp = super().get(*args, **kwargs)
+        Every verb method ('get', 'post', 'head', etc.) goes through here, so all of them return
+        responses with xpath, css and re methods and remember the url for the cookie transfer.
+        """
+        with self.instrumentation.span("http.request", method=method, url=url) as attributes:
+            resp = super().request(method, url, *args, **kwargs)
+            attributes["status"] = resp.status_code
+            if getattr(resp, "from_cache", False):
+                attributes["from_cache"] = True
+                self.instrumentation.count("http.cache_hits")
         self._last_requests_url = resp.url
-        return RequestiumResponse(resp)
+        response = RequestiumResponse(resp)
+        if self.instrumentation.enabled:
+            response._instrumentation = self.instrumentation  # noqa: SLF001
+        return response
 
-    def post(self, *args, **kwargs) -> RequestiumResponse:
-        resp = super().post(*args, **kwargs)
-        self._last_requests_url = resp.url
-        return RequestiumResponse(resp)
+    def get(self, url: str | bytes, params: Any = None, **kwargs) -> RequestiumResponse:  # noqa: ANN401
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("GET", url, params=params, **kwargs)
 
-    def put(self, *args, **kwargs) -> RequestiumResponse:
-        resp = super().put(*args, **kwargs)
-        self._last_requests_url = resp.url
-        return RequestiumResponse(resp)
+    def options(self, url: str | bytes, **kwargs) -> RequestiumResponse:
+        kwargs.setdefault("allow_redirects", True)
+        return self.request("OPTIONS", url, **kwargs)
+
+    def head(self, url: str | bytes, **kwargs) -> RequestiumResponse:
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str | bytes, data: Any = None, json: Any = None, **kwargs) -> RequestiumResponse:  # noqa: ANN401
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+    def put(self, url: str | bytes, data: Any = None, **kwargs) -> RequestiumResponse:  # noqa: ANN401
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def patch(self, url: str | bytes, data: Any = None, **kwargs) -> RequestiumResponse:  # noqa: ANN401
+        return self.request("PATCH", url, data=data, **kwargs)
+
+    def delete(self, url: str | bytes, **kwargs) -> RequestiumResponse:
+        return self.request("DELETE", url, **kwargs)
+
+    def stats(self) -> InstrumentationStats:
+        """Summarize the spans and counters of the session's instrumentation, which are empty unless it was given one."""
+        return self.instrumentation.stats()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        """Send a prepared request, answering it from the session's cache if it has one."""
+        if self.cache is None:
+            return super().send(request, **kwargs)
+        return self.cache.send(request, functools.partial(super().send, **kwargs), stream=kwargs.get("stream", False))
 
     def copy_user_agent_from_driver(self) -> None:
         """
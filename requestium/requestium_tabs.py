@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import time
+from typing import TYPE_CHECKING, Any
+
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from types import TracebackType
+
+    from parsel.selector import Selector, SelectorList
+    from selenium.webdriver.common.by import ByType
+    from selenium.webdriver.remote.webelement import WebElement
+
+    from .requestium_mixin import DriverMixin
+    from .requestium_schema import ExtractionSchema
+
+# Navigates without waiting for the page, flagging the old document so we can tell when it's gone
+_LOAD_SCRIPT = "window.__requestiumTabLoading = true; window.location.href = arguments[0];"
+
+# True once the new document replaced the flagged one and reached the ready state in arguments[0]
+_READY_SCRIPT = """
+var states = ["loading", "interactive", "complete"];
+return !window.__requestiumTabLoading && states.indexOf(document.readyState) >= states.indexOf(arguments[0]);
+"""
+
+# How long we wait between rounds of checks on the tabs that are loading
+_POLL_INTERVAL: float = 0.05
+
+
+class Tab:
+    """
+    One of the browser tabs of a TabPool.
+
+    The tab's methods switch the driver to it (only if it isn't already the current window) and
+    run the driver's method of the same name there, so 'tab.ensure_element' and 'tab.xpath'
+    work against the tab's page whichever tab the driver was on. The 'url' is the last one
+    loaded, and 'timed_out' tells whether that load was stopped after the pool's 'timeout'.
+    """
+
+    def __init__(self, pool: TabPool, handle: str) -> None:
+        self.pool = pool
+        self.handle = handle
+        self.url: str | None = None
+        self.timed_out = False
+        self._load_started: float | None = None
+
+    def load(self, url: str) -> None:
+        """Start loading 'url' in the tab and return right away, without waiting for the page."""
+        self.url = url
+        self.timed_out = False
+        if url.startswith("data:"):
+            # Browsers don't let scripts navigate to data urls, these load without the network anyway
+            self._load_started = None
+            self.pool.run(self, self.pool.driver.get, url)
+            return
+        self._load_started = time.monotonic()
+        self.pool.run(self, self.pool.driver.execute_script, _LOAD_SCRIPT, url)
+
+    def is_ready(self) -> bool:
+        """Tell whether the page the tab is loading is ready, stopping it if it took longer than the pool's 'timeout'."""
+        if self._load_started is None:
+            return True
+        # Don't go through the driver's own 'execute_script', checking the page doesn't change it
+        if self.pool.run(self, RemoteWebDriver.execute_script, self.pool.driver, _READY_SCRIPT, self.pool.ready_state):
+            self._load_started = None
+        elif time.monotonic() - self._load_started >= self.pool.timeout:
+            self.pool.run(self, RemoteWebDriver.execute_script, self.pool.driver, "window.stop();")
+            self._load_started = None
+            self.timed_out = True
+        return self._load_started is None
+
+    def wait(self) -> Tab:
+        """Wait until the page the tab is loading is ready, or for the pool's 'timeout'."""
+        while not self.is_ready():
+            time.sleep(_POLL_INTERVAL)
+        return self
+
+    def ensure_element(self, locator: ByType | str, selector: str, *args, **kwargs) -> WebElement | None:
+        return self.pool.run(self, self.pool.driver.ensure_element, locator, selector, *args, **kwargs)
+
+    def ensure_elements(self, conditions: dict[str, tuple[ByType | str, str] | tuple[ByType | str, str, str]], *args, **kwargs) -> dict[str, WebElement | None]:
+        return self.pool.run(self, self.pool.driver.ensure_elements, conditions, *args, **kwargs)
+
+    def execute_script(self, script: str, *args) -> Any:  # noqa: ANN401
+        return self.pool.run(self, self.pool.driver.execute_script, script, *args)
+
+    @property
+    def selector(self) -> Selector:
+        """Returns the current state of the tab's page in a Selector, like the driver's 'selector'."""
+        # Through the method behind the driver's 'selector' property, as drivers given to a Session only get our methods
+        return self.pool.run(self, self.pool.driver._current_selector)  # noqa: SLF001
+
+    def extract(self, schema: ExtractionSchema | dict[str, Any]) -> dict[str, Any]:
+        return self.pool.run(self, self.pool.driver.extract, schema)
+
+    def xpath(self, *args, **kwargs) -> SelectorList[Selector]:
+        return self.selector.xpath(*args, **kwargs)
+
+    def css(self, *args, **kwargs) -> SelectorList[Selector]:
+        return self.selector.css(*args, **kwargs)
+
+    def re(self, *args, **kwargs) -> list[str]:
+        return self.selector.re(*args, **kwargs)
+
+    def re_first(self, *args, **kwargs) -> str | None:
+        return self.selector.re_first(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        """Show the tab's window handle and url."""
+        return f"<Tab {self.handle} url={self.url!r}>"
+
+
+class TabPool:
+    """
+    Loads pages in several tabs of one browser at the same time.
+
+    A driver loads a single page at a time, waiting for each one before going on, while the
+    browser could be loading many of them. The pool opens 'size' tabs and 'as_loaded' starts a
+    page in each tab without waiting for it, then hands out the tabs as their pages become ready,
+    so the loads overlap and we get several pages per browser in the time of one. A tab's page
+    is ready when its document reaches the 'ready_state', which defaults to 'complete', or to
+    'interactive' for drivers started with the 'eager' or 'none' page load strategy. Pages that
+    take longer than 'timeout' seconds are stopped and handed out with their 'timed_out' set.
+
+    The driver has a single current window, so the pool keeps track of it and only switches
+    windows when a tab other than the current one is used, discarding the driver's page
+    snapshot when it does. Tabs that got closed under us (Eg.: by the page, or by a renderer
+    crash) are reopened and their page loaded again, once, before the call is retried.
+
+    A driver must only be used by one thread at a time, and so must its pool. Closing the pool
+    closes its tabs and switches the driver back to the window it was on.
+    """
+
+    _current_window: str | None  # None while it's unknown, Eg.: during a switch
+
+    def _new_window(self) -> str:
+        # Selenium's 'switch_to.new_window' switches to the window too, we only need its handle
+        return self.driver.execute(Command.NEW_WINDOW, {"type": "tab"})["value"]["handle"]
+
+    def _switch_to(self, tab: Tab) -> None:
+        if self._current_window == tab.handle:
+            return
+        self._current_window = None  # Unknown until the switch succeeds
+        self.driver.switch_to.window(tab.handle)
+        self._current_window = tab.handle
+        self.driver.invalidate_selector()
+        self.driver.instrumentation.count("tabs.switches")
+
+    def _block_urls(self, tab: Tab) -> None:
+        # The urls the driver blocks are blocked per tab, so they must be blocked in each of ours too
+        if getattr(self.driver, "_blocked_url_patterns", None):
+            self._switch_to(tab)
+            self.driver._block_urls_in_current_tab()  # noqa: SLF001
+
+    def __init__(self, driver: DriverMixin, size: int, *, timeout: float = 30, ready_state: str | None = None) -> None:
+        if size < 1:
+            msg = f"The pool 'size' must be at least 1, not {size}"
+            raise ValueError(msg)
+        if ready_state is None:
+            ready_state = "interactive" if driver.caps.get("pageLoadStrategy") in {"eager", "none"} else "complete"
+        if ready_state not in {"loading", "interactive", "complete"}:
+            msg = f"The 'ready_state' argument must be 'loading', 'interactive' or 'complete', not '{ready_state}'"
+            raise ValueError(msg)
+
+        self.driver = driver
+        self.timeout = timeout
+        self.ready_state = ready_state
+        self._original_window: str | None = driver.current_window_handle
+        self._current_window = self._original_window
+        self.tabs = [Tab(self, self._new_window()) for _ in range(size)]
+        for tab in self.tabs:
+            self._block_urls(tab)
+
+    def _reopen(self, tab: Tab) -> None:
+        self._current_window = None
+        tab.handle = self._new_window()
+        self._block_urls(tab)
+        self.driver.instrumentation.count("tabs.reopened")
+        if tab.url is not None:
+            tab.load(tab.url)
+            tab.wait()
+
+    def run(self, tab: Tab, function: Callable[..., Any], *args, **kwargs) -> Any:  # noqa: ANN401
+        """Call 'function' with the driver switched to 'tab', reopening the tab and trying again if its window was closed."""
+        try:
+            self._switch_to(tab)
+            return function(*args, **kwargs)
+        except NoSuchWindowException:
+            self._reopen(tab)
+        self._switch_to(tab)
+        return function(*args, **kwargs)
+
+    def _next_ready(self, loading: list[Tab]) -> Tab:
+        # Check the current tab first, it saves a switch, then the rest in the order they started loading
+        while True:
+            for tab in sorted(loading, key=lambda tab: tab.handle != self._current_window):
+                if tab.is_ready():
+                    return tab
+            time.sleep(_POLL_INTERVAL)
+
+    def as_loaded(self, urls: Iterable[str]) -> Iterator[Tab]:
+        """
+        Load the 'urls' in the pool's tabs, yielding each tab once its page is ready.
+
+        The pages are yielded as they become ready, not in the order of the 'urls'. A yielded tab
+        is ours until we ask for the next one, when it gets the next url to load, so its page
+        must be used (or its 'url' noted) before moving on. Only as many urls as there are tabs
+        are taken ahead, so 'urls' may be a generator.
+        """
+        urls = iter(urls)
+        idle = collections.deque(self.tabs)
+        loading: list[Tab] = []
+        while True:
+            while idle and (url := next(urls, None)) is not None:
+                tab = idle.popleft()
+                tab.load(url)
+                loading.append(tab)
+            if not loading:
+                return
+            tab = self._next_ready(loading)
+            loading.remove(tab)
+            yield tab
+            idle.append(tab)
+
+    def close(self) -> None:
+        """Close the pool's tabs and switch the driver back to the window it was on."""
+        for tab in self.tabs:
+            with contextlib.suppress(NoSuchWindowException):
+                self._switch_to(tab)
+                self.driver.close()
+        self.tabs = []
+        if self._original_window is not None:
+            with contextlib.suppress(WebDriverException):
+                self.driver.switch_to.window(self._original_window)
+        self._current_window = self._original_window
+        self.driver.invalidate_selector()
+
+    def __getitem__(self, index: int) -> Tab:
+        """Get one of the pool's tabs."""
+        return self.tabs[index]
+
+    def __iter__(self) -> Iterator[Tab]:
+        """Iterate over the pool's tabs."""
+        return iter(self.tabs)
+
+    def __len__(self) -> int:
+        """Return the amount of tabs in the pool."""
+        return len(self.tabs)
+
+    def __enter__(self) -> TabPool:
+        """Use the pool as a context manager, closing it on exit."""
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        """Close the pool's tabs."""
+        self.close()
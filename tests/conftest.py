@@ -1,6 +1,9 @@
+import collections
 import contextlib
+import urllib.parse
 from collections.abc import Generator
-from typing import TYPE_CHECKING, cast
+from http.server import BaseHTTPRequestHandler
+from typing import TYPE_CHECKING, ClassVar, cast
 
 import pytest
 import urllib3.exceptions
@@ -12,6 +15,8 @@ from selenium.webdriver.support.wait import WebDriverWait
 
 import requestium
 
+from .support import serve
+
 if TYPE_CHECKING:
     from requestium.requestium_mixin import DriverMixin
 
@@ -34,6 +39,54 @@ def example_html() -> str:
     """
 
 
+class LocalHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request with a small html page echoing its method and path.
+
+    The 'cache_control', 'etag' and 'last_modified' query parameters are sent back as the response's
+    caching headers, and matching conditional requests get a '304 Not Modified'. Requests are
+    counted by path in 'requests_served'.
+    """
+
+    protocol_version = "HTTP/1.1"
+    requests_served: ClassVar[collections.Counter[str]] = collections.Counter()
+
+    def handle_any(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.requests_served[self.path] += 1
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(self.path).query))
+        caching_headers = {
+            name: query[parameter]
+            for name, parameter in (("Cache-Control", "cache_control"), ("ETag", "etag"), ("Last-Modified", "last_modified"))
+            if parameter in query
+        }
+        not_modified = (query.get("etag") and self.headers.get("If-None-Match") == query["etag"]) or (
+            query.get("last_modified") and self.headers.get("If-Modified-Since") == query["last_modified"]
+        )
+        body = b"" if not_modified else f"<html><body><h1>{self.command} {self.path}</h1></body></html>".encode()
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in caching_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = handle_any  # noqa: N815
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="session")
+def local_server() -> Generator[str, None, None]:
+    """Serve LocalHandler on a free local port, yielding its base url."""
+    with serve(LocalHandler) as url:
+        yield url
+
+
 def _create_chrome_driver(*, headless: bool) -> webdriver.Chrome:
     options = webdriver.ChromeOptions()
     options.add_argument("--no-sandbox")
@@ -0,0 +1,320 @@
+"""
+Offline stand-ins shared by the tests and the benchmarks: a local http server helper and a fake WebDriver remote end.
+
+The fake remote end answers the WebDriver protocol like chromedriver would, so real selenium
+and requestium code runs against it, without a browser, and its command count tells how many
+round trips to the browser an operation costs.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import itertools
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from requestium.requestium_mixin import DriverMixin
+
+# The key selenium reads element references from in the protocol's json
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+BLANK_PAGE = "<html><head></head><body></body></html>"
+
+FAKE_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) FakeRemoteEnd/1.0"
+
+
+def listing_page(items: int) -> str:
+    """Build a product listing like the ones crawls parse, with 'items' entries of a few fields each."""
+    rows = "".join(
+        f"<li class='item' data-id='{i}'><a href='/item/{i}'>Item {i}</a><span class='price'>${i}.99</span><p>Description of item {i}</p></li>"
+        for i in range(items)
+    )
+    return f"<html><head><title>Listing</title></head><body><h1>Listing</h1><ul>{rows}</ul></body></html>"
+
+
+@contextlib.contextmanager
+def serve(handler_class: type[BaseHTTPRequestHandler]) -> Iterator[str]:
+    """Serve 'handler_class' on a free local port in a background thread, yielding its base url."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# The commands that work while the current window is closed, the ones to get out of it
+_WINDOWLESS_COMMANDS = {("POST", ""), ("DELETE", ""), ("GET", "window/handles"), ("POST", "window/new"), ("POST", "window")}
+
+
+class _CommandError(Exception):
+    def __init__(self, status: int, error: str, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.error = error
+
+
+class FakeRemoteEnd:
+    """
+    A scriptable stand-in for a browser's WebDriver remote end, served over http in process.
+
+    It keeps the state the tests and benchmarks need: the windows and their urls, the page
+    sources set in 'pages' (other urls load a blank page), the cookies, and the elements made to
+    appear with 'reveal'. Async scripts called with requestium's element wait arguments get their
+    answer as soon as the element appears, like the MutationObserver script in a browser. The
+    devtools commands 'Network.setCookies' and 'Network.getAllCookies' are understood, the
+    patterns of 'Network.setBlockedURLs' are kept by window in 'blocked_urls', and every other
+    script returns null, except for reading the user agent and requestium's tab loading scripts.
+
+    Each command is counted in 'commands' (and by name in 'command_counts'), and takes 'latency'
+    seconds on top of the http round trip, to mimic a browser's response times. Pages take
+    'load_time' seconds to load: 'driver.get' blocks for that long, while the pages tabs load by
+    script become ready that long after, each window loading on its own.
+    """
+
+    def __init__(self, latency: float = 0.0, load_time: float = 0.0) -> None:
+        self.latency = latency
+        self.load_time = load_time
+        self.pages: dict[str, str] = {}
+        self.cookies: list[dict[str, Any]] = []
+        self.blocked_urls: dict[str, list[str]] = {}
+        self.windows: dict[str, str] = {"main": "about:blank"}
+        self.window = "main"
+        self.commands = 0
+        self.command_counts: collections.Counter[tuple[str, str]] = collections.Counter()
+        self._ready_at: dict[str, float] = {}
+        self._window_counter = itertools.count(1)
+        self._elements: dict[tuple[str, str], float] = {}
+        self._element_counter = itertools.count()
+        self._lock = threading.Condition()
+        self._server = contextlib.ExitStack()
+        self.url = ""
+
+    @property
+    def current_url(self) -> str:
+        return self.windows.get(self.window, "about:blank")
+
+    @current_url.setter
+    def current_url(self, url: str) -> None:
+        self.windows[self.window] = url
+
+    def close_window(self, handle: str) -> None:
+        """Close a window behind the driver's back, like a page closing itself or a crashed tab."""
+        self.windows.pop(handle, None)
+
+    def reveal(self, locator: str, selector: str, after: float = 0.0) -> None:
+        """Make the element found by (locator, selector) appear 'after' seconds from now."""
+        with self._lock:
+            self._elements[locator, selector] = time.monotonic() + after
+            self._lock.notify_all()
+
+    def hide(self, locator: str, selector: str) -> None:
+        with self._lock:
+            self._elements.pop((locator, selector), None)
+
+    def start(self) -> str:
+        remote = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and the body go out in separate writes, which Nagle's algorithm would hold up to 40 ms
+            disable_nagle_algorithm = True
+
+            def handle_any(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    status, value = 200, remote.handle(self.command, self.path, json.loads(body) if body else {})
+                except _CommandError as e:
+                    status, value = e.status, {"error": e.error, "message": str(e), "stacktrace": ""}
+                payload = json.dumps({"value": value}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_DELETE = handle_any  # noqa: N815
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.url = self._server.enter_context(serve(Handler))
+        return self.url
+
+    def stop(self) -> None:
+        self._server.close()
+
+    def _find_element(self, locator: tuple[str, str]) -> dict[str, str]:
+        with self._lock:
+            appears_at = self._elements.get(locator)
+            if appears_at is None or appears_at > time.monotonic():
+                raise _CommandError(404, "no such element", f"Unable to locate element: {locator}")
+            return {ELEMENT_KEY: f"element-{next(self._element_counter)}"}
+
+    def _wait_for_element(self, locator: tuple[str, str], timeout: float) -> list[Any]:
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                appears_at = self._elements.get(locator)
+                now = time.monotonic()
+                if appears_at is not None and appears_at <= now:
+                    return [True, {ELEMENT_KEY: f"element-{next(self._element_counter)}"}]
+                if now >= deadline:
+                    return [False, None]
+                self._lock.wait(min(deadline, appears_at or deadline) - now)
+
+    def _execute(self, script: str, args: list[Any], *, is_async: bool) -> Any:  # noqa: ANN401
+        # requestium's mutation wait script takes [[locator, selector, state], timeout in ms]
+        if is_async and len(args) == 2 and isinstance(args[0], list) and len(args[0]) == 3:
+            (locator, selector, _state), timeout = args
+            return self._wait_for_element((locator, selector), timeout / 1000)
+        if "navigator.userAgent" in script:
+            return FAKE_USER_AGENT
+        if "__requestiumTabLoading = true" in script:
+            self.current_url = args[0]
+            self._ready_at[self.window] = time.monotonic() + self.load_time
+            return None
+        if "document.readyState" in script:
+            return time.monotonic() >= self._ready_at.get(self.window, 0)
+        return None
+
+    def _add_cookie(self, cookie: dict[str, Any]) -> None:
+        cookie = {"path": "/", "domain": urllib.parse.urlsplit(self.current_url).hostname or "", **cookie}
+        key = (cookie["domain"], cookie["path"], cookie["name"])
+        self.cookies = [c for c in self.cookies if (c["domain"], c["path"], c["name"]) != key]
+        self.cookies.append(cookie)
+
+    def _page_cookies(self) -> list[dict[str, Any]]:
+        # Like a browser, only list the cookies of the current page's host
+        host = urllib.parse.urlsplit(self.current_url).hostname or ""
+        return [c for c in self.cookies if host == c["domain"].lstrip(".") or host.endswith("." + c["domain"].lstrip("."))]
+
+    def _cdp(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
+        if command == "Network.setCookies":
+            for cookie in params["cookies"]:
+                self._add_cookie({name: cookie[name] for name in ("name", "value", "domain", "path") if name in cookie})
+            return {}
+        if command == "Network.setBlockedURLs":
+            self.blocked_urls[self.window] = params["urls"]
+            return {}
+        if command == "Network.getAllCookies":
+            return {"cookies": [dict(cookie, session=True) for cookie in self.cookies]}
+        return {}
+
+    def handle(self, method: str, path: str, body: dict[str, Any]) -> Any:  # noqa: ANN401, C901, PLR0911, PLR0912
+        """Answer a WebDriver command, returning the 'value' of its response."""
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = path.strip("/").split("/")[2:]  # Drop "session/<id>"
+        command = (method, "/".join(part if i != 1 or parts[0] not in {"element", "cookie"} else "*" for i, part in enumerate(parts)))
+        self.command_counts[command] += 1
+        if self.window not in self.windows and command not in _WINDOWLESS_COMMANDS:
+            raise _CommandError(404, "no such window", "no such window: target window already closed")
+        match command:
+            case ("POST", ""):
+                return {"sessionId": "fake", "capabilities": {"browserName": "fake", "browserVersion": "1.0", "platformName": "linux"}}
+            case ("DELETE", ""):
+                return None
+            case ("POST", "url"):
+                time.sleep(self.load_time)
+                self.current_url = body["url"]
+                return None
+            case ("GET", "url"):
+                return self.current_url
+            case ("GET", "source"):
+                return self.pages.get(self.current_url, BLANK_PAGE)
+            case ("GET", "title"):
+                return ""
+            case ("POST", "back" | "forward" | "refresh" | "timeouts") | ("POST", "element/*/click"):
+                return None
+            case ("GET", "window"):
+                return self.window
+            case ("GET", "window/handles"):
+                return list(self.windows)
+            case ("POST", "window/new"):
+                handle = f"tab-{next(self._window_counter)}"
+                self.windows[handle] = "about:blank"
+                return {"handle": handle, "type": "tab"}
+            case ("POST", "window"):
+                if body["handle"] not in self.windows:
+                    raise _CommandError(404, "no such window", f"no such window: {body['handle']}")
+                self.window = body["handle"]
+                return None
+            case ("DELETE", "window"):
+                del self.windows[self.window]
+                return list(self.windows)
+            case ("GET", "cookie"):
+                return self._page_cookies()
+            case ("POST", "cookie"):
+                self._add_cookie(body["cookie"])
+                return None
+            case ("DELETE", "cookie"):
+                self.cookies = []
+                return None
+            case ("DELETE", "cookie/*"):
+                self.cookies = [c for c in self.cookies if c["name"] != parts[1]]
+                return None
+            case ("POST", "element"):
+                return self._find_element((body["using"], body["value"]))
+            case ("POST", "elements"):
+                with contextlib.suppress(_CommandError):
+                    return [self._find_element((body["using"], body["value"]))]
+                return []
+            case ("GET", "element/*/displayed" | "element/*/enabled"):
+                return True
+            case ("POST", "execute/sync" | "execute/async"):
+                return self._execute(body["script"], body.get("args", []), is_async=command[1] == "execute/async")
+            case ("POST", "goog/cdp/execute"):
+                return self._cdp(body["cmd"], body.get("params", {}))
+        raise _CommandError(404, "unknown command", f"Unknown command: {method} {path}")
+
+    def driver(self, *, cdp: bool = False, plain: bool = False) -> DriverMixin:
+        """
+        Connect a requestium driver to the remote end.
+
+        With 'cdp' the driver has chrome's 'execute_cdp_cmd', so requestium takes its devtools
+        paths, as it would with a chrome driver. With 'plain' it's a selenium driver instead, to be
+        given to a Session like drivers created outside of requestium are.
+        """
+        from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection  # noqa: PLC0415
+        from selenium.webdriver.common.options import ArgOptions  # noqa: PLC0415
+        from selenium.webdriver.remote.client_config import ClientConfig  # noqa: PLC0415
+        from selenium.webdriver.remote.remote_connection import RemoteConnection  # noqa: PLC0415
+        from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver  # noqa: PLC0415
+
+        from requestium.requestium_mixin import DriverMixin  # noqa: PLC0415
+
+        if plain:
+            return RemoteWebDriver(command_executor=RemoteConnection(client_config=ClientConfig(remote_server_addr=self.url)), options=ArgOptions())  # type: ignore[return-value]
+        if not cdp:
+            return DriverMixin(command_executor=RemoteConnection(client_config=ClientConfig(remote_server_addr=self.url)), options=ArgOptions())
+
+        class FakeChrome(DriverMixin):
+            def execute_cdp_cmd(self, cmd: str, cmd_args: dict[str, Any]) -> dict[str, Any]:
+                return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+        connection = ChromiumRemoteConnection(
+            remote_server_addr=self.url, vendor_prefix="goog", browser_name="chrome", client_config=ClientConfig(remote_server_addr=self.url)
+        )
+        return FakeChrome(command_executor=connection, options=ArgOptions())
+
+    def __enter__(self) -> FakeRemoteEnd:
+        """Serve the remote end for the duration of the 'with' block."""
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop serving."""
+        self.stop()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+import requests
+
+import requestium.requestium
+
+
+def test_async_session_verbs(local_server: str) -> None:
+    async def run() -> None:
+        async with requestium.AsyncSession() as session:
+            response = await session.get(f"{local_server}/page")
+            assert response.xpath("//h1/text()").get() == "GET /page"
+            response = await session.post(f"{local_server}/form", data={"field": "value"})
+            assert response.css("h1::text").get() == "POST /form"
+            response = await session.put(f"{local_server}/item")
+            assert response.re_first(r"PUT /\w+") == "PUT /item"
+            response = await session.head(f"{local_server}/item")
+            assert response.status_code == 200
+            assert session.session._last_requests_url == f"{local_server}/item"
+
+    asyncio.run(run())
+
+
+def test_async_session_gather(local_server: str) -> None:
+    async def run() -> None:
+        async with requestium.AsyncSession(max_concurrency=4) as session:
+            urls = [f"{local_server}/page/{i}" for i in range(50)]
+            responses = await session.gather([*urls, {"url": f"{local_server}/form", "method": "POST"}, {"url": f"{local_server}/item", "method": "DELETE"}])
+            assert [response.xpath("//h1/text()").get() for response in responses] == [
+                *(f"GET /page/{i}" for i in range(50)),
+                "POST /form",
+                "DELETE /item",
+            ]
+
+    asyncio.run(run())
+
+
+def test_async_session_gather_return_exceptions(local_server: str) -> None:
+    async def run() -> None:
+        async with requestium.AsyncSession() as session:
+            responses = await session.gather([f"{local_server}/page", "http://127.0.0.1:1/unreachable"], return_exceptions=True)
+            assert responses[0].status_code == 200
+            assert isinstance(responses[1], requests.ConnectionError)
+
+    asyncio.run(run())
+
+
+def test_async_session_shares_cookie_jar() -> None:
+    session = requestium.Session()
+    async_session = requestium.AsyncSession(session=session)
+    async_session.cookies.set("session_id", "abc123", domain="example.com")
+    assert session.cookies.get("session_id") == "abc123"
+
+    with pytest.raises(TypeError, match="Can't pass Session arguments when wrapping an existing session"):
+        requestium.AsyncSession(session=session, headless=True)
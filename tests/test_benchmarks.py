@@ -0,0 +1,51 @@
+from collections.abc import Generator
+
+import pytest
+
+import requestium
+from benchmarks.__main__ import compare
+
+from .support import FakeRemoteEnd, listing_page
+
+
+@pytest.fixture
+def remote() -> Generator[FakeRemoteEnd, None, None]:
+    with FakeRemoteEnd() as remote:
+        yield remote
+
+
+@pytest.mark.parametrize("cdp", [False, True])
+def test_fake_remote_end_drives_requestium(remote: FakeRemoteEnd, *, cdp: bool) -> None:
+    remote.pages["http://site.com/"] = listing_page(3)
+    driver = remote.driver(cdp=cdp)
+    session = requestium.Session(driver=driver)
+    try:
+        driver.get("http://site.com/")
+        assert driver.xpath("//li/a/text()").getall() == ["Item 0", "Item 1", "Item 2"]
+
+        remote.reveal("css selector", "#late", after=0.05)
+        assert driver.ensure_element("css selector", "#late", engine="mutation", timeout=2) is not None
+
+        session.cookies.set("token", "secret", domain="site.com")
+        session.transfer_session_cookies_to_driver("site.com")
+        assert [(cookie["name"], cookie["value"]) for cookie in remote.cookies] == [("token", "secret")]
+
+        session.cookies.clear()
+        report = session.transfer_driver_cookies_to_session()
+        assert report.added == [("site.com", "/", "token")]
+        assert session.cookies["token"] == "secret"
+    finally:
+        driver.quit()
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {"parsing": {"response_parse_ms": 10.0, "cached_selector_queries_per_s": 100.0}, "waits": {"poll_latency_ms": 400.0}}
+    results = {"parsing": {"response_parse_ms": 12.0, "cached_selector_queries_per_s": 200.0}, "imports": {"import_ms": 20.0}}
+
+    comparison = compare(results, baseline, max_regression=0.1)
+
+    assert comparison.keys() == {"parsing.response_parse_ms", "parsing.cached_selector_queries_per_s"}
+    assert comparison["parsing.response_parse_ms"]["slowdown"] == pytest.approx(0.2)
+    assert comparison["parsing.response_parse_ms"]["regression"]
+    assert comparison["parsing.cached_selector_queries_per_s"]["slowdown"] == pytest.approx(-0.5)
+    assert not comparison["parsing.cached_selector_queries_per_s"]["regression"]
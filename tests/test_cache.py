@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import pytest
+
+import requestium.requestium
+
+from .conftest import LocalHandler
+
+
+def test_cache_serves_fresh_responses(local_server: str) -> None:
+    path = "/fresh?cache_control=max-age%3D60"
+    with requestium.Session(cache=True) as session:
+        first = session.get(f"{local_server}{path}")
+        second = session.get(f"{local_server}{path}")
+
+    assert LocalHandler.requests_served[path] == 1
+    assert not first.from_cache
+    assert isinstance(second, requestium.requestium.RequestiumResponse)
+    assert second.from_cache
+    assert second.status_code == 200
+    assert second.xpath("//h1/text()").get() == f"GET {path}"
+    assert session.cache is not None
+    assert session.cache.stats.hits == 1
+    assert session.cache.stats.misses == 1
+    assert session.cache.stats.stores == 1
+
+
+@pytest.mark.parametrize("validator", ["etag=%22v1%22", "last_modified=Mon,%2001%20Jan%202024%2000:00:00%20GMT"])
+def test_cache_revalidates_stale_responses(local_server: str, validator: str) -> None:
+    path = f"/stale?cache_control=no-cache&{validator}"
+    with requestium.Session(cache=True) as session:
+        session.get(f"{local_server}{path}")
+        response = session.get(f"{local_server}{path}")
+
+    assert LocalHandler.requests_served[path] == 2
+    assert response.from_cache
+    assert response.status_code == 200
+    assert response.css("h1::text").get() == f"GET {path}"
+    # The 304's own Content-Length (of its empty body) must not replace the stored one
+    assert response.headers["Content-Length"] == str(len(response.content))
+    assert session.cache is not None
+    assert session.cache.stats.revalidations == 1
+
+
+@pytest.mark.parametrize("path", ["/streamed?cache_control=max-age%3D60", "/streamed?cache_control=no-cache&etag=%22v1%22"])
+def test_cache_answers_streamed_requests(local_server: str, path: str) -> None:
+    with requestium.Session(cache=True) as session:
+        session.get(f"{local_server}{path}")
+        response = session.get(f"{local_server}{path}", stream=True)
+
+    assert response.from_cache
+    assert b"".join(response.iter_content(8)) == f"<html><body><h1>GET {path}</h1></body></html>".encode()
+    assert [element.xpath("text()").get() for element in response.iter_xpath("//h1")] == [f"GET {path}"]
+
+
+def test_cache_skips_uncacheable_responses(local_server: str) -> None:
+    with requestium.Session(cache=True) as session:
+        for _ in range(2):
+            session.get(f"{local_server}/no-store?cache_control=no-store")
+            session.get(f"{local_server}/no-validators")
+    assert LocalHandler.requests_served["/no-store?cache_control=no-store"] == 2
+    assert LocalHandler.requests_served["/no-validators"] == 2
+    assert session.cache is not None
+    assert session.cache.stats.stores == 0
+
+
+def test_cache_invalidated_by_unsafe_methods(local_server: str) -> None:
+    url = f"{local_server}/invalidated?cache_control=max-age%3D60"
+    with requestium.Session(cache=True) as session:
+        session.get(url)
+        session.post(url)
+        response = session.get(url)
+    assert not response.from_cache
+    assert LocalHandler.requests_served["/invalidated?cache_control=max-age%3D60"] == 3
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = requestium.MemoryCache(max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"headers": {}, "content": b"x" * 100})
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.set("d", {"headers": {}, "content": b"x" * 100})
+    assert cache.get("c") is None
+    assert cache.get("b") is not None
+    assert len(cache) == 2
+    assert cache.size == 200
+
+
+def test_sqlite_cache_persists_between_sessions(local_server: str, tmp_path: Path) -> None:
+    path = "/persisted?cache_control=max-age%3D60"
+    backend = requestium.SQLiteCache(tmp_path / "cache.sqlite")
+    with requestium.Session(cache=backend) as session:
+        session.get(f"{local_server}{path}")
+    backend.close()
+
+    backend = requestium.SQLiteCache(tmp_path / "cache.sqlite")
+    with requestium.Session(cache=backend) as session:
+        response = session.get(f"{local_server}{path}")
+    backend.close()
+
+    assert LocalHandler.requests_served[path] == 1
+    assert response.from_cache
+    assert response.text == f"<html><body><h1>GET {path}</h1></body></html>"
@@ -4,6 +4,8 @@ from selenium.common import InvalidCookieDomainException
 
 import requestium.requestium
 
+from .support import FakeRemoteEnd
+
 
 @pytest.fixture(
     params=[
@@ -55,6 +57,20 @@ def test_ensure_add_cookie_domain_override(clean_session: requestium.Session, co
     assert_first_cookie_matches(clean_session.driver.get_cookies(), expected)
 
 
+def test_ensure_add_cookies(clean_session: requestium.Session) -> None:
+    cookies = [
+        {"name": "session_id", "value": "abc123", "domain": "example.com", "path": "/"},
+        {"name": "user_token", "value": "xyz789", "domain": "example.com", "path": "/"},
+    ]
+    clean_session.driver.get("https://google.com")
+    clean_session.driver.delete_all_cookies()
+    clean_session.driver.ensure_add_cookies(cookies)
+
+    driver_cookies = clean_session.driver.get_cookies()
+    assert {(cookie["name"], cookie["value"]) for cookie in driver_cookies} == {("session_id", "abc123"), ("user_token", "xyz789")}
+    assert all(cookie["domain"] in {"example.com", ".example.com"} for cookie in driver_cookies)
+
+
 def test_transfer_driver_cookies_to_session(clean_session: requestium.Session, cookie_data: dict[str, str]) -> None:
     clean_session.driver.get(f"https://{cookie_data['domain']}")
     clean_session.driver.add_cookie(cookie_data)
@@ -64,6 +80,25 @@ def test_transfer_driver_cookies_to_session(clean_session: requestium.Session, c
     assert clean_session.cookies.keys() == [cookie_data["name"]]
 
 
+def test_transfer_driver_cookies_to_session_applies_changes_only(clean_session: requestium.Session, cookie_data: dict[str, str]) -> None:
+    clean_session.driver.get(f"https://{cookie_data['domain']}")
+    clean_session.driver.add_cookie({**cookie_data, "secure": True})
+
+    report = clean_session.transfer_driver_cookies_to_session(copy_user_agent=False)
+    assert [name for _, _, name in report.added] == [cookie_data["name"]]
+    session_cookie = next(iter(clean_session.cookies))
+    assert session_cookie.secure
+    assert session_cookie.path == cookie_data["path"]
+
+    report = clean_session.transfer_driver_cookies_to_session(copy_user_agent=False)
+    assert report == ([], [], [])
+
+    clean_session.driver.delete_cookie(cookie_data["name"])
+    report = clean_session.transfer_driver_cookies_to_session(copy_user_agent=False)
+    assert [name for _, _, name in report.removed] == [cookie_data["name"]]
+    assert not clean_session.cookies.keys()
+
+
 def test_transfer_session_cookies_to_driver(clean_session: requestium.Session, cookie_data: dict[str, str]) -> None:
     clean_session.get(f"http://{cookie_data['domain']}")
     clean_session.cookies.set(name=cookie_data["name"], value=cookie_data["value"], domain=cookie_data["domain"], path=cookie_data["path"])
@@ -93,3 +128,26 @@ def test_transfer_session_cookies_to_driver_no_domain_error(session: requestium.
         match="Trying to transfer cookies to selenium without specifying a domain and without having visited any page in the current session",
     ):
         session.transfer_session_cookies_to_driver()
+
+
+def test_transfer_driver_cookies_to_session_keeps_other_sites_cookies() -> None:
+    with FakeRemoteEnd() as remote:
+        driver = remote.driver()
+        session = requestium.Session(driver=driver)
+        driver.get("http://a.com/")
+        driver.add_cookie({"name": "sid", "value": "secret"})
+        session.transfer_driver_cookies_to_session()
+
+        # The driver only lists b.com's cookies now, a.com's 'sid' wasn't removed
+        driver.get("http://b.com/")
+        driver.add_cookie({"name": "x", "value": "1"})
+        report = session.transfer_driver_cookies_to_session()
+        assert report == requestium.requestium.CookieSyncReport(added=[("b.com", "/", "x")], changed=[], removed=[])
+        assert session.cookies["sid"] == "secret"
+
+        driver.get("http://a.com/")
+        driver.delete_cookie("sid")
+        report = session.transfer_driver_cookies_to_session()
+        assert report == requestium.requestium.CookieSyncReport(added=[], changed=[], removed=[("a.com", "/", "sid")])
+        assert "sid" not in session.cookies
+        assert session.cookies["x"] == "1"
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import requestium.requestium
+
+from .conftest import LocalHandler
+
+
+def fetch_heading(session: requestium.Session, url: str) -> str | None:
+    if url.endswith("/fail"):
+        session.get(url)
+        msg = f"Failed on {url}"
+        raise ValueError(msg)
+    if url.endswith("/crash"):
+        os._exit(1)
+    return session.get(url).xpath("//h1/text()").get()
+
+
+def test_crawler_map_keeps_input_order(local_server: str) -> None:
+    urls = [f"{local_server}/crawled/{i}" for i in range(20)]
+    with requestium.Crawler(fetch_heading, workers=2, max_pending=3) as crawler:
+        assert list(crawler.map(urls)) == [f"GET /crawled/{i}" for i in range(20)]
+        assert sorted(crawler.map(urls[:5], ordered=False)) == sorted(f"GET /crawled/{i}" for i in range(5))
+
+
+def test_crawler_retries_failed_jobs(local_server: str) -> None:
+    urls = [f"{local_server}/page", f"{local_server}/fail"]
+    with requestium.Crawler(fetch_heading, workers=2, max_retries=2) as crawler:
+        heading, error = crawler.map(urls, return_exceptions=True)
+        assert heading == "GET /page"
+        assert isinstance(error, ValueError)
+        assert str(error) == f"Failed on {local_server}/fail"
+        assert LocalHandler.requests_served["/fail"] == 3
+
+        with pytest.raises(ValueError, match="Failed on"):
+            list(crawler.map(urls))
+
+
+def test_crawler_replaces_dead_workers(local_server: str) -> None:
+    urls = [f"{local_server}/crash", *(f"{local_server}/after-crash/{i}" for i in range(4))]
+    with requestium.Crawler(fetch_heading, workers=2, max_retries=1) as crawler:
+        error, *headings = crawler.map(urls, return_exceptions=True)
+        assert isinstance(error, requestium.requestium.CrawlerWorkerError)
+        assert headings == [f"GET /after-crash/{i}" for i in range(4)]
+        assert len(crawler._workers) == 2
+
+
+def test_crawler_blames_the_job_that_killed_the_worker(local_server: str) -> None:
+    # The job before the crash succeeds, its result may even be lost with the worker
+    urls = [f"{local_server}/before-crash", f"{local_server}/crash", f"{local_server}/after-crash"]
+    with requestium.Crawler(fetch_heading, workers=1, max_retries=0) as crawler:
+        before, error, after = crawler.map(urls, return_exceptions=True)
+    assert before == "GET /before-crash"
+    assert isinstance(error, requestium.requestium.CrawlerWorkerError)
+    assert after == "GET /after-crash"
@@ -0,0 +1,73 @@
+import pytest
+import requests
+
+from requestium.requestium_domains import CookieDomainIndex, DomainTrackingCookieJar, domain_match, fqdn, registered_domain
+
+
+@pytest.mark.parametrize(
+    ("url_or_host", "expected_registered_domain", "expected_fqdn"),
+    [
+        ("https://www.example.co.uk/page?id=1", "example.co.uk", "www.example.co.uk"),
+        ("auth.example.com", "example.com", "auth.example.com"),
+        (".example.com", "example.com", "example.com"),
+        ("http://127.0.0.1:8000/page", "", ""),
+        ("about:blank", "", ""),
+    ],
+)
+def test_registered_domain_and_fqdn(url_or_host: str, expected_registered_domain: str, expected_fqdn: str) -> None:
+    assert registered_domain(url_or_host) == expected_registered_domain
+    assert fqdn(url_or_host) == expected_fqdn
+
+
+def test_domain_match() -> None:
+    assert domain_match("www.example.com", "example.com")
+    assert domain_match("example.com", ".example.com")
+    assert domain_match("Example.COM", "example.com")
+    assert not domain_match("example.com", "www.example.com")
+    assert not domain_match("example.com", "ample.com")
+
+
+@pytest.mark.parametrize("jar_class", [DomainTrackingCookieJar, requests.cookies.RequestsCookieJar])
+def test_cookie_domain_index(jar_class: type[requests.cookies.RequestsCookieJar]) -> None:
+    jar = jar_class()
+    jar.set("site", "1", domain=".example.com")
+    jar.set("www", "2", domain="www.example.com")
+    jar.set("other", "3", domain="ample.com")
+    jar.set("local", "4", domain="localhost.local")
+    index = CookieDomainIndex(jar)
+
+    assert sorted(cookie.name for cookie in index.cookies_for("example.com")) == ["site", "www"]
+    assert sorted(cookie.name for cookie in index.cookies_for("www.example.com")) == ["site", "www"]
+    assert [cookie.name for cookie in index.cookies_for("ample.com")] == ["other"]
+    assert [cookie.name for cookie in index.cookies_for("localhost.local")] == ["local"]
+    assert index.cookies_for("google.com") == []
+
+    jar.set("auth", "5", domain="auth.example.com")
+    jar.set("site", "6", domain=".example.com")
+    assert sorted((cookie.name, cookie.value) for cookie in index.cookies_for("example.com")) == [("auth", "5"), ("site", "6"), ("www", "2")]
+
+
+def test_cookie_domain_index_rebuilds_only_when_domains_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    jar = DomainTrackingCookieJar()
+    jar.set("site", "1", domain="example.com")
+    index = CookieDomainIndex(jar)
+    rebuilds: list[None] = []
+    rebuild = index._rebuild
+
+    def counted_rebuild() -> None:
+        rebuilds.append(None)
+        rebuild()
+
+    monkeypatch.setattr(index, "_rebuild", counted_rebuild)
+
+    for _ in range(3):
+        assert [cookie.value for cookie in index.cookies_for("example.com")] == ["1"]
+    jar.set("site", "2", domain="example.com")
+    assert [cookie.value for cookie in index.cookies_for("example.com")] == ["2"]
+    assert len(rebuilds) == 1
+
+    jar.set("other", "3", domain="other.com")
+    assert [cookie.name for cookie in index.cookies_for("other.com")] == ["other"]
+    del jar["other"]
+    assert index.cookies_for("other.com") == []
+    assert len(rebuilds) == 3
@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+import requestium
+
+from .test_response import make_response
+
+SCHEMA = {"title": "//h1/text()", "items": requestium.Field("//li/text()", many=True)}
+
+
+def make_page(i: int) -> bytes:
+    return f"<html><body><h1>Page {i}</h1><ul>{'<li>item</li>' * i}</ul></body></html>".encode()
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"workers": 2, "executor": "thread"}, {"workers": 2}])
+def test_extract_many_in_order(kwargs: dict) -> None:
+    pages = [make_response(make_page(i)) for i in range(20)]
+    records = list(requestium.extract_many(pages, SCHEMA, **kwargs))
+    assert records == [{"title": f"Page {i}", "items": ["item"] * i} for i in range(20)]
+
+
+def test_extract_many_as_completed() -> None:
+    pages = (make_page(i) for i in range(20))
+    records = requestium.extract_many(pages, requestium.ExtractionSchema(SCHEMA), workers=3, executor="thread", ordered=False)
+    assert sorted(record["title"] for record in records if not isinstance(record, Exception)) == sorted(f"Page {i}" for i in range(20))
+
+
+def test_extract_many_decodes_like_responses() -> None:
+    body = "<p>café</p>".encode("latin-1")
+    records = list(requestium.extract_many([make_response(body, encoding="latin-1"), body.decode("latin-1")], {"p": "//p/text()"}, workers=1))
+    assert records == [{"p": "café"}, {"p": "café"}]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_extract_many_failures(executor: str) -> None:
+    schema = {"match": "//p/text()[re:test(., '[')]"}  # An invalid regex only fails when the xpath runs
+    with pytest.raises(re.error):
+        list(requestium.extract_many([b"<p>a</p>"], schema, workers=1, executor=executor))
+    [result] = requestium.extract_many([b"<p>a</p>"], schema, workers=1, executor=executor, return_exceptions=True)
+    assert isinstance(result, re.error)
+
+
+def test_extract_many_rejects_unknown_executors() -> None:
+    with pytest.raises(ValueError, match=re.escape("The 'executor' argument must be 'process' or 'thread', not 'gpu'")):
+        requestium.extract_many([], SCHEMA, executor="gpu")
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+# Importing any of these eagerly would add hundreds of milliseconds to 'import requestium',
+# which 'python -m benchmarks --only imports' measures
+HEAVY_MODULES = ("selenium", "parsel", "lxml", "tldextract", "asyncio")
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, check=True, text=True).stdout.strip()
+
+
+def test_import_doesnt_load_selenium() -> None:
+    loaded = run_python(f"import sys, requestium; print(sorted({{m.partition('.')[0] for m in sys.modules}} & set({HEAVY_MODULES!r})))")
+    assert loaded == "[]"
+
+
+@pytest.mark.parametrize("name", ["exceptions", "By", "Keys", "Select", "ClickStrategy", "DriverPool", "Crawler", "AsyncSession"])
+def test_lazy_names_are_importable(name: str) -> None:
+    assert run_python(f"from requestium import {name}; import sys; print('selenium' in sys.modules or 'asyncio' in sys.modules)") == "True"
@@ -0,0 +1,99 @@
+import logging
+
+import pytest
+
+import requestium
+from requestium.requestium_instrumentation import NULL_INSTRUMENTATION, Span
+
+from .support import FakeRemoteEnd, listing_page
+
+
+def test_session_stats(local_server: str) -> None:
+    spans: list[Span] = []
+    with requestium.Session(cache=True, instrumentation=requestium.Instrumentation(spans.append)) as session:
+        for _ in range(2):
+            response = session.get(f"{local_server}/instrumented?cache_control=max-age%3D60")
+            response.xpath("//h1/text()").get()
+            response.css("h1::text").get()
+        stats = session.stats()
+
+    assert stats.spans["http.request"].calls == 2
+    assert stats.spans["parse"].calls == 2
+    assert stats.spans["parse"].total <= stats.spans["parse"].slowest * 2
+    assert stats.counters == {"http.cache_hits": 1}
+    assert [span.name for span in spans] == ["http.request", "parse", "http.request", "parse"]
+    assert spans[0].attributes == {"method": "GET", "url": f"{local_server}/instrumented?cache_control=max-age%3D60", "status": 200}
+    assert spans[2].attributes["from_cache"]
+
+
+def test_spans_record_errors_and_reach_the_sinks(caplog: pytest.LogCaptureFixture) -> None:
+    instrumentation = requestium.Instrumentation(requestium.LoggingSink())
+    with caplog.at_level(logging.DEBUG, logger="requestium"), pytest.raises(ValueError, match="boom"), instrumentation.span("failing", item=1):
+        raise ValueError("boom")  # noqa: EM101
+
+    stats = instrumentation.stats()
+    assert stats.spans["failing"].calls == 1
+    assert stats.spans["failing"].errors == 1
+    [record] = caplog.records
+    assert record.getMessage().startswith("failing took ")
+    assert record.__dict__["span"]["attributes"] == {"item": 1}
+    assert record.__dict__["span"]["error"] == "ValueError"
+
+    instrumentation.reset()
+    assert instrumentation.stats() == ({}, {})
+
+
+def test_sessions_are_not_instrumented_by_default(local_server: str) -> None:
+    with requestium.Session() as session:
+        session.get(f"{local_server}/not-instrumented").xpath("//h1")
+        assert session.instrumentation is NULL_INSTRUMENTATION
+        assert session.stats() == ({}, {})
+
+
+def test_opentelemetry_sink() -> None:
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: PLC0415
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    instrumentation = requestium.Instrumentation(requestium.OpenTelemetrySink(provider.get_tracer("tests")))
+    with instrumentation.span("driver.get", url="http://example.com", locator=("xpath", "//h1")):
+        pass
+
+    [span] = exporter.get_finished_spans()
+    assert span.name == "driver.get"
+    assert span.attributes == {"url": "http://example.com", "locator": "('xpath', '//h1')"}
+
+
+def test_driver_spans(session: requestium.Session, example_html: str) -> None:
+    instrumentation = requestium.Instrumentation()
+    session.driver.instrumentation = instrumentation
+    try:
+        session.driver.get(f"data:text/html,{example_html}")
+        session.driver.ensure_element("xpath", "//h1").ensure_click()  # type: ignore[union-attr]
+        session.driver.xpath("//h1")
+    finally:
+        session.driver.instrumentation = NULL_INSTRUMENTATION
+
+    stats = instrumentation.stats()
+    assert {"driver.get", "ensure_element", "click", "driver.page_source", "parse"} <= stats.spans.keys()
+    assert stats.counters["click.retries"] == 0
+
+
+@pytest.mark.parametrize("plain", [False, True], ids=["requestium", "plain"])
+def test_fake_driver_spans(plain: bool) -> None:  # noqa: FBT001
+    with FakeRemoteEnd() as remote:
+        remote.pages["http://site.com/1"] = listing_page(1)
+        remote.reveal("css selector", "li")
+        instrumentation = requestium.Instrumentation()
+        driver = requestium.Session(driver=remote.driver(plain=plain), instrumentation=instrumentation).driver
+        driver.get("http://site.com/1")
+        driver.ensure_element("css selector", "li").ensure_click()  # type: ignore[union-attr]
+        driver.xpath("//li")
+
+    stats = instrumentation.stats()
+    assert stats.spans.keys() == {"driver.get", "ensure_element", "click", "driver.page_source", "parse"}
+    assert stats.spans["driver.get"].calls == 1
@@ -116,3 +116,79 @@ def test_ensure_click(session: requestium.Session, example_html: str) -> None:
     element = session.driver.ensure_element_by_tag_name("button")
     assert isinstance(element, WebElement)
     requestium.requestium._ensure_click(element)
+
+
+def test_ensure_elements(session: requestium.Session, example_html: str) -> None:
+    session.driver.get(f"data:text/html,{example_html}")
+
+    elements = session.driver.ensure_elements(
+        {
+            "header": (By.ID, "test-header"),
+            "link": (By.LINK_TEXT, "Test Link 1", "visible"),
+            "button": (By.TAG_NAME, "button", "clickable"),
+            "paragraph": (By.XPATH, "//p[@class='body-text']", "present"),
+            "missing": (By.CLASS_NAME, "missing", "invisible"),
+        },
+    )
+    assert_webelement_text_exact_match(elements["header"], "Test Header 2")
+    assert_webelement_text_exact_match(elements["link"], "Test Link 1")
+    assert_webelement_text_exact_match(elements["button"], "Click Me")
+    assert_webelement_text_exact_match(elements["paragraph"], "Test Paragraph 1")
+    assert elements["missing"] is None
+
+
+def test_ensure_elements_timeout(session: requestium.Session, example_html: str) -> None:
+    session.driver.get(f"data:text/html,{example_html}")
+
+    with pytest.raises(requestium.requestium.EnsureElementsTimeoutException, match="Timed out waiting for the elements: missing") as excinfo:
+        session.driver.ensure_elements({"header": (By.TAG_NAME, "h1"), "missing": (By.ID, "missing")}, timeout=0.5)
+    assert list(excinfo.value.found) == ["header"]
+    assert excinfo.value.pending == ["missing"]
+
+    elements = session.driver.ensure_elements({"header": (By.TAG_NAME, "h1"), "missing": (By.ID, "missing")}, timeout=0.5, raise_on_timeout=False)
+    assert list(elements) == ["header"]
+
+
+def test_ensure_element_mutation_engine(session: requestium.Session, example_html: str) -> None:
+    session.driver.get(f"data:text/html,{example_html}")
+    session.driver.execute_script(
+        """
+        setTimeout(function () {
+            var header = document.createElement('h4');
+            header.id = 'late-header';
+            header.textContent = 'Late Header';
+            document.body.appendChild(header);
+            document.getElementById('test-header').remove();
+        }, 300);
+        """,
+    )
+
+    element = session.driver.ensure_element(By.ID, "late-header", timeout=5, engine="mutation")
+    assert_webelement_text_exact_match(element, "Late Header")
+    assert session.driver.ensure_element(By.ID, "test-header", state="invisible", timeout=5, engine="mutation") is None
+
+    with pytest.raises(ValueError, match="The 'engine' argument must be 'poll' or 'mutation', not 'sleep'"):
+        session.driver.ensure_element(By.ID, "late-header", engine="sleep")
+
+
+def test_ensure_click_strategy_and_stats(session: requestium.Session, example_html: str) -> None:
+    session.driver.get(f"data:text/html,{example_html}")
+    session.click_stats.reset()
+
+    element = session.driver.ensure_element_by_tag_name("button")
+    element.ensure_click()  # type: ignore[union-attr]
+    assert session.click_stats.clicks == 1
+    assert session.click_stats.failures == 0
+
+    session.driver.execute_script("document.getElementsByTagName('button')[0].style.display = 'none';")
+    strategy = requestium.ClickStrategy(max_attempts=3, initial_delay=0.01)
+    with pytest.raises(requestium.exceptions.WebDriverException, match="Couldn't click item after trying 3 times"):
+        element.ensure_click(strategy)  # type: ignore[union-attr]
+    assert session.click_stats.failures == 1
+    assert session.click_stats.attempts == 4
+    assert session.click_stats.retries == 2
+    assert sum(session.click_stats.errors.values()) == 3
+
+    element.ensure_click(strategy._replace(js_fallback=True))  # type: ignore[union-attr]
+    assert session.click_stats.js_fallbacks == 1
+    assert session.click_stats.clicks == 2
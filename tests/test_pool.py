@@ -0,0 +1,52 @@
+from collections.abc import Generator
+
+import pytest
+
+import requestium.requestium
+
+
+@pytest.fixture(scope="module")
+def driver_pool() -> Generator[requestium.DriverPool, None, None]:
+    try:
+        pool = requestium.DriverPool(2, headless=True, max_uses=3)
+    except requestium.exceptions.WebDriverException as e:
+        pytest.skip(f"Couldn't start the pool's drivers: {e}")
+    yield pool
+    pool.close()
+
+
+def test_session_leases_and_returns_pooled_driver(driver_pool: requestium.DriverPool, example_html: str) -> None:
+    with requestium.Session(driver_pool=driver_pool) as session:
+        session.driver.get(f"data:text/html,{example_html}")
+        assert session.driver.title == "The Internet"
+        driver = session.driver
+    assert session._driver is None
+
+    with driver_pool.lease() as leased_driver:
+        assert leased_driver is driver
+        assert leased_driver.current_url == "about:blank"
+
+
+def test_pool_recycles_drivers_past_max_uses(driver_pool: requestium.DriverPool) -> None:
+    with driver_pool.lease() as driver:
+        pass
+    for _ in range(driver_pool.max_uses):  # type: ignore[arg-type]
+        with driver_pool.lease() as leased_driver:
+            if leased_driver is not driver:
+                break
+    else:
+        pytest.fail("The driver wasn't recycled after reaching max_uses")
+    assert len(driver_pool) == driver_pool.size
+
+
+def test_pool_release_unknown_driver() -> None:
+    pool = requestium.DriverPool(1, prelaunch=False)
+    with pytest.raises(ValueError, match="The driver wasn't leased from this pool"):
+        pool.release(object())  # type: ignore[arg-type]
+
+
+def test_pool_acquire_timeout() -> None:
+    pool = requestium.DriverPool(1, factory=object, prelaunch=False)  # type: ignore[arg-type]
+    pool.acquire()
+    with pytest.raises(TimeoutError, match="All of the pool's 1 drivers are in use"):
+        pool.acquire(timeout=0.01)
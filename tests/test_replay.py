@@ -0,0 +1,91 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+import requestium.requestium
+
+from .conftest import LocalHandler, validate_session
+
+
+def performance_log_entry(method: str, params: dict) -> dict:
+    return {"level": "INFO", "message": json.dumps({"message": {"method": method, "params": params}, "webview": "1"}), "timestamp": 0}
+
+
+def test_recording_from_performance_log(local_server: str) -> None:
+    entries = [
+        performance_log_entry(
+            "Network.requestWillBeSent",
+            {"type": "Document", "request": {"method": "GET", "url": f"{local_server}/login", "headers": {"User-Agent": "Browser"}}},
+        ),
+        performance_log_entry("Network.requestWillBeSent", {"type": "Image", "request": {"method": "GET", "url": f"{local_server}/logo.png", "headers": {}}}),
+        performance_log_entry("Network.responseReceived", {"type": "Document", "response": {"url": f"{local_server}/login"}}),
+        performance_log_entry(
+            "Network.requestWillBeSent",
+            {
+                "type": "Fetch",
+                "request": {
+                    "method": "POST",
+                    "url": f"{local_server}/api/login",
+                    "headers": {"Content-Type": "application/json", "Cookie": "stale=1"},
+                    "postDataEntries": [{"bytes": "eyJ1c2VyIjog"}, {"bytes": "ImphbWVzIn0="}],
+                },
+            },
+        ),
+        performance_log_entry(
+            "Network.requestWillBeSent",
+            {"type": "Document", "redirectResponse": {"status": 302}, "request": {"method": "GET", "url": f"{local_server}/home", "headers": {}}},
+        ),
+    ]
+    recording = requestium.NetworkRecording.from_performance_log(entries)
+    assert recording.requests == [
+        requestium.requestium.RecordedRequest("GET", f"{local_server}/login", {"User-Agent": "Browser"}),
+        requestium.requestium.RecordedRequest(
+            "POST", f"{local_server}/api/login", {"Content-Type": "application/json", "Cookie": "stale=1"}, '{"user": "james"}'
+        ),
+    ]
+
+
+def test_recording_save_load_and_replay(local_server: str, tmp_path: Path) -> None:
+    recording = requestium.NetworkRecording(
+        [
+            requestium.requestium.RecordedRequest("GET", f"{local_server}/replayed/login", {"User-Agent": "Browser", "Cookie": "stale=1"}),
+            requestium.requestium.RecordedRequest("POST", f"{local_server}/replayed/api", {"Content-Type": "application/json"}, '{"user": "james"}'),
+        ]
+    )
+    recording.save(tmp_path / "login.json")
+    recording = requestium.NetworkRecording.load(tmp_path / "login.json")
+    assert len(recording) == 2
+
+    with requestium.Session() as session:
+        responses = recording.replay(session, check=lambda session: str(session._last_requests_url).endswith("/api"))
+    assert [response.xpath("//h1/text()").get() for response in responses] == ["GET /replayed/login", "POST /replayed/api"]
+    assert responses[0].request.headers["User-Agent"] == "Browser"
+    assert "stale=1" not in responses[0].request.headers.get("Cookie", "")
+    assert responses[1].request.body == b'{"user": "james"}'
+    assert LocalHandler.requests_served["/replayed/api"] == 1
+
+    with requestium.Session() as session, pytest.raises(requestium.ReplayError, match="recording may be outdated") as exc_info:
+        recording.replay(session, check=lambda _: False)
+    assert exc_info.value.response is not None
+    assert exc_info.value.response.url == f"{local_server}/replayed/api"
+
+    unreachable = requestium.NetworkRecording([requestium.requestium.RecordedRequest("GET", "http://127.0.0.1:1/login", {})])
+    with requestium.Session() as session, pytest.raises(requestium.ReplayError, match=re.escape("Replaying GET http://127.0.0.1:1/login failed")):
+        unreachable.replay(session)
+
+
+def test_driver_records_network(local_server: str) -> None:
+    session = requestium.Session(headless=True, webdriver_options={"record_network": True})
+    validate_session(session)
+    with session.driver.record_network() as recording:
+        session.driver.get(f"{local_server}/recorded")
+        session.driver.execute_script(f"fetch('{local_server}/recorded/api', {{method: 'POST', body: 'field=value'}})")
+        session.driver.ensure_element("xpath", "//h1")
+    session.driver.quit()
+
+    assert [(request.method, request.url, request.body) for request in recording.requests[:2]] == [
+        ("GET", f"{local_server}/recorded", None),
+        ("POST", f"{local_server}/recorded/api", "field=value"),
+    ]
@@ -0,0 +1,99 @@
+import io
+
+import pytest
+import requests
+
+import requestium.requestium
+
+
+def make_response(body: bytes, encoding: str | None = "utf-8") -> requestium.requestium.RequestiumResponse:
+    response = requestium.requestium.RequestiumResponse(requests.Response())
+    response.status_code = 200
+    response._content = body
+    response.encoding = encoding
+    return response
+
+
+def test_selector_is_parsed_once(example_html: str) -> None:
+    response = make_response(example_html.encode())
+
+    assert response.xpath("//h1/text()").get() == "Test Header 1"
+    assert response.css("#test-header::text").get() == "Test Header 2"
+    assert response.re_first(r"Test Paragraph \d") == "Test Paragraph 1"
+    assert response.re(r"Test Link \d") == ["Test Link 1", "Test Link 2"]
+
+    assert response.selector_cache_info() == (3, 1)
+
+
+def test_selector_reparses_on_encoding_change() -> None:
+    response = make_response("<p>café</p>".encode())
+    assert response.xpath("//p/text()").get() == "café"
+
+    response.encoding = "latin-1"
+    assert response.xpath("//p/text()").get() == "cafÃ©"
+    assert response.selector_cache_info() == (0, 2)
+
+
+def test_selector_reparses_on_content_change() -> None:
+    response = make_response(b"<p>first</p>")
+    assert response.xpath("//p/text()").get() == "first"
+
+    response._content = b"<p>second</p>"
+    assert response.xpath("//p/text()").get() == "second"
+    assert response.xpath("//p/text()").get() == "second"
+    assert response.selector_cache_info() == (1, 2)
+
+
+def test_wrapping_keeps_response_attributes(example_html: str) -> None:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = "http://example.com/"
+    response._content = example_html.encode()
+    response.encoding = "utf-8"
+
+    wrapped = requestium.requestium.RequestiumResponse(response)
+    assert type(wrapped) is requestium.requestium.RequestiumResponse
+    assert wrapped.status_code == 200
+    assert wrapped.url == "http://example.com/"
+    assert wrapped.xpath("//title/text()").get() == "The Internet"
+
+
+def test_wrapping_creates_no_classes_per_response() -> None:
+    class CustomResponse(requests.Response):
+        pass
+
+    wrapped_classes = set()
+    for response_class in [requests.Response, CustomResponse] * 5:
+        wrapped = requestium.requestium.RequestiumResponse(response_class())
+        assert isinstance(wrapped, response_class)
+        wrapped_classes.add(type(wrapped))
+
+    assert len(wrapped_classes) == 2
+    assert len(requestium.requestium.RequestiumResponse.__subclasses__()) <= 1
+
+
+def test_iter_xpath_streams_matching_elements() -> None:
+    items = "".join(f"<div class='item'><span>{i}</span></div><div class='ad'>Ad {i}</div>" for i in range(1000))
+    response = requestium.requestium.RequestiumResponse(requests.Response())
+    response.raw = io.BytesIO(f"<html><body><h1>Listing</h1>{items}</body></html>".encode())
+
+    streamed = response.iter_xpath("//div[@class='item']", chunk_size=256)
+    first = next(streamed)
+    assert first.xpath("//span/text()").get() == "0"
+    assert response.raw.tell() < len(response.raw.getvalue())
+    assert [item.css("span::text").get() for item in streamed] == [str(i) for i in range(1, 1000)]
+
+
+def test_iter_xpath_xml_with_namespace() -> None:
+    response = requestium.requestium.RequestiumResponse(requests.Response())
+    response.headers["Content-Type"] = "application/xml"
+    response.raw = io.BytesIO(b"<feed xmlns='http://example.com/ns'><entry id='1'/><entry id='2'/><other/></feed>")
+
+    entries = response.iter_xpath("{http://example.com/ns}entry")
+    assert [entry.xpath("@id").get() for entry in entries] == ["1", "2"]
+
+
+def test_iter_xpath_rejects_unstreamable_paths() -> None:
+    response = requestium.requestium.RequestiumResponse(requests.Response())
+    with pytest.raises(ValueError, match="Can't stream the path '//ul/li'"):
+        next(response.iter_xpath("//ul/li"))
@@ -0,0 +1,83 @@
+import pickle
+import re
+from collections.abc import Callable
+
+import pytest
+
+import requestium
+from requestium import ExtractionSchema, Field, Nested
+
+from .support import FakeRemoteEnd, listing_page
+from .test_response import make_response
+
+LINKS_SCHEMA = ExtractionSchema(
+    {
+        "title": "//title/text()",
+        "header": Field(css="#test-header::text"),
+        "header_number": Field(css="h3", re=r"Header (\d)"),
+        "paragraphs": Field("//p/text()", many=True),
+        "links": Nested(css="p > a", fields={"text": "text()", "url": Field(css="::attr(href)")}),
+        "first_link": Nested("//a[@name]", fields={"name": "@name"}, many=False),
+        "counts": {"links": "count(//a)", "missing": Field("//nav/text()", default="none")},
+    }
+)
+
+EXPECTED_RECORD = {
+    "title": "The Internet",
+    "header": "Test Header 2",
+    "header_number": "3",
+    "paragraphs": ["Test Paragraph 1"],
+    "links": [{"text": "Test Link 1", "url": "example.com"}, {"text": "Test Link 2", "url": "example.com"}],
+    "first_link": {"name": "link-paragraph"},
+    "counts": {"links": 2.0, "missing": "none"},
+}
+
+
+def test_schema_extracts_records(example_html: str) -> None:
+    response = make_response(example_html.encode())
+    assert LINKS_SCHEMA.extract(response) == EXPECTED_RECORD
+    assert response.extract(LINKS_SCHEMA) == EXPECTED_RECORD
+    assert LINKS_SCHEMA.extract(example_html) == EXPECTED_RECORD
+    # The response is parsed once, and not again by the selector calls made after the schema
+    response.xpath("//h1")
+    assert response.selector_cache_info() == (2, 1)
+
+
+def test_schema_matches_selector_results(example_html: str) -> None:
+    response = make_response(example_html.encode())
+    record = response.extract({"button": "//button", "regex": Field(re=r"Test Link (\d)", many=True)})
+    assert record == {"button": response.xpath("//button").get(), "regex": response.re(r"Test Link (\d)")}
+
+
+def test_schema_pickles(example_html: str) -> None:
+    schema = pickle.loads(pickle.dumps(LINKS_SCHEMA))
+    assert schema.extract(example_html) == EXPECTED_RECORD
+
+
+@pytest.mark.parametrize(
+    ("make_field", "error", "message"),
+    [
+        (lambda: Field(xpath="//title", css="title"), ValueError, "Pass either 'xpath' or 'css', not both"),
+        (lambda: Field(), ValueError, "A field needs an 'xpath', a 'css' or a 're'"),
+        (lambda: Nested(fields={}), ValueError, "Nested records need an 'xpath' or a 'css' to find them"),
+        (lambda: ExtractionSchema({"title": 1}), TypeError, "Schema fields must be a Field, a Nested, a dict or an xpath string, not int"),
+    ],
+)
+def test_schema_errors(make_field: Callable[[], object], error: type[Exception], message: str) -> None:
+    with pytest.raises(error, match=re.escape(message)):
+        make_field()
+
+
+def test_driver_extract(session: requestium.Session, example_html: str) -> None:
+    session.driver.get(f"data:text/html,{example_html}")
+    with session.driver.snapshot():
+        assert session.driver.extract(LINKS_SCHEMA) == EXPECTED_RECORD
+
+
+def test_schema_extracts_from_plain_drivers() -> None:
+    with FakeRemoteEnd() as remote:
+        remote.pages["http://site.com/3"] = listing_page(3)
+        driver = remote.driver(plain=True)
+        requestium.Session(driver=driver)
+        driver.get("http://site.com/3")
+        assert ExtractionSchema({"items": "count(//li)"}).extract(driver) == {"items": 3.0}
@@ -4,10 +4,12 @@ from pathlib import Path
 import pytest
 from selenium.common import WebDriverException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
 
 import requestium.requestium
 
-from .conftest import validate_session
+from .conftest import LocalHandler, validate_session
+from .support import FakeRemoteEnd, listing_page
 
 
 @pytest.mark.parametrize(
@@ -80,6 +82,51 @@ def test_initialize_session_with_extension(example_html: str) -> None:
         session.driver.quit()
 
 
+def test_initialize_session_with_load_profile(local_server: str) -> None:
+    session = requestium.Session(
+        headless=True,
+        webdriver_options={"block_resources": ["image", "font"], "blocked_urls": ["*/tracker*"], "page_load_strategy": "eager"},
+    )
+    validate_session(session)
+    assert session.driver.capabilities["pageLoadStrategy"] == "eager"
+    page = f"<img src='{local_server}/blocked.png'><script src='{local_server}/tracker.js'></script><h1>Loaded</h1>"
+    session.driver.get(f"data:text/html,{page}")
+    session.driver.ensure_element(By.TAG_NAME, "h1")
+    with session.driver.tabs(1) as pool:
+        [tab] = pool.as_loaded([f"data:text/html,{page}"])
+        tab.ensure_element(By.TAG_NAME, "h1")
+
+    assert LocalHandler.requests_served["/blocked.png"] == 0
+    assert LocalHandler.requests_served["/tracker.js"] == 0
+
+    with contextlib.suppress(WebDriverException, OSError):
+        session.driver.quit()
+
+
+def test_driver_snapshot_reuses_page_until_it_changes(example_html: str) -> None:
+    session = requestium.Session(headless=True)
+    validate_session(session)
+    session.driver.get(f"data:text/html,{example_html}")
+
+    with session.driver.snapshot():
+        selector = session.driver.selector
+        assert session.driver.selector is selector
+        session.driver.execute_script("document.title = 'Changed';")
+        assert session.driver.selector is not selector
+        assert session.driver.xpath("//title/text()").get() == "Changed"
+
+    with session.driver.snapshot(watch_dom=True):
+        selector = session.driver.selector
+        assert session.driver.selector is selector
+        # Skip the driver's own invalidation hook, as if the site's javascript changed the page
+        RemoteWebDriver.execute_script(session.driver, "document.title = 'Changed again';")
+        assert session.driver.selector is not selector
+        assert session.driver.css("title::text").get() == "Changed again"
+
+    with contextlib.suppress(WebDriverException, OSError):
+        session.driver.quit()
+
+
 def test__start_chrome_driver_webdriver_options_typeerror() -> None:
     invalid_webdriver_options = {"arguments": "invalid_string"}
     with (
@@ -90,3 +137,57 @@ def test__start_chrome_driver_webdriver_options_typeerror() -> None:
         ),
     ):
         session._start_chrome_browser()
+
+
+@pytest.mark.parametrize(
+    ("webdriver_options", "error", "message"),
+    [
+        ({"block_resources": "image"}, TypeError, "'block_resources' option must be a list, but got str"),
+        ({"blocked_urls": "*.js"}, TypeError, "'blocked_urls' option must be a list, but got str"),
+        ({"block_resources": ["image", "video"]}, ValueError, "Unknown 'block_resources' types: video"),
+    ],
+)
+def test__start_chrome_driver_load_profile_errors(webdriver_options: dict, error: type[Exception], message: str) -> None:
+    with requestium.Session(webdriver_options=webdriver_options) as session, pytest.raises(error, match=message):
+        session._start_chrome_browser()
+
+
+@pytest.mark.parametrize("method", ["get", "options", "head", "post", "put", "patch", "delete"])
+def test_session_wraps_every_verb(local_server: str, method: str) -> None:
+    with requestium.Session() as session:
+        response = getattr(session, method)(f"{local_server}/{method}")
+        assert isinstance(response, requestium.requestium.RequestiumResponse)
+        assert response.status_code == 200
+        assert session._last_requests_url == f"{local_server}/{method}"
+        if method != "head":
+            assert response.xpath("//h1/text()").get() == f"{method.upper()} /{method}"
+
+
+def test_session_wraps_streamed_responses(local_server: str) -> None:
+    with requestium.Session() as session:
+        response = session.request("GET", f"{local_server}/stream", stream=True)
+        assert isinstance(response, requestium.requestium.RequestiumResponse)
+        assert response._content is False
+        assert response.css("h1::text").get() == "GET /stream"
+
+
+def test_plain_driver_snapshot_follows_navigation() -> None:
+    with FakeRemoteEnd() as remote:
+        remote.pages["http://site.com/1"] = listing_page(1)
+        remote.pages["http://site.com/2"] = listing_page(2)
+        driver = remote.driver(plain=True)
+        requestium.Session(driver=driver)
+        driver.get("http://site.com/1")
+
+        with driver.snapshot():
+            assert len(driver.xpath("//li")) == 1
+            driver.get("http://site.com/2")
+            assert len(driver.xpath("//li")) == 2
+            # Navigating without the driver's methods, Eg.: by clicking a link, is caught by the url
+            RemoteWebDriver.get(driver, "http://site.com/1")
+            assert len(driver.css("li")) == 1
+
+            selector = driver._current_selector()
+            driver.execute_script("return 1;")
+            assert driver._current_selector() is selector  # The page source is read again, but not parsed again
+            assert remote.command_counts["GET", "source"] == 4
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import requestium.requestium
+
+
+def test_save_and_load_state(tmp_path: Path) -> None:
+    session = requestium.Session()
+    session.cookies.set("session_id", "abc123", domain="example.com", path="/app", secure=True, expires=4102444800, rest={"HttpOnly": None})
+    session.headers["User-Agent"] = "Browser"
+    session.save_state(tmp_path / "state.json.gz")
+
+    restored = requestium.Session()
+    restored.load_state(tmp_path / "state.json.gz")
+    cookie = next(iter(restored.cookies))
+    assert (cookie.name, cookie.value, cookie.domain, cookie.path) == ("session_id", "abc123", "example.com", "/app")
+    assert cookie.secure
+    assert cookie.expires == 4102444800
+    assert cookie.has_nonstandard_attr("HttpOnly")
+    assert restored.headers["User-Agent"] == "Browser"
+    assert restored._driver is None
+
+
+def test_driver_state_restored_lazily(tmp_path: Path, example_html: str) -> None:
+    session = requestium.Session(headless=True)
+    session.driver.get("https://example.com")
+    session.driver.add_cookie({"name": "session_id", "value": "abc123"})
+    session.driver.execute_script("localStorage.setItem('token', 'xyz789')")
+    session.save_state(tmp_path / "state.json.gz")
+    session.driver.quit()
+
+    restored = requestium.Session(headless=True)
+    restored.load_state(tmp_path / "state.json.gz")
+    assert restored._driver is None
+    restored.save_state(tmp_path / "state_again.json.gz")
+
+    again = requestium.Session(headless=True)
+    again.load_state(tmp_path / "state_again.json.gz")
+    again.driver.get(f"data:text/html,{example_html}")
+    again.driver.get("https://example.com")
+    cookie = again.driver.get_cookie("session_id")
+    assert cookie is not None
+    assert cookie["value"] == "abc123"
+    assert again.driver.execute_script("return localStorage.getItem('token')") == "xyz789"
+    again.driver.quit()
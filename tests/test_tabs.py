@@ -0,0 +1,108 @@
+import re
+import time
+from collections.abc import Generator
+
+import pytest
+
+import requestium
+
+from .support import FakeRemoteEnd, listing_page
+
+
+@pytest.fixture
+def remote() -> Generator[FakeRemoteEnd, None, None]:
+    with FakeRemoteEnd(load_time=0.2) as remote:
+        for i in range(8):
+            remote.pages[f"http://site.com/{i}"] = listing_page(i)
+        yield remote
+
+
+def test_tabs_load_pages_at_the_same_time(remote: FakeRemoteEnd) -> None:
+    driver = remote.driver()
+    start = time.monotonic()
+    with driver.tabs(4) as pool:
+        items = {tab.url: len(tab.xpath("//li")) for tab in pool.as_loaded(f"http://site.com/{i}" for i in range(8))}
+    # Two rounds of four pages in parallel, where loading them one at a time would take 1.6s
+    assert time.monotonic() - start < 1
+    assert items == {f"http://site.com/{i}": i for i in range(8)}
+    assert remote.windows == {"main": "about:blank"}
+    assert driver.current_window_handle == "main"
+
+
+def test_tabs_only_switch_windows_when_needed(remote: FakeRemoteEnd) -> None:
+    driver = remote.driver()
+    with driver.tabs(2) as (first, second):
+        first.load("http://site.com/2")
+        second.load("http://site.com/3")
+        first.wait()
+        second.wait()
+        switches = remote.command_counts["POST", "window"]
+        with driver.snapshot():
+            assert len(second.xpath("//li")) == 3
+            assert len(second.css("li")) == 3
+            assert len(first.xpath("//li")) == 2  # The switch discards the other tab's snapshot
+            remote.reveal("css selector", "#late")
+            assert first.ensure_element("css selector", "#late") is not None
+        assert remote.command_counts["POST", "window"] == switches + 1
+        assert remote.command_counts["GET", "source"] == 2
+
+
+def test_tabs_are_reopened_when_their_window_closes(remote: FakeRemoteEnd) -> None:
+    driver = remote.driver()
+    driver.instrumentation = requestium.Instrumentation()
+    with driver.tabs(2) as pool:
+        [tab] = pool.as_loaded(["http://site.com/5"])
+        handle = tab.handle
+        remote.close_window(handle)
+        assert len(tab.xpath("//li")) == 5
+        assert tab.handle != handle
+        assert remote.windows[tab.handle] == "http://site.com/5"
+    assert driver.instrumentation.stats().counters["tabs.reopened"] == 1
+    assert remote.windows == {"main": "about:blank"}
+
+
+def test_slow_pages_time_out(remote: FakeRemoteEnd) -> None:
+    remote.load_time = 10
+    with remote.driver().tabs(1, timeout=0.1) as pool:
+        [tab] = pool.as_loaded(["http://site.com/1"])
+        assert tab.timed_out
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"size": 0}, "The pool 'size' must be at least 1, not 0"),
+        ({"size": 1, "ready_state": "loaded"}, "The 'ready_state' argument must be 'loading', 'interactive' or 'complete', not 'loaded'"),
+    ],
+)
+def test_tab_pool_errors(remote: FakeRemoteEnd, kwargs: dict, message: str) -> None:
+    with pytest.raises(ValueError, match=re.escape(message)):
+        remote.driver().tabs(**kwargs)
+
+
+def test_tabs_block_the_drivers_blocked_urls(remote: FakeRemoteEnd) -> None:
+    driver = remote.driver(cdp=True)
+    driver._blocked_url_patterns = ["*.png"]
+    with driver.tabs(2) as pool:
+        handle = pool[0].handle
+        remote.close_window(handle)
+        assert len(pool[0].xpath("//li")) == 0
+        assert remote.blocked_urls.keys() == {handle, pool[0].handle, pool[1].handle}
+        assert all(patterns == ["*.png"] for patterns in remote.blocked_urls.values())
+
+
+def test_tabs_of_plain_drivers(remote: FakeRemoteEnd) -> None:
+    driver = remote.driver(plain=True)
+    requestium.Session(driver=driver)
+    with driver.tabs(2) as pool:
+        items = {tab.url: len(tab.xpath("//li")) for tab in pool.as_loaded(f"http://site.com/{i}" for i in range(4))}
+    assert items == {f"http://site.com/{i}": i for i in range(4)}
+
+
+def test_driver_tabs(session: requestium.Session, local_server: str) -> None:
+    pages = {f"{local_server}/tab/{i}": f"GET /tab/{i}" for i in range(4)}
+    pages["data:text/html,<h1>Data page</h1>"] = "Data page"
+    with session.driver.tabs(2) as pool:
+        titles = {tab.url: tab.xpath("//h1/text()").get() for tab in pool.as_loaded(pages)}
+    assert titles == pages
+    assert len(session.driver.window_handles) == 1